@@ -0,0 +1,7 @@
+"""
+HTTP/JSON prediction API.
+
+Serves the engine's predictors and option generators as JSON endpoints next
+to the Streamlit UI, sharing the same data store. Run with ``python -m api``.
+"""
+from .app import app
@@ -0,0 +1,25 @@
+"""
+Run the prediction API with uvicorn.
+
+Usage:
+    python -m api [--host 0.0.0.0] [--port 8000] [--workers 1]
+"""
+import argparse
+import os
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the prediction API.")
+    parser.add_argument('--host', default="0.0.0.0")
+    parser.add_argument('--port', type=int, default=int(os.environ.get('API_PORT', 8000)))
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes (each loads its own copy of the data)")
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run("api:app", host=args.host, port=args.port, workers=args.workers,
+                log_level="info", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
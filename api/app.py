@@ -0,0 +1,271 @@
+"""
+ASGI application serving the prediction engine as JSON.
+
+A plain ASGI callable with no web framework, run with uvicorn
+(``python -m api``). Every endpoint in api.endpoints accepts GET with a query
+string or POST with a JSON object. ``format=columns|records`` selects the
+table encoding.
+
+Responses carry a strong ETag derived from the content of the data, the engine
+and API code (response_version), the path and the canonical parameters, so a
+matching If-None-Match is answered with 304 before any work is done, on any
+replica serving the same data and code. Encoded bodies are kept in an LRU, so repeated queries are
+served without touching the engine. Misses run in the default thread pool so
+the event loop keeps accepting requests. ``POST /v1/batch`` evaluates up to
+MAX_BATCH requests in one round trip. ``GET /metrics`` returns the engine
+latency histograms in the Prometheus text format.
+
+On startup each worker runs the engine warm-up (engine.warmup) before it
+accepts requests, unless WARMUP=0. ``GET /ready`` returns the readiness report
+of engine.readiness, with status 503 while the worker cannot answer queries
+within budget.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+from urllib.parse import parse_qs
+
+from engine.cache import MISSING, MemoryCache
+from engine.metrics import render_prometheus
+from engine.readiness import readiness
+from engine.shared_cache import code_fingerprint, engine_version
+from engine.store import data_version
+from engine.warmup import run_warmup
+
+from .endpoints import ENDPOINTS, ParamError, parse_params
+from .serialize import FORMAT_COLUMNS, FORMATS, dumps, loads
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH = 100
+MAX_BODY_BYTES = 1 << 20
+CACHE_CONTROL = b"public, max-age=300"
+METRICS_CONTENT_TYPE = b"text/plain; version=0.0.4; charset=utf-8"
+WARMUP_ENABLED = os.getenv('WARMUP', '1') != '0'
+
+response_cache = MemoryCache(max_entries=4096, name="api.responses")
+
+
+class HTTPError(Exception):
+    """Error turned into a JSON error response."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def error_body(message):
+    return dumps({'error': message})
+
+
+def response_version():
+    """Version of every response: data snapshot, engine code and API code."""
+    return f"{engine_version()}.{code_fingerprint('api')}"
+
+
+def prepare(path, raw):
+    """
+    Validate one request.
+
+    Args:
+        path (str): Endpoint path
+        raw (dict): Raw parameters, including the optional 'format'
+
+    Returns:
+        tuple: (handler, params, fmt, cache key, etag)
+
+    Raises:
+        HTTPError: For unknown endpoints or invalid parameters
+    """
+    endpoint = ENDPOINTS.get(path)
+    if endpoint is None:
+        raise HTTPError(404, f"unknown endpoint '{path}'")
+    handler, spec = endpoint
+
+    raw = dict(raw)
+    fmt = raw.pop('format', None) or FORMAT_COLUMNS
+    if fmt not in FORMATS:
+        raise HTTPError(400, f"'format' must be one of {FORMATS}")
+    try:
+        params = parse_params(spec, raw)
+    except ParamError as e:
+        raise HTTPError(400, str(e))
+
+    canonical = dumps([path, fmt, sorted(params.items())])
+    key = (response_version(), canonical)
+    etag = '"' + hashlib.sha1(key[0].encode() + canonical).hexdigest()[:20] + '"'
+    return handler, params, fmt, key, etag
+
+
+def render(handler, params, fmt, key, cached=None):
+    """
+    Encoded response body for a prepared request, from the cache if possible.
+
+    cached is the result of a response_cache lookup the caller already made
+    (MISSING on a miss), so each request counts as one hit or miss.
+    """
+    body = response_cache.get(key) if cached is None else cached
+    if body is MISSING:
+        body = dumps(handler(fmt=fmt, **params))
+        response_cache.set(key, body)
+    return body
+
+
+def render_batch(items):
+    """Evaluate prepared batch items; HTTPError instances are passed through."""
+    parts = []
+    for item in items:
+        if isinstance(item, HTTPError):
+            parts.append(b'{"status":%d,"body":%s}' % (item.status, error_body(item.message)))
+            continue
+        handler, params, fmt, key, etag = item
+        try:
+            body = render(handler, params, fmt, key)
+        except Exception:
+            logger.exception("Batch item failed")
+            parts.append(b'{"status":500,"body":%s}' % error_body("internal error"))
+            continue
+        parts.append(b'{"status":200,"etag":%s,"body":%s}' % (dumps(etag), body))
+    return b'{"responses":[' + b','.join(parts) + b']}'
+
+
+def etag_matches(if_none_match, etag):
+    """Whether an If-None-Match header value matches etag."""
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.decode('latin-1').split(',')]
+    return '*' in tags or etag in tags
+
+
+def query_params(query_string):
+    """Query parameters as a dict; repeated keys become lists."""
+    parsed = parse_qs(query_string.decode('latin-1'), keep_blank_values=True)
+    return {k: v[0] if len(v) == 1 else v for k, v in parsed.items()}
+
+
+async def read_json(receive):
+    """Parse the request body as a JSON object (empty body -> {})."""
+    chunks = []
+    size = 0
+    more = True
+    while more:
+        message = await receive()
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            raise HTTPError(413, "request body too large")
+        chunks.append(chunk)
+        more = message.get('more_body', False)
+    body = b''.join(chunks)
+    if not body:
+        return {}
+    try:
+        payload = loads(body)
+    except ValueError:
+        raise HTTPError(400, "request body is not valid JSON")
+    if not isinstance(payload, dict):
+        raise HTTPError(400, "request body must be a JSON object")
+    return payload
+
+
+async def send_response(send, status, body=b'', etag=None, content_type=b'application/json'):
+    headers = []
+    if status != 304:
+        headers += [(b'content-type', content_type),
+                    (b'content-length', str(len(body)).encode())]
+    if etag is not None:
+        headers += [(b'etag', etag.encode()), (b'cache-control', CACHE_CONTROL)]
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def handle_batch(receive):
+    payload = await read_json(receive)
+    requests = payload.get('requests')
+    if not isinstance(requests, list):
+        raise HTTPError(400, "'requests' must be a list")
+    if len(requests) > MAX_BATCH:
+        raise HTTPError(400, f"at most {MAX_BATCH} requests per batch")
+
+    items = []
+    for entry in requests:
+        try:
+            if not isinstance(entry, dict) or not isinstance(entry.get('params', {}), dict):
+                raise HTTPError(400, "each request needs 'endpoint' and an optional 'params' object")
+            if not isinstance(entry.get('endpoint'), str):
+                raise HTTPError(400, "'endpoint' must be a string")
+            raw = dict(entry.get('params', {}))
+            if 'format' in entry:
+                raw['format'] = entry['format']
+            items.append(prepare(entry.get('endpoint'), raw))
+        except HTTPError as e:
+            items.append(e)
+
+    # One executor hop for the whole batch rather than one per item
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, render_batch, items)
+
+
+async def app(scope, receive, send):
+    """ASGI entry point."""
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                if WARMUP_ENABLED:
+                    await asyncio.to_thread(run_warmup)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    if scope['type'] != 'http':
+        return
+
+    path = scope['path'].rstrip('/') or '/'
+    method = scope['method']
+    try:
+        if path == '/health':
+            await send_response(send, 200, dumps({'status': 'ok', 'data_version': data_version()}))
+            return
+
+        if path == '/ready':
+            report = await asyncio.to_thread(readiness, require_warmup=WARMUP_ENABLED)
+            await send_response(send, 200 if report['ready'] else 503, dumps(report))
+            return
+
+        if path == '/metrics':
+            await send_response(send, 200, render_prometheus().encode(),
+                                content_type=METRICS_CONTENT_TYPE)
+            return
+
+        if path == '/v1/batch':
+            if method != 'POST':
+                raise HTTPError(405, "use POST")
+            await send_response(send, 200, await handle_batch(receive))
+            return
+
+        if method == 'GET':
+            raw = query_params(scope['query_string'])
+        elif method == 'POST':
+            raw = await read_json(receive)
+        else:
+            raise HTTPError(405, "use GET or POST")
+
+        handler, params, fmt, key, etag = prepare(path, raw)
+        headers = dict(scope['headers'])
+        if etag_matches(headers.get(b'if-none-match'), etag):
+            await send_response(send, 304, etag=etag)
+            return
+
+        body = response_cache.get(key)
+        if body is MISSING:
+            loop = asyncio.get_running_loop()
+            body = await loop.run_in_executor(None, render, handler, params, fmt, key, body)
+        await send_response(send, 200, body, etag)
+    except HTTPError as e:
+        await send_response(send, e.status, error_body(e.message))
+    except Exception:
+        logger.exception("Request to %s failed", path)
+        await send_response(send, 500, error_body("internal error"))
@@ -0,0 +1,231 @@
+"""
+Endpoint table of the prediction API.
+
+Each endpoint maps its parameters to parsers and defaults and calls one engine
+function. Parameters can come from the query string or a JSON body. Lists
+may be given as JSON arrays or comma-separated strings.
+"""
+import math
+
+from engine.constants import BRANCH_MAP, CASTE_CATEGORIES, PHASE_FILES
+from engine.chance import CHANCE_MODES, CHANCE_MODE_ABSOLUTE, CHANCE_TIERS
+from engine.optimizer import ORDERING_MODES, ORDERING_STRATEGIC, DEFAULT_MAX_OPTIONS
+from engine.scenarios import BASELINE_SCENARIO, SCENARIO_NAMES, DEFAULT_SWEEP_FACTORS, sweep_reachable
+from engine.constants import get_caste_column_name
+from engine.predictor import predict_colleges, compare_phases, get_college_branches, analyze_branch_cutoffs
+from engine.generators import (
+    COLLEGE_LIST_TYPES, get_web_options, get_hardcoded_best_list, get_rank_based_best_list,
+    get_college_specific_options, add_admission_chances
+)
+
+from .serialize import encode_table
+
+REQUIRED = object()
+DEFAULT_PHASE = "Final Phase"
+DEFAULT_LIST_TYPE = COLLEGE_LIST_TYPES[0]
+
+
+class ParamError(ValueError):
+    """Invalid or missing request parameter."""
+
+
+def integer(minimum=None, maximum=None):
+    """Parser for a bounded integer."""
+    def parse(value):
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            raise ParamError(f"expected an integer, got {value!r}")
+        if (minimum is not None and number < minimum) or (maximum is not None and number > maximum):
+            raise ParamError(f"must be between {minimum} and {maximum}")
+        return number
+    return parse
+
+
+def number(minimum=None, maximum=None):
+    """Parser for a bounded float."""
+    def parse(value):
+        try:
+            result = float(value)
+        except (TypeError, ValueError):
+            raise ParamError(f"expected a number, got {value!r}")
+        if not math.isfinite(result):
+            raise ParamError(f"expected a finite number, got {value!r}")
+        if (minimum is not None and result < minimum) or (maximum is not None and result > maximum):
+            raise ParamError(f"must be between {minimum} and {maximum}")
+        return result
+    return parse
+
+
+def choice(options):
+    """Parser accepting one of options."""
+    def parse(value):
+        if value not in options:
+            raise ParamError(f"must be one of {list(options)}")
+        return value
+    return parse
+
+
+def text(value):
+    """Parser for a non-empty string."""
+    if not isinstance(value, str) or not value.strip():
+        raise ParamError("must be a non-empty string")
+    return value
+
+
+def list_of(parser):
+    """Parser for a list given as an array or a comma-separated string."""
+    def parse(value):
+        items = value.split(',') if isinstance(value, str) else value
+        if not isinstance(items, (list, tuple)):
+            raise ParamError("expected a list")
+        return tuple(parser(item.strip() if isinstance(item, str) else item) for item in items)
+    return parse
+
+
+RANK = integer(1, 500000)
+GENDER = choice(["Male", "Female"])
+CASTE = choice(CASTE_CATEGORIES)
+PHASE = choice(list(PHASE_FILES))
+SCENARIO = choice(SCENARIO_NAMES)
+LIST_TYPE = choice(COLLEGE_LIST_TYPES)
+BRANCH = choice(list(BRANCH_MAP))
+
+
+def predict(rank, gender, caste, branch, phase, district, scenario, fmt):
+    result = predict_colleges(rank, gender, caste, branch,
+                              phase, district, scenario)
+    return {'colleges': None if result is None else encode_table(result, fmt)}
+
+
+def phases(rank, gender, caste, branch, top_n, scenario, fmt):
+    result = compare_phases(rank, gender, caste, branch, top_n, scenario)
+    return {'phases': {phase: encode_table(df, fmt) for phase, df in result.items()}}
+
+
+def college_branches(college, phase, gender, caste, fmt):
+    result = get_college_branches(college, phase, gender, caste)
+    return {'branches': None if result is None else encode_table(result, fmt)}
+
+
+def branch_cutoffs(caste, gender, phase, fmt):
+    _, result = analyze_branch_cutoffs(caste, gender, phase)
+    return {'branches': None if result is None else encode_table(result, fmt)}
+
+
+def web_options(rank, gender, caste, branches, phase, buffer, list_type, ordering, max_options,
+                college_importance, scenario, chance_mode, fmt):
+    result = get_web_options(rank, gender, caste, list(branches), phase, buffer, list_type,
+                             ordering, max_options, college_importance, scenario, chance_mode)
+    return {'chance_tiers': CHANCE_TIERS, 'options': encode_table(result, fmt)}
+
+
+def best_list(rank, gender, caste, phase, buffer, list_type, ordering, max_options,
+              college_importance, scenario, chance_mode, fmt):
+    if rank is None:
+        result = get_hardcoded_best_list(list_type, gender)
+    else:
+        result = get_rank_based_best_list(rank, gender, caste, phase, buffer, list_type, ordering,
+                                          max_options, college_importance, scenario, chance_mode)
+    return {'chance_tiers': CHANCE_TIERS, 'options': encode_table(result, fmt)}
+
+
+def college_options(gender, caste, phase, list_type, scenario, rank, buffer, chance_mode, fmt):
+    top_20, others = get_college_specific_options(
+        gender, caste, phase, list_type, scenario)
+    if rank is not None:
+        top_20 = add_admission_chances(
+            top_20, rank, gender, caste, scenario, buffer, chance_mode)
+        others = add_admission_chances(
+            others, rank, gender, caste, scenario, buffer, chance_mode)
+    return {'chance_tiers': CHANCE_TIERS,
+            'top_20': encode_table(top_20, fmt), 'others': encode_table(others, fmt)}
+
+
+def sweep(rank, gender, caste, phase, factors, fmt):
+    summary, _ = sweep_reachable(
+        rank, get_caste_column_name(gender, caste), factors, phase)
+    return {'sweep': encode_table(summary, fmt)}
+
+
+# path -> (handler, {param: (parser, default)})
+ENDPOINTS = {
+    '/v1/predict': (predict, {
+        'rank': (RANK, REQUIRED), 'gender': (GENDER, REQUIRED), 'caste': (CASTE, REQUIRED),
+        'branch': (choice(["N/A"] + list(BRANCH_MAP)), "N/A"), 'phase': (PHASE, DEFAULT_PHASE),
+        'district': (text, None), 'scenario': (SCENARIO, BASELINE_SCENARIO),
+    }),
+    '/v1/compare-phases': (phases, {
+        'rank': (RANK, REQUIRED), 'gender': (GENDER, REQUIRED), 'caste': (CASTE, REQUIRED),
+        'branch': (BRANCH, REQUIRED), 'top_n': (integer(1, 1000), 5),
+        'scenario': (SCENARIO, BASELINE_SCENARIO),
+    }),
+    '/v1/college-branches': (college_branches, {
+        'college': (text, REQUIRED), 'phase': (PHASE, DEFAULT_PHASE),
+        'gender': (GENDER, REQUIRED), 'caste': (CASTE, REQUIRED),
+    }),
+    '/v1/branch-cutoffs': (branch_cutoffs, {
+        'caste': (CASTE, REQUIRED), 'gender': (GENDER, REQUIRED), 'phase': (PHASE, DEFAULT_PHASE),
+    }),
+    '/v1/web-options': (web_options, {
+        'rank': (RANK, REQUIRED), 'gender': (GENDER, REQUIRED), 'caste': (CASTE, REQUIRED),
+        'branches': (list_of(BRANCH), REQUIRED), 'phase': (PHASE, DEFAULT_PHASE),
+        'buffer': (integer(0, 50000), 1000), 'list_type': (LIST_TYPE, DEFAULT_LIST_TYPE),
+        'ordering': (choice(ORDERING_MODES), ORDERING_STRATEGIC),
+        'max_options': (integer(1, 1000), DEFAULT_MAX_OPTIONS),
+        'college_importance': (number(0, 1), 0.5), 'scenario': (SCENARIO, BASELINE_SCENARIO),
+        'chance_mode': (choice(CHANCE_MODES), CHANCE_MODE_ABSOLUTE),
+    }),
+    '/v1/best-list': (best_list, {
+        'rank': (RANK, None), 'gender': (GENDER, REQUIRED), 'caste': (CASTE, "OC"),
+        'phase': (PHASE, DEFAULT_PHASE), 'buffer': (integer(0, 50000), 1000),
+        'list_type': (LIST_TYPE, DEFAULT_LIST_TYPE),
+        'ordering': (choice(ORDERING_MODES), ORDERING_STRATEGIC),
+        'max_options': (integer(1, 1000), DEFAULT_MAX_OPTIONS),
+        'college_importance': (number(0, 1), 0.5), 'scenario': (SCENARIO, BASELINE_SCENARIO),
+        'chance_mode': (choice(CHANCE_MODES), CHANCE_MODE_ABSOLUTE),
+    }),
+    '/v1/college-options': (college_options, {
+        'gender': (GENDER, REQUIRED), 'caste': (CASTE, REQUIRED), 'phase': (PHASE, DEFAULT_PHASE),
+        'list_type': (LIST_TYPE, DEFAULT_LIST_TYPE), 'scenario': (SCENARIO, BASELINE_SCENARIO),
+        'rank': (RANK, None), 'buffer': (integer(0, 50000), 2000),
+        'chance_mode': (choice(CHANCE_MODES), CHANCE_MODE_ABSOLUTE),
+    }),
+    '/v1/sweep': (sweep, {
+        'rank': (RANK, REQUIRED), 'gender': (GENDER, REQUIRED), 'caste': (CASTE, REQUIRED),
+        'phase': (PHASE, DEFAULT_PHASE),
+        'factors': (list_of(number(0.1, 10)), DEFAULT_SWEEP_FACTORS),
+    }),
+}
+
+
+def parse_params(spec, raw):
+    """
+    Validate raw parameters against an endpoint's spec.
+
+    Args:
+        spec (dict): Parameter name -> (parser, default)
+        raw (dict): Parameters from the query string or JSON body
+
+    Returns:
+        dict: Parsed parameters with defaults filled in
+
+    Raises:
+        ParamError: On unknown, missing or invalid parameters
+    """
+    unknown = set(raw) - set(spec)
+    if unknown:
+        raise ParamError(f"unknown parameter(s): {', '.join(sorted(unknown))}")
+
+    params = {}
+    for name, (parser, default) in spec.items():
+        if name not in raw or raw[name] in (None, ''):
+            if default is REQUIRED:
+                raise ParamError(f"missing required parameter '{name}'")
+            params[name] = default
+            continue
+        try:
+            params[name] = parser(raw[name])
+        except ParamError as e:
+            raise ParamError(f"'{name}' {e}")
+    return params
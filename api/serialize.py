@@ -0,0 +1,90 @@
+"""
+JSON encoding of engine results for the HTTP API.
+
+Tables are sent column-wise by default:
+
+    {"rows": 2, "columns": ["College Name", "Closing Rank"],
+     "data": [["A", "B"], [1200, 3400]]}
+
+Each column is a single JSON array, which is smaller than repeating every key
+per row and maps directly onto data frames on the client. ``format=records``
+returns the usual list of objects instead. NaN and infinite values become
+null.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+FORMAT_COLUMNS = "columns"
+FORMAT_RECORDS = "records"
+FORMATS = [FORMAT_COLUMNS, FORMAT_RECORDS]
+
+
+def column_values(series):
+    """
+    JSON-ready list for one column.
+
+    Args:
+        series (pandas.Series): Column to convert
+
+    Returns:
+        list: Python values, None where missing or infinite
+    """
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        return series.tolist()
+    if pd.api.types.is_numeric_dtype(series):
+        values = series.to_numpy(dtype=float)
+        missing = ~np.isfinite(values)
+        if not missing.any():
+            return values.tolist()
+        result = values.astype(object)
+        result[missing] = None
+        return result.tolist()
+    values = series.to_numpy(dtype=object)
+    result = np.where(pd.isna(values), None, values)
+    return [v.item() if isinstance(v, np.generic) else v for v in result]
+
+
+def encode_table(table, fmt=FORMAT_COLUMNS):
+    """
+    Encodable form of a table.
+
+    Args:
+        table (pandas.DataFrame or list): Data frame or list of row dicts
+        fmt (str): One of FORMATS
+
+    Returns:
+        dict or list: Columnar dict, or list of records
+    """
+    df = table if isinstance(table, pd.DataFrame) else pd.DataFrame(table)
+    columns = [str(c) for c in df.columns]
+    data = [column_values(df.iloc[:, i]) for i in range(df.shape[1])]
+    if fmt == FORMAT_RECORDS:
+        return [dict(zip(columns, row)) for row in zip(*data)]
+    return {'rows': len(df), 'columns': columns, 'data': data}
+
+
+def _default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload):
+    """Serialize a payload of plain Python values to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default)
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False, default=_default).encode()
+
+
+def loads(body):
+    """Parse a UTF-8 JSON request body."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
@@ -7,15 +7,24 @@ import streamlit as st
 import logging
 import pytz
 import time
-import psutil
 import os
+import pandas as pd
+from contextlib import contextmanager
 from datetime import datetime
 from functools import lru_cache
 from typing import Optional, Dict, Any, Tuple
 
+from engine.cache import cache_stats, cached
+from engine.metrics import get_sampler, registry, serve_metrics, timer
+from engine.profiling import capture
+from engine.tracing import recent_traces, span, trace
+from modules.fragments import PROFILE_BUDGET, profile_requested, request_query
+
 
 # This allows both local and Railway deployment
 port = int(os.environ.get("PORT", 8501))
+# Local Prometheus-style metrics endpoint (set METRICS_PORT to an empty value to disable)
+DEFAULT_METRICS_PORT = 9464
 # ============================================================================
 # PERFORMANCE MONITORING & LOGGING CONFIGURATION
 # ============================================================================
@@ -34,24 +43,22 @@ class PerformanceMonitor:
 
     @staticmethod
     def start_monitoring() -> Dict[str, Any]:
-        """Start performance monitoring"""
+        """Start performance monitoring (reads the background sampler, never blocks)"""
         try:
-            start_time = time.time()
-            memory_usage = psutil.Process().memory_info().rss / 1024 / 1024  # MB
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-
+            sampler = get_sampler()
             return {
-                'start_time': start_time,
-                'memory_mb': memory_usage,
-                'cpu_percent': cpu_percent
+                'start_time': time.perf_counter(),
+                'memory_mb': sampler.rss_bytes / 1024 / 1024,
+                'cpu_percent': sampler.cpu_percent
             }
         except Exception:
-            return {'start_time': time.time(), 'memory_mb': 0, 'cpu_percent': 0}
+            return {'start_time': time.perf_counter(), 'memory_mb': 0, 'cpu_percent': 0}
 
     @staticmethod
     def log_performance(metrics: Dict[str, Any], operation_name: str):
-        """Log performance metrics if concerning"""
-        duration = time.time() - metrics['start_time']
+        """Record the rerun latency and log performance metrics if concerning"""
+        duration = time.perf_counter() - metrics['start_time']
+        registry.observe(operation_name, duration)
 
         # Only log performance issues
         if duration > 2.0 or metrics['memory_mb'] > 500:
@@ -64,15 +71,77 @@ class PerformanceMonitor:
                 st.metric("⏱️ Load Time", f"{duration:.2f}s")
                 st.metric("💾 Memory", f"{metrics['memory_mb']:.1f}MB")
                 st.metric("🔧 CPU", f"{metrics['cpu_percent']:.1f}%")
+                PerformanceMonitor.render_latency_table()
+                PerformanceMonitor.render_cache_table()
+                PerformanceMonitor.render_trace_waterfall()
+
+    @staticmethod
+    def render_latency_table():
+        """Admin view of the latency percentiles of every timed entry point"""
+        summary = registry.summary()
+        if not summary:
+            return
+        st.markdown("**Latency by entry point**")
+        st.dataframe(
+            pd.DataFrame(summary).drop(columns=['Total (s)']),
+            column_config={c: st.column_config.NumberColumn(format="%.1f")
+                           for c in ('Mean (ms)', 'p50 (ms)', 'p95 (ms)', 'p99 (ms)')},
+            hide_index=True,
+            use_container_width=True
+        )
+
+    @staticmethod
+    def render_cache_table():
+        """Admin view of hits, misses, size and evictions per cached function"""
+        rows = cache_stats()
+        if not rows:
+            return
+        with st.expander("🗄️ Cache statistics"):
+            caches = pd.DataFrame(rows)
+            caches['Hit rate'] = 100 * caches['Hit rate']
+            caches['Bytes'] = caches['Bytes'] / 1024 / 1024
+            st.dataframe(
+                caches.rename(columns={'Bytes': 'Size (MB)', 'Hit rate': 'Hit rate (%)'}),
+                column_config={'Size (MB)': st.column_config.NumberColumn(format="%.2f"),
+                               'Hit rate (%)': st.column_config.NumberColumn(format="%.0f")},
+                hide_index=True,
+                use_container_width=True
+            )
+
+    @staticmethod
+    def render_trace_waterfall():
+        """Admin waterfall of a recent traced rerun, slowest first"""
+        traces = sorted(recent_traces(), key=lambda t: t.duration, reverse=True)[:20]
+        if not traces:
+            return
+        with st.expander("🐢 Slow reruns"):
+            chosen = st.selectbox(
+                "Trace", traces,
+                format_func=lambda t: f"{t.name} · {1000 * t.duration:.0f} ms · "
+                                      f"{datetime.fromtimestamp(t.started_at):%H:%M:%S}")
+            from modules.visualizations import create_trace_waterfall
+            st.plotly_chart(create_trace_waterfall(chosen.to_dict()), use_container_width=True)
+
+
+@st.cache_resource
+def start_metrics_endpoint():
+    """Start the resource sampler and the local Prometheus endpoint once per process"""
+    get_sampler()
+    port = os.getenv('METRICS_PORT', str(DEFAULT_METRICS_PORT))
+    if not port:
+        return None
+    server = serve_metrics(int(port))
+    if server is not None:
+        logger.info(f"Metrics served at http://127.0.0.1:{server.server_port}/metrics")
+    return server
 
 # ============================================================================
 # OPTIMIZED DATA LOADING WITH ADVANCED CACHING
 # ============================================================================
 
 
-@st.cache_data(ttl=3600, show_spinner="🔄 Loading college data...")
 def load_colleges_data():
-    """Load and cache college data with error handling"""
+    """Load college data with error handling (the engine caches the frame)"""
     try:
         from modules.data_loader import load_data
         data = load_data("Final Phase")
@@ -89,7 +158,7 @@ def load_colleges_data():
         return None
 
 
-@st.cache_data(ttl=7200)  # Cache for 2 hours
+@cached(ttl=7200, shared=False)  # Cache for 2 hours
 def get_top_colleges_data() -> Tuple[list, list]:
     """Cache top colleges lists"""
     try:
@@ -100,7 +169,7 @@ def get_top_colleges_data() -> Tuple[list, list]:
         return [], []
 
 
-@st.cache_data(ttl=60)  # Cache for 1 minute to avoid constant time updates
+@cached(ttl=60, shared=False)  # Cache for 1 minute to avoid constant time updates
 def get_current_time_ist() -> str:
     """Get current IST time (cached)"""
     ist = pytz.timezone('Asia/Kolkata')
@@ -117,7 +186,7 @@ def get_current_time_ist() -> str:
     #     unsafe_allow_html=True,
     # )
 
-@st.cache_data(ttl=86400)  # Cache for 24 hours
+@cached(ttl=86400, shared=False)  # Cache for 24 hours
 def get_static_content() -> Dict[str, str]:
     """Cache all static content"""
     return {
@@ -191,13 +260,12 @@ class SessionManager:
             st.session_state.app_initialized = True
             st.session_state.page_configured = False
 
-            # Performance settings
-            st.session_state.show_debug_metrics = False
+            # Performance settings (ADMIN_METRICS=1 shows the metrics sidebar)
+            st.session_state.show_debug_metrics = os.getenv('ADMIN_METRICS') == '1'
             st.session_state.show_footer_expanded = False
 
             # Data loading state
             st.session_state.data_loaded = False
-            st.session_state.colleges_data = None
             st.session_state.loading_error = None
 
             # UI state
@@ -208,13 +276,13 @@ class SessionManager:
 
     @staticmethod
     def ensure_data_loaded() -> bool:
-        """Ensure data is loaded, load if necessary"""
+        """Check once per session that the data loads; later reruns only read the flag"""
         if not st.session_state.get('data_loaded', False):
             try:
                 with st.spinner("🔄 Loading college data..."):
-                    st.session_state.colleges_data = load_colleges_data()
+                    colleges_data = load_colleges_data()
 
-                if st.session_state.colleges_data is None:
+                if colleges_data is None:
                     st.session_state.loading_error = "Failed to load college data"
                     return False
 
@@ -276,6 +344,9 @@ class LazyModuleLoader:
                 elif module_name == 'phase_comparison':
                     from pagess import phase_comparison
                     cls._modules[module_name] = phase_comparison
+                elif module_name == 'allotment_simulator':
+                    from pagess import allotment_simulator
+                    cls._modules[module_name] = allotment_simulator
                 #     # # Branch Analysis Tab
                 #     # with tabs[7]:
                 #     #     branch_analysis.render()
@@ -295,7 +366,8 @@ class LazyModuleLoader:
         module = cls.get_module(module_name)
         if module and hasattr(module, 'render'):
             try:
-                module.render()
+                with timer(f"page.{module_name}"), span(f"page.{module_name}"):
+                    module.render()
                 return True
             except Exception as e:
                 st.error(f"Error rendering {module_name}: {str(e)}")
@@ -423,6 +495,13 @@ def render_help_tab_optimized():
     - Compare how **cutoff ranks** change across **different counseling phases**
     - Helps you decide whether to lock a seat early or wait for later rounds
 
+    ---
+
+    #### **8. Seat Allotment Simulator Tab**
+    - Simulate counselling rounds over a **synthetic population** of candidates
+    - Change the **preference model**, **withdrawals** and **seat availability** to explore what-if scenarios
+    - Upload your own **seat matrix** CSV (download the template from the tab)
+
     ---
     #### 🧰 Web Options Generator – Key Features
 
@@ -452,39 +531,61 @@ def render_help_tab_optimized():
         else:
             st.info("College rankings data not available")
 
+
 # ============================================================================
-# OPTIMIZED TAB RENDERING WITH LAZY LOADING
+# PAGE NAVIGATION (ONLY THE ACTIVE PAGE RUNS)
 # ============================================================================
 
+PAGE_CONFIGS = [
+    ("College Predictor", "college_predictor"),
+    ("Web Options Branch-Specific", "web_options_generator"),
+    ("Web Options College-Specific", "college_specific_generator"),
+    ("Web Options Best Possible", "best_specific_generator"),
+    ("College-wise Branches", "college_branches"),
+    ("College Search by Branch", "college_search"),
+    ("Phase Comparison", "phase_comparison"),
+    ("Seat Allotment Simulator", "allotment_simulator"),
+    #  "Branch Analysis",
+    ("Help", "help")
+]
+
+
+def make_page_runner(page_name: str, module_name: str):
+    """Callable for st.Page that imports and renders its module on first visit"""
+    if module_name == "help":
+        def run_help():
+            with timer("page.help"), span("page.help"):
+                render_help_tab_optimized()
 
-def render_tabs_optimized():
-    """Render tabs with optimized lazy loading"""
-    tab_configs = [
-        ("College Predictor", "college_predictor"),
-        ("Web Options Branch-Specific", "web_options_generator"),
-        ("Web Options College-Specific", "college_specific_generator"),
-        ("Web Options Best Possible", "best_specific_generator"),
-        ("College-wise Branches", "college_branches"),
-        ("College Search by Branch", "college_search"),
-        ("Phase Comparison", "phase_comparison"),
-        #  "Branch Analysis",
-        ("Help", "help")
+        return run_help
+
+    def run_page():
+        # Only pages that read the data check that it loads
+        if not SessionManager.ensure_data_loaded():
+            SessionManager.handle_data_error()
+            return
+        success = LazyModuleLoader.render_module(module_name)
+        if not success:
+            st.info(
+                f"The {page_name} feature is temporarily unavailable. Please try refreshing the page.")
+
+    run_page.__name__ = f"run_{module_name}"
+    return run_page
+
+
+def render_navigation():
+    """
+    Render the page menu and run only the selected page.
+
+    Pages are routed with st.navigation, so a rerun executes just the active
+    page; the other page modules are not imported until they are visited.
+    """
+    pages = [
+        st.Page(make_page_runner(page_name, module_name), title=page_name,
+                url_path=module_name, default=(i == 0))
+        for i, (page_name, module_name) in enumerate(PAGE_CONFIGS)
     ]
-
-    tabs = st.tabs([config[0] for config in tab_configs])
-
-    # Render tabs with lazy loading
-    for i, (tab_name, module_name) in enumerate(tab_configs):
-        with tabs[i]:
-            if module_name == "help":
-                render_help_tab_optimized()
-            else:
-                # Only load and render if this tab is likely active
-                # (Streamlit doesn't provide direct tab state, so we render all but with optimizations)
-                success = LazyModuleLoader.render_module(module_name)
-                if not success and module_name != "help":
-                    st.info(
-                        f"The {tab_name} feature is temporarily unavailable. Please try refreshing the page.")
+    st.navigation(pages, position="top").run()
 
 # ============================================================================
 # MAIN APPLICATION FUNCTION
@@ -494,6 +595,7 @@ def render_tabs_optimized():
 def main():
     """Optimized main application function"""
     # Start performance monitoring
+    start_metrics_endpoint()
     perf_metrics = PerformanceMonitor.start_monitoring()
 
     # Initialize session state
@@ -518,13 +620,8 @@ def main():
     # Main title
     st.title("🎓 TS EAMCET 2025 College Predictor")
 
-    # Handle data loading with error recovery
-    if not SessionManager.ensure_data_loaded():
-        SessionManager.handle_data_error()
-        return
-
-    # Render main content
-    render_tabs_optimized()
+    # Render main content (data pages check that the data loads)
+    render_navigation()
 
     # Footer and support sections (optimized)
     create_optimized_footer()
@@ -551,6 +648,23 @@ def main():
     # Log performance metrics
     PerformanceMonitor.log_performance(perf_metrics, "Main app render")
 
+
+@contextmanager
+def traced_rerun():
+    """Trace the rerun, and profile it when it runs over budget or an admin asks"""
+    with trace("rerun") as root, capture(
+            "rerun", budget=PROFILE_BUDGET, force=profile_requested(),
+            metadata={'trace_id': root.trace.trace_id, 'query': request_query()}) as profile:
+        try:
+            yield
+        finally:
+            pages = [s.name for s in root.trace.spans if s.name.startswith('page.')]
+            profile.metadata['pages'] = pages
+            if pages:
+                profile.label = pages[-1]
+    if profile.force and profile.path:
+        st.toast(f"Profile saved to {profile.path}")
+
 # ============================================================================
 # ENTRY POINT
 # ============================================================================
@@ -558,7 +672,8 @@ def main():
 
 if __name__ == "__main__":
     try:
-        main()
+        with traced_rerun():
+            main()
     except Exception as e:
         logger.error(f"Critical application error: {e}")
         st.error("""
@@ -0,0 +1,34 @@
+"""
+Prediction engine for the TS EAMCET College Predictor.
+
+Pure NumPy/pandas code with no Streamlit dependency, so a CLI, API server,
+batch job or benchmark can use the same logic as the web app:
+
+- store: loading and cleaning the phase data
+- index: sorted cutoff indexes
+- vocab: option lists for selection widgets, built once per data version
+- scenarios: rank-inflation scenario views and sweeps
+- predictor: college prediction and phase comparison
+- generators: web option lists
+- probability, chance, optimizer: scoring, chance tiers and option ordering
+- simulator: counselling seat-allotment simulation
+- cache: pluggable result caching used by all of the above
+- shared_cache: optional second cache level on disk (SQLite) or Redis, set
+  up from RESULT_CACHE_URL when the package is imported
+- metrics: latency histograms of the entry points and process resource gauges
+- tracing: hierarchical spans per rerun or request, with cache hits and misses
+- profiling: sampled or cProfile captures of slow reruns, with retention
+- querylog, warmup: query logging and the startup warm-up that replays it
+- readiness: whether a replica can answer queries within budget
+"""
+from .cache import cached, clear_cache, get_cache_backend, set_cache_backend, MemoryCache, NullCache
+from .store import DataLoadError, load_phase, get_phase
+from .predictor import predict_colleges, compare_phases, get_college_branches, analyze_branch_cutoffs
+from .generators import (
+    get_web_options, get_hardcoded_best_list, get_rank_based_best_list, get_college_specific_options
+)
+from .scenarios import BASELINE_SCENARIO, SCENARIOS, get_scenario_view, sweep_reachable
+from .vocab import Vocabulary, get_vocabulary
+from .shared_cache import install_shared_cache
+
+install_shared_cache()
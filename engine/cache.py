@@ -0,0 +1,422 @@
+"""
+Pluggable result caching for the prediction engine.
+
+Engine functions are wrapped with ``@cached(ttl=...)``. Results go to the
+active backend, which is an in-process MemoryCache by default. Front ends can
+swap it with set_cache_backend, for example NullCache in benchmarks. Cached
+results are shared between callers and must be treated as read-only. Inside a
+trace, each call records a span marked as a cache hit or miss.
+
+The default backend is bounded by ENGINE_CACHE_MB of approximate entry size
+as well as an entry count. Functions with one result per distinct query
+carry a byte quota, so a burst of distinct ranks evicts their own entries
+first, and memory stays flat however many distinct queries arrive.
+
+MemoryCache counts hits, misses, evictions and expirations, plus the live
+entries and their approximate size, for each cached function (or for the
+whole cache when it is given a name). cache_stats() collects them from every
+MemoryCache for the metrics endpoint and the admin panel.
+
+Results can also go to a second, shared level (engine.shared_cache) that
+outlives the process. Functions whose results only make sense in this
+process, such as the loaded data itself, are declared with shared=False.
+"""
+import functools
+import hashlib
+import inspect
+import itertools
+import os
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .tracing import span
+
+MISSING = object()
+MAX_SIZE_DEPTH = 4
+
+LRU = "lru"
+LFU = "lfu"
+POLICIES = (LRU, LFU)
+LFU_SAMPLE = 16
+
+# Budget of the default engine backend
+ENGINE_CACHE_ENTRIES = 4096
+ENGINE_CACHE_BYTES = int(float(os.getenv('ENGINE_CACHE_MB', '256')) * 1024 * 1024)
+ENGINE_CACHE_POLICY = os.getenv('ENGINE_CACHE_POLICY', LRU).lower()
+# Quota of functions with one result per distinct query (rank, category, ...)
+RESULT_QUOTA_BYTES = 32 * 1024 * 1024
+
+
+def approximate_size(value, depth=0):
+    """
+    Rough memory footprint of a cached value in bytes.
+
+    pandas objects and arrays report their buffers (object columns included);
+    containers are summed a few levels deep. Shared objects are counted once
+    per reference, so the total is an upper bound for data shared between
+    entries.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, 'sum') else usage)
+    if isinstance(value, np.ndarray):
+        if value.dtype == object and depth < MAX_SIZE_DEPTH:
+            return value.nbytes + sum(sys.getsizeof(v) for v in value.ravel().tolist())
+        return value.nbytes
+    size = sys.getsizeof(value)
+    if depth >= MAX_SIZE_DEPTH:
+        return size
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(approximate_size(v, depth + 1) for v in value)
+    if isinstance(value, dict) or hasattr(value, 'items') and hasattr(value, 'keys'):
+        return size + sum(approximate_size(k, depth + 1) + approximate_size(v, depth + 1)
+                          for k, v in value.items())
+    return size
+
+
+class CacheStats:
+    """Counters of one cached function (or of a whole named cache)."""
+
+    __slots__ = ('hits', 'misses', 'evictions', 'expirations', 'rejections', 'entries', 'bytes')
+
+    def __init__(self):
+        self.hits = self.misses = self.evictions = self.expirations = self.rejections = 0
+        self.entries = self.bytes = 0
+
+    @property
+    def hit_rate(self):
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else float('nan')
+
+    def copy(self):
+        other = CacheStats()
+        for name in self.__slots__:
+            setattr(other, name, getattr(self, name))
+        return other
+
+
+class _Entry:
+    __slots__ = ('expires_at', 'value', 'size', 'uses')
+
+    def __init__(self, expires_at, value, size):
+        self.expires_at = expires_at
+        self.value = value
+        self.size = size
+        self.uses = 0
+
+
+_caches = weakref.WeakSet()
+_quotas = {}
+_unshared = set()
+
+
+def track(cache):
+    """Include a cache's stats() in cache_stats() while the cache is alive."""
+    _caches.add(cache)
+
+
+def set_quota(namespace, max_bytes):
+    """Cap the bytes one cached function may hold in any MemoryCache (None removes the cap)."""
+    if max_bytes is None:
+        _quotas.pop(namespace, None)
+    else:
+        _quotas[namespace] = max_bytes
+
+
+class MemoryCache:
+    """
+    Thread-safe in-process cache with per-entry expiry, a byte budget and statistics.
+
+    Entries are evicted when the cache holds more than max_entries or
+    max_bytes, and when a cached function goes over its quota (set_quota).
+    The LRU policy evicts the least recently used entry. LFU evicts the least
+    used of the LFU_SAMPLE least recently used entries, so one burst of
+    distinct queries cannot flush entries that are hit all the time. Values
+    larger than the budget or quota are not stored.
+    """
+
+    def __init__(self, max_entries=512, name=None, max_bytes=None, policy=LRU):
+        """
+        Args:
+            max_entries (int): Entries kept before one is evicted
+            name (str, optional): Report statistics under this name instead of
+                per cached function (for caches not used through @cached)
+            max_bytes (int, optional): Budget for the approximate size of all entries
+            policy (str): LRU or LFU
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}")
+        self.max_entries = max_entries
+        self.name = name
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self._entries = OrderedDict()
+        self._stats = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        track(self)
+
+    def _namespace(self, key):
+        return self.name or (key[0] if isinstance(key, tuple) and key else "-")
+
+    def _stats_for(self, namespace):
+        stats = self._stats.get(namespace)
+        if stats is None:
+            stats = self._stats[namespace] = CacheStats()
+        return stats
+
+    def _drop(self, key, stats):
+        # Caller holds the lock
+        entry = self._entries.pop(key)
+        stats.entries -= 1
+        stats.bytes -= entry.size
+        self._bytes -= entry.size
+
+    def _victim(self, namespace=None, keep=None):
+        """
+        Key to evict next, optionally among one function's entries.
+
+        keep (the entry being stored) is only chosen when no other entry
+        qualifies; under LFU it has no uses yet and would otherwise often be
+        evicted by the set() that stores it.
+        """
+        candidates = (k for k in self._entries if k is not keep
+                      and (namespace is None or self._namespace(k) == namespace))
+        if self.policy == LRU:
+            victim = next(candidates, None)
+        else:
+            sample = list(itertools.islice(candidates, LFU_SAMPLE))
+            victim = min(sample, key=lambda k: self._entries[k].uses, default=None)
+        return keep if victim is None else victim
+
+    def _evict(self, key):
+        stats = self._stats_for(self._namespace(key))
+        self._drop(key, stats)
+        stats.evictions += 1
+
+    def get(self, key):
+        """Cached value for key, or MISSING."""
+        with self._lock:
+            stats = self._stats_for(self._namespace(key))
+            entry = self._entries.get(key)
+            if entry is None:
+                stats.misses += 1
+                return MISSING
+            if entry.expires_at is not None and entry.expires_at < time.monotonic():
+                self._drop(key, stats)
+                stats.expirations += 1
+                stats.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            entry.uses += 1
+            stats.hits += 1
+            return entry.value
+
+    def set(self, key, value, ttl=None):
+        """Store value under key for ttl seconds (forever if ttl is None)."""
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        size = approximate_size(value)
+        namespace = self._namespace(key)
+        quota = None if self.name else _quotas.get(namespace)
+        with self._lock:
+            stats = self._stats_for(namespace)
+            if key in self._entries:
+                self._drop(key, stats)
+            if size > min(self.max_bytes or size, quota or size):
+                stats.rejections += 1
+                return
+            self._entries[key] = _Entry(expires_at, value, size)
+            stats.entries += 1
+            stats.bytes += size
+            self._bytes += size
+            while quota is not None and stats.bytes > quota:
+                self._evict(self._victim(namespace, keep=key))
+            while len(self._entries) > self.max_entries or (
+                    self.max_bytes is not None and self._bytes > self.max_bytes):
+                self._evict(self._victim(keep=key))
+
+    def clear(self, namespace=None):
+        """Drop every entry, or only those of one cached function."""
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                self._bytes = 0
+                for stats in self._stats.values():
+                    stats.entries = stats.bytes = 0
+            else:
+                for key in [k for k in self._entries if self._namespace(k) == namespace]:
+                    self._drop(key, self._stats_for(namespace))
+
+    def stats(self):
+        """
+        Statistics per cached function.
+
+        Returns:
+            dict: Namespace -> CacheStats (copies)
+        """
+        with self._lock:
+            return {namespace: stats.copy() for namespace, stats in self._stats.items()}
+
+    @property
+    def nbytes(self):
+        """Approximate size of all entries."""
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class NullCache:
+    """Backend that never stores anything."""
+
+    def get(self, key):
+        return MISSING
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def clear(self, namespace=None):
+        pass
+
+    def stats(self):
+        return {}
+
+    def __len__(self):
+        return 0
+
+
+_backend = MemoryCache(max_entries=ENGINE_CACHE_ENTRIES, max_bytes=ENGINE_CACHE_BYTES,
+                       policy=ENGINE_CACHE_POLICY)
+
+
+def get_cache_backend():
+    """Backend currently used by @cached functions."""
+    return _backend
+
+
+def set_cache_backend(backend):
+    """
+    Replace the cache backend.
+
+    Args:
+        backend: Object with get(key), set(key, value, ttl) and clear(namespace)
+
+    Returns:
+        The previous backend
+    """
+    global _backend
+    previous, _backend = _backend, backend
+    return previous
+
+
+def clear_cache():
+    """Drop every cached engine result."""
+    _backend.clear()
+
+
+def cache_stats():
+    """
+    Statistics of every tracked cache in the process, one row per function.
+
+    Returns:
+        list: Dicts with Cache, Hits, Misses, Hit rate, Entries, Bytes,
+            Evictions, Expirations and Rejections, largest first
+    """
+    rows = []
+    for cache in list(_caches):
+        for namespace, stats in cache.stats().items():
+            rows.append({'Cache': namespace, 'Hits': stats.hits, 'Misses': stats.misses,
+                         'Hit rate': stats.hit_rate, 'Entries': stats.entries,
+                         'Bytes': stats.bytes, 'Evictions': stats.evictions,
+                         'Expirations': stats.expirations, 'Rejections': stats.rejections})
+    return sorted(rows, key=lambda r: r['Bytes'], reverse=True)
+
+
+def freeze(value):
+    """
+    Hashable stand-in for a function argument.
+
+    Lists, tuples, dicts and sets are frozen recursively; arrays and pandas
+    objects are reduced to a content digest.
+
+    Raises:
+        TypeError: If the value cannot be made hashable
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(v) for v in value)
+    if isinstance(value, np.ndarray):
+        return ('ndarray', value.shape, value.dtype.str,
+                hashlib.sha1(np.ascontiguousarray(value).tobytes()).hexdigest())
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        digest = hashlib.sha1(pd.util.hash_pandas_object(
+            value, index=True).to_numpy().tobytes()).hexdigest()
+        columns = tuple(value.columns) if isinstance(
+            value, pd.DataFrame) else value.name
+        return (type(value).__name__, columns, digest)
+    hash(value)
+    return value
+
+
+def is_shared(namespace):
+    """Whether a cached function's results may be kept outside the process."""
+    return namespace not in _unshared
+
+
+def cached(ttl=None, max_bytes=None, shared=True):
+    """
+    Cache a function's results in the active backend.
+
+    Arguments are bound to the signature first, so f(1) and f(1, default)
+    share an entry. Calls with arguments that cannot be frozen are not cached.
+
+    Args:
+        ttl (float, optional): Seconds an entry stays valid
+        max_bytes (int, optional): Quota for this function's entries (see set_quota)
+        shared (bool): Allow a shared second-level cache to keep the results
+            (False for data that is cheap to rebuild locally or not picklable)
+
+    Returns:
+        Decorator
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        namespace = f"{func.__module__}.{func.__qualname__}"
+        if max_bytes is not None:
+            set_quota(namespace, max_bytes)
+        if not shared:
+            _unshared.add(namespace)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            try:
+                key = (namespace, freeze(tuple(bound.arguments.items())))
+            except TypeError:
+                return func(*args, **kwargs)
+
+            backend = _backend
+            with span(namespace) as current:
+                value = backend.get(key)
+                if value is MISSING:
+                    current.set(cache="miss")
+                    value = func(*args, **kwargs)
+                    backend.set(key, value, ttl)
+                else:
+                    current.set(cache="hit")
+            return value
+
+        wrapper.cache_clear = lambda: _backend.clear(namespace)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,134 @@
+"""
+Tiered admission-chance classification for the TS EAMCET College Predictor.
+
+Every seat is put in one of four tiers by comparing its closing rank with the
+candidate's rank:
+
+- Safe:  closing rank is beyond your rank plus the safe band
+- Good:  closing rank is at or beyond your rank, up to your rank plus the
+  safe band
+- Reach: closing rank is within the reach band below your rank (its lower
+  edge included)
+- Dream: closing rank is further below your rank
+
+With a zero buffer a closing rank equal to your rank is Good.
+
+The bands come from the safety buffer. They are either absolute (ranks) or
+relative (a fraction of your rank). Labels are computed for a whole array at
+once and returned as small integer codes (-1 where the cutoff is unknown), so
+results carry a compact categorical column instead of strings.
+"""
+import numpy as np
+import pandas as pd
+
+CHANCE_TIERS = ['Dream', 'Reach', 'Good', 'Safe']
+DREAM, REACH, GOOD, SAFE = range(len(CHANCE_TIERS))
+UNKNOWN = -1
+
+CHANCE_ICONS = {
+    'Dream': "🔴 Dream",
+    'Reach': "🟡 Reach",
+    'Good': "🟢 Good",
+    'Safe': "🔵 Safe",
+}
+
+CHANCE_MODE_ABSOLUTE = "Absolute (ranks)"
+CHANCE_MODE_RELATIVE = "Relative (% of your rank)"
+CHANCE_MODES = [CHANCE_MODE_ABSOLUTE, CHANCE_MODE_RELATIVE]
+
+CHANCE_MODE_HELP = """
+- **Absolute**: Reach and Safe bands are the safety buffer in ranks
+- **Relative**: The bands scale with your rank; a 1000 rank buffer means 10% of your rank
+"""
+
+# In relative mode a buffer of this many ranks is a 100% band
+RELATIVE_REFERENCE_RANK = 10000
+
+
+def chance_edges(user_rank, buffer=1000, mode=CHANCE_MODE_ABSOLUTE, reach_band=None, safe_band=None):
+    """
+    Closing-rank edges between the Dream, Reach, Good and Safe tiers.
+
+    Args:
+        user_rank (int): Candidate's rank
+        buffer (int): Safety buffer in ranks
+        mode (str): One of CHANCE_MODES
+        reach_band (float, optional): Reach band (ranks, or fraction in relative mode)
+        safe_band (float, optional): Safe band (ranks, or fraction in relative mode)
+
+    Returns:
+        numpy.ndarray: The three ascending edges; the first two belong to the
+            tier above them, the last to the tier below it
+    """
+    if mode == CHANCE_MODE_RELATIVE:
+        default_band = buffer / RELATIVE_REFERENCE_RANK
+        reach_band = default_band if reach_band is None else reach_band
+        safe_band = default_band if safe_band is None else safe_band
+        return np.array([user_rank * (1 - reach_band), user_rank, user_rank * (1 + safe_band)],
+                        dtype=float)
+
+    reach_band = buffer if reach_band is None else reach_band
+    safe_band = buffer if safe_band is None else safe_band
+    return np.array([user_rank - reach_band, user_rank, user_rank + safe_band], dtype=float)
+
+
+def classify_chances(user_rank, cutoffs, buffer=1000, mode=CHANCE_MODE_ABSOLUTE,
+                     reach_band=None, safe_band=None):
+    """
+    Chance tier code for every closing rank.
+
+    Args:
+        user_rank (int): Candidate's rank
+        cutoffs (array-like): Closing ranks (NaN or inf where unknown)
+        buffer (int): Safety buffer in ranks
+        mode (str): One of CHANCE_MODES
+        reach_band (float, optional): Overrides the reach band
+        safe_band (float, optional): Overrides the safe band
+
+    Returns:
+        numpy.ndarray: int8 codes indexing CHANCE_TIERS, -1 where unknown
+
+    Examples:
+        >>> classify_chances(5000, [3999, 4000, 5000, 6000, 6001], 1000).tolist()
+        [0, 1, 2, 2, 3]
+        >>> classify_chances(5000, [4999, 5000, 5001], 0).tolist()
+        [0, 2, 3]
+    """
+    cutoffs = np.asarray(cutoffs, dtype=float)
+    reach_edge, rank_edge, safe_edge = chance_edges(user_rank, buffer, mode, reach_band, safe_band)
+    # Reach and Good include their lower edge; Safe starts strictly beyond its edge
+    codes = ((cutoffs >= reach_edge).astype(np.int8) + (cutoffs >= rank_edge)
+             + (cutoffs > safe_edge)).astype(np.int8)
+    codes[~np.isfinite(cutoffs)] = UNKNOWN
+    return codes
+
+
+def chance_categorical(codes, icons=False):
+    """
+    Categorical column for chance codes.
+
+    Args:
+        codes (array-like): Codes from classify_chances
+        icons (bool): Use the emoji labels from CHANCE_ICONS
+
+    Returns:
+        pandas.Categorical: Chance labels, NaN where unknown
+    """
+    categories = [CHANCE_ICONS[tier]
+                  for tier in CHANCE_TIERS] if icons else CHANCE_TIERS
+    return pd.Categorical.from_codes(np.asarray(codes, dtype=np.int8), categories=categories)
+
+
+def chance_counts(codes):
+    """
+    Number of seats in each tier.
+
+    Args:
+        codes (array-like): Codes from classify_chances
+
+    Returns:
+        dict: Tier name -> count
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    counts = np.bincount(codes[codes >= 0], minlength=len(CHANCE_TIERS))
+    return dict(zip(CHANCE_TIERS, counts.tolist()))
@@ -0,0 +1,857 @@
+"""
+Web option list generators for the TS EAMCET College Predictor.
+
+- get_web_options: branch-first list for the Web Options Generator
+- get_hardcoded_best_list / get_rank_based_best_list: the strategic hierarchy
+  of the Best Possible WebOptions Generator
+- get_college_specific_options: every branch of the Top 20 colleges, then all
+  other colleges by cutoff
+
+The rank-dependent generators cache the seats they may list per rank bucket
+(web_option_candidates, best_list_candidates) and apply the exact rank and
+the listing rules on every call, so nearby ranks share one cache entry.
+"""
+import pandas as pd
+
+from .cache import RESULT_QUOTA_BYTES, cached
+from .metrics import timed
+from .querylog import logged_query
+from .constants import (
+    BRANCH_MAP, TOP_COLLEGES, TOP_COLLEGES_CUTTOFF_MALES, TOP_COLLEGES_CUTTOFF_FEMALES,
+    TOP_COLLEGES__MALES, TOP_COLLEGES__FEMALES, get_caste_column_name
+)
+from .optimizer import (
+    ORDERING_STRATEGIC, ORDERING_EXPECTED_UTILITY, DEFAULT_MAX_OPTIONS,
+    weights_from_order, apply_optimized_order
+)
+from .probability import score_seats
+from .chance import CHANCE_MODE_ABSOLUTE, classify_chances
+from .index import get_college_rows, rank_bucket
+from .scenarios import BASELINE_SCENARIO, get_scenario_view, scenario_factor
+from .store import get_phase
+
+COLLEGE_LIST_TYPES = [
+    "Manual Ranking (Our Curated List)",
+    "Cutoff-Based Ranking (Data-Driven)",
+    "Gender-Specific Ranking",
+]
+
+# Define branch priorities and categories
+CSE_BRANCHES = [
+    'CSE', 'INF', 'AIM', 'CSM', 'CSD', 'CSA', 'AID', 'CSI', 'CSO', 'CSC', 'AI',
+    'CSB', 'CSW', 'CIC', 'CSA', 'CSI', 'CSDN', 'CSN', 'CE'
+]
+
+CSE_ALIGNED_BRANCHES = [
+    # Note: 'CDS', 'CST', 'DS', 'IOT', 'CS' are not in BRANCH_MAP — add only if you plan to support them
+]
+
+ECE_BRANCHES = [
+    'ECE'
+]
+
+OTHER_CORE_BRANCHES = [
+    'EEE', 'MEC', 'CIV', 'CHE', 'BIO', 'ANE', 'AUT', 'MIN',
+    'MMT', 'MTM', 'MTR', 'GEO', 'AGR', 'FT', 'PHM', 'TXT', 'BT',  'ECM', 'EEC', 'ETM', 'ECI',
+    'BPL', 'BSE', 'DRY', 'EIE'
+]
+
+
+def get_college_list_by_type(list_type, gender=None):
+    """
+    Get the appropriate college list based on user selection.
+
+    Args:
+        list_type (str): Type of college list to use
+        gender (str): User's gender (for gender-specific lists)
+
+    Returns:
+        list: List of college dictionaries with rankings
+    """
+    if list_type == "Manual Ranking (Our Curated List)" and gender:
+        if gender == "Male":
+            return TOP_COLLEGES__MALES
+        else:
+            return TOP_COLLEGES__FEMALES
+    elif list_type == "Cutoff-Based Ranking (Data-Driven)" and gender:
+        if gender == "Male":
+            return TOP_COLLEGES_CUTTOFF_MALES
+        else:
+            return TOP_COLLEGES_CUTTOFF_FEMALES
+    elif list_type == "Gender-Specific Ranking" and gender:
+        if gender == "Male":
+            return TOP_COLLEGES__MALES
+        else:
+            return TOP_COLLEGES__FEMALES
+    else:
+        return TOP_COLLEGES  # Default fallback
+
+
+def get_branch_preference_weights():
+    """Branch weights for the optimizer following the CSE → ECE → core hierarchy."""
+    weights = weights_from_order(OTHER_CORE_BRANCHES, 0.6, 0.4)
+    weights.update(weights_from_order(ECE_BRANCHES, 0.7, 0.7))
+    weights.update(weights_from_order(CSE_BRANCHES, 1.0, 0.8))
+    return weights
+
+
+def reachable_labels(view, labels, caste_column, user_rank, buffer):
+    """
+    Rows among labels whose buffered cutoff is at or above the user's rank.
+
+    Filters on the single cutoff column so that only matching rows of the
+    wide phase frame are materialized.
+    """
+    if caste_column not in view.df.columns:
+        return labels[:0]
+    cutoffs = view.cutoffs(caste_column)[labels].to_numpy(dtype=float)
+    return labels[cutoffs + buffer >= user_rank]
+
+
+def seat_tuples(view, labels, caste_column, college_col, branch_col):
+    """
+    Listing details of seats with a cutoff in the category column.
+
+    Returns:
+        list: (college, cutoff, tuition fee, district, seat key) per seat, in
+            the order of labels; cutoffs are those of the scenario view
+    """
+    df = view.df
+    labels = labels[df.loc[labels, caste_column].notna().to_numpy()]
+    if labels.empty:
+        return []
+
+    def column(name):
+        return df.loc[labels, name].tolist() if name in df.columns else ['N/A'] * len(labels)
+
+    inst_codes = df.loc[labels, 'Inst Code'].tolist() if 'Inst Code' in df.columns else [None] * len(labels)
+    seat_keys = zip(inst_codes, df.loc[labels, branch_col].tolist())
+    return list(zip(column(college_col), view.cutoffs(caste_column)[labels].tolist(),
+                    column('Tuition Fee'), column('Dist Code'), seat_keys))
+
+
+def branch_seats(seats, branch_code):
+    """Seats whose branch code contains branch_code (case-insensitive), order kept."""
+    code = branch_code.lower()
+    return [seat for seat in seats if isinstance(seat[4][1], str) and code in seat[4][1].lower()]
+
+
+def college_seats(view, college_rows, college_name, caste_column, rank_floor, buffer,
+                  college_col, branch_col):
+    """seat_tuples of one college's rows within reach of rank_floor."""
+    labels = college_rows.get(college_name.lower())
+    if labels is None or labels.empty:
+        return []
+    labels = reachable_labels(view, labels, caste_column, rank_floor, buffer)
+    return seat_tuples(view, labels, caste_column, college_col, branch_col)
+
+
+def reachable(seats, user_rank, buffer):
+    """Seats whose buffered cutoff is at or above the user's rank."""
+    return [seat for seat in seats if user_rank <= seat[1] + buffer]
+
+
+@cached(ttl=1800, max_bytes=RESULT_QUOTA_BYTES)
+def web_option_candidates(rank_floor, gender, caste, preferred_branches, phase, buffer, list_type, scenario):
+    """
+    Seats get_web_options can list for any rank from rank_floor up.
+
+    Cached per rank bucket (see index.rank_bucket); get_web_options applies
+    the exact rank to the candidates.
+
+    Returns:
+        tuple: One (branch code, top college seats, all college seats) per
+            preferred branch, each a list of seat_tuples in listing order,
+            or None if the phase is missing
+    """
+    view = get_scenario_view(phase, scenario)
+    if view is None:
+        return None
+    df = view.df
+    college_rows = get_college_rows(phase)
+
+    # Detect column names
+    college_col = 'Institute Name' if 'Institute Name' in df.columns else 'College Name'
+    if college_col not in df.columns:
+        college_col = 'Place'
+
+    branch_col = 'Branch Code' if 'Branch Code' in df.columns else 'Branch'
+
+    # Get the appropriate caste column
+    caste_column = get_caste_column_name(gender, caste)
+    if caste_column not in df.columns:
+        return tuple((branch_code, [], []) for branch_code in preferred_branches)
+
+    # Get the selected college list
+    selected_colleges = get_college_list_by_type(list_type, gender)
+
+    top_college_seats = [
+        college_seats(view, college_rows, college_info["name"], caste_column, rank_floor, buffer,
+                      college_col, branch_col)
+        for college_info in selected_colleges
+    ]
+
+    all_seats = seat_tuples(view, reachable_labels(view, df.index, caste_column, rank_floor, buffer),
+                            caste_column, college_col, branch_col)
+
+    candidates = []
+    for branch_code in preferred_branches:
+        # Check each top college for this branch
+        top_seats = []
+        for seats in top_college_seats:
+            top_seats += branch_seats(seats, branch_code)
+
+        # Used when no top college has the branch within reach
+        candidates.append((branch_code, top_seats, branch_seats(all_seats, branch_code)))
+    return tuple(candidates)
+
+
+@logged_query
+@timed()
+def get_web_options(user_rank, gender, caste, preferred_branches, phase="Final Phase", buffer=1000, list_type="Manual Ranking (Our Curated List)",
+                    ordering=ORDERING_STRATEGIC, max_options=DEFAULT_MAX_OPTIONS, college_importance=0.5,
+                    scenario=BASELINE_SCENARIO, chance_mode=CHANCE_MODE_ABSOLUTE):
+    """
+    Generate web options based on user's rank and preferred branches.
+
+    Args:
+        user_rank (int): User's TS EAMCET rank
+        gender (str): User's gender (Male/Female)
+        caste (str): User's caste category
+        preferred_branches (list): List of preferred branch codes in order of priority
+        phase (str): Which phase data to use
+        buffer (int): Buffer to add to cutoff ranks for safety
+        list_type (str): Type of Top 20 list to use
+        ordering (str): Ordering stage, one of ORDERING_MODES
+        max_options (int): Maximum number of options kept by the optimizer
+        college_importance (float): Optimizer weight of college over branch (0-1)
+        scenario (str): Rank-inflation scenario applied to the cutoffs
+        chance_mode (str): Absolute or relative chance tiers, one of CHANCE_MODES
+
+    Returns:
+        list: List of dictionaries containing college and branch recommendations
+    """
+    candidates = web_option_candidates(rank_bucket(user_rank), gender, caste, preferred_branches,
+                                       phase, buffer, list_type, scenario)
+    if candidates is None:
+        return []
+    view = get_scenario_view(phase, scenario)
+    caste_column = get_caste_column_name(gender, caste)
+    selected_colleges = get_college_list_by_type(list_type, gender)
+
+    web_options = []
+    seat_keys = []
+
+    def add_option(branch_code, seat):
+        college, cutoff_rank, fee, district, seat_key = seat
+        buffer_rank = cutoff_rank + buffer
+        web_options.append({
+            'Priority': len(web_options) + 1,
+            'College': college,
+            'Branch Code': branch_code,
+            'Branch Name': BRANCH_MAP.get(branch_code, branch_code),
+            'Last Year Cutoff': int(cutoff_rank),
+            'Your Rank': user_rank,
+            'Safety Buffer': buffer,
+            'Buffered Cutoff': int(buffer_rank),
+            'Chance': None,
+            'Tuition Fee': fee,
+            'District': district,
+        })
+        seat_keys.append(seat_key)
+
+    # For each preferred branch (in order of priority)
+    for branch_code, top_seats, all_seats in candidates:
+        top_seats = reachable(top_seats, user_rank, buffer)
+        for seat in top_seats:
+            add_option(branch_code, seat)
+
+        # If branch not found in top colleges, search in all colleges
+        if not top_seats:
+            for seat in reachable(all_seats, user_rank, buffer):
+                add_option(branch_code, seat)
+
+                # Limit results to prevent too many options
+                if len(web_options) >= 50:
+                    break
+
+            if len(web_options) >= 50:
+                break
+
+    # Score every option at once from the closing rank distributions
+    inflation = view.factor(caste_column)
+    probabilities = score_seats(
+        user_rank, caste_column,
+        [key[0] for key in seat_keys], [key[1] for key in seat_keys],
+        [opt['Last Year Cutoff'] / inflation for opt in web_options],
+        inflation=inflation
+    )
+    chances = classify_chances(
+        user_rank, [opt['Last Year Cutoff'] for opt in web_options], buffer, chance_mode)
+    for opt, chance, probability in zip(web_options, chances, probabilities):
+        opt['Chance'] = int(chance)
+        opt['Admission Probability'] = round(float(probability), 3)
+
+    if ordering == ORDERING_EXPECTED_UTILITY:
+        web_options = apply_optimized_order(
+            web_options,
+            college_weights=weights_from_order(
+                [college["name"] for college in selected_colleges]),
+            branch_weights=weights_from_order(preferred_branches),
+            user_rank=user_rank,
+            buffer=buffer,
+            max_options=max_options,
+            college_importance=college_importance,
+            probabilities=probabilities
+        )
+
+    return web_options
+
+
+@timed()
+@cached(ttl=1800)
+def get_hardcoded_best_list(list_type="Manual Ranking (Our Curated List)", gender="Male"):
+    """
+    Generate Type 1: Hardcoded Best List - Pre-generated optimal order
+    This shows the ideal strategy without considering specific rank.
+    """
+    selected_colleges = get_college_list_by_type(list_type, gender)
+    hardcoded_options = []
+    priority = 1
+
+    # Top 1-5 Colleges: CSE/CSE-aligned → ECE
+    # st.write("🥇 **Top 1-5 Colleges Priority Order:**")
+    for i in range(min(5, len(selected_colleges))):
+        college = selected_colleges[i]
+
+        # CSE branches first
+        for branch in CSE_BRANCHES:  # Top CSE branches
+            hardcoded_options.append({
+                'Priority': priority,
+                'College_Tier': f"Top {i+1}",
+                'College': college["name"],
+                'Branch_Code': branch,
+                'Branch_Name': BRANCH_MAP.get(branch, branch),
+                'Strategy': 'Prime CSE in Top 5',
+                'Note': 'Highest Priority - Best College + Best Branch'
+            })
+            priority += 1
+
+    for i in range(min(5, len(selected_colleges))):
+        college = selected_colleges[i]
+        # ECE branches
+        for branch in ECE_BRANCHES[:1]:  # Only ECE
+            hardcoded_options.append({
+                'Priority': priority,
+                'College_Tier': f"Top {i+1}",
+                'College': college["name"],
+                'Branch_Code': branch,
+                'Branch_Name': BRANCH_MAP.get(branch, branch),
+                'Strategy': 'ECE in Top 5',
+                'Note': 'High Priority - Top College + Core Branch'
+            })
+            priority += 1
+
+    # Top 6-10 Colleges: CSE/CSE-aligned → ECE
+    # st.write("🥈 **Top 6-10 Colleges Priority Order:**")
+    for i in range(5, min(10, len(selected_colleges))):
+        college = selected_colleges[i]
+
+        # CSE branches
+        for branch in CSE_BRANCHES:
+            hardcoded_options.append({
+                'Priority': priority,
+                'College_Tier': f"Top {i+1}",
+                'College': college["name"],
+                'Branch_Code': branch,
+                'Branch_Name': BRANCH_MAP.get(branch, branch),
+                'Strategy': 'CSE in Top 6-10',
+                'Note': 'Very Good - Excellent College + Premium Branch'
+            })
+            priority += 1
+
+    for i in range(5, min(10, len(selected_colleges))):
+        college = selected_colleges[i]
+        # ECE
+        hardcoded_options.append({
+            'Priority': priority,
+            'College_Tier': f"Top {i+1}",
+            'College': college["name"],
+            'Branch_Code': 'ECE',
+            'Branch_Name': BRANCH_MAP.get('ECE', 'ECE'),
+            'Strategy': 'ECE in Top 6-10',
+            'Note': 'Good - Strong College + Core Branch'
+        })
+        priority += 1
+
+    # Top 11-15 Colleges: CSE/CSE-aligned → ECE
+    # st.write("🥉 **Top 11-15 Colleges Priority Order:**")
+    for i in range(10, min(20, len(selected_colleges))):
+        college = selected_colleges[i]
+
+        # Top CSE branches only
+        for branch in CSE_BRANCHES:
+            hardcoded_options.append({
+                'Priority': priority,
+                'College_Tier': f"Top {i+1}",
+                'College': college["name"],
+                'Branch_Code': branch,
+                'Branch_Name': BRANCH_MAP.get(branch, branch),
+                'Strategy': 'CSE in Top 11-15',
+                'Note': 'Good - Decent College + Premium Branch'
+            })
+            priority += 1
+
+    for i in range(10, min(20, len(selected_colleges))):
+        college = selected_colleges[i]
+        # ECE
+        hardcoded_options.append({
+            'Priority': priority,
+            'College_Tier': f"Top {i+1}",
+            'College': college["name"],
+            'Branch_Code': 'ECE',
+            'Branch_Name': BRANCH_MAP.get('ECE', 'ECE'),
+            'Strategy': 'ECE in Top 11-15',
+            'Note': 'Decent - Average College + Core Branch'
+        })
+        priority += 1
+
+    # Top 1-10 Colleges: Other Core Branches (backup strategy)
+    # st.write("⚙️ **Top 1-10 Colleges - Other Core Branches (Backup):**")
+    for i in range(min(10, len(selected_colleges))):
+        college = selected_colleges[i]
+
+        for branch in OTHER_CORE_BRANCHES:
+            hardcoded_options.append({
+                'Priority': priority,
+                'College_Tier': f"Top {i+1}",
+                'College': college["name"],
+                'Branch_Code': branch,
+                'Branch_Name': BRANCH_MAP.get(branch, branch),
+                'Strategy': 'Core Branches in Top 10',
+                'Note': 'Backup - Excellent College + Traditional Branch'
+            })
+            priority += 1
+
+    for i in range(10, min(20, len(selected_colleges))):
+        college = selected_colleges[i]
+
+        for branch in OTHER_CORE_BRANCHES:
+            hardcoded_options.append({
+                'Priority': priority,
+                'College_Tier': f"Top {i+1}",
+                'College': college["name"],
+                'Branch_Code': branch,
+                'Branch_Name': BRANCH_MAP.get(branch, branch),
+                'Strategy': 'Core Branches in Top 16-20',
+                'Note': 'Lower Tier College + Traditional Branch'
+            })
+        priority += 1
+
+    return hardcoded_options
+
+
+@cached(ttl=1800, max_bytes=RESULT_QUOTA_BYTES)
+def best_list_candidates(rank_floor, gender, caste, phase, buffer, list_type, scenario):
+    """
+    Top 20 college seats get_rank_based_best_list can pick for any rank from rank_floor up.
+
+    Cached per rank bucket (see index.rank_bucket); get_rank_based_best_list
+    takes the first seat within the exact rank's reach from each step.
+
+    Returns:
+        tuple: One (tier, strategy, branch code, seats) per college and branch
+            checked, in the order of the strategic hierarchy, with seats as
+            seat_tuples in file order; None if the phase is missing
+    """
+    view = get_scenario_view(phase, scenario)
+    if view is None:
+        return None
+    df = view.df
+    college_rows = get_college_rows(phase)
+
+    # Detect column names
+    college_col = 'Institute Name' if 'Institute Name' in df.columns else 'College Name'
+    if college_col not in df.columns:
+        college_col = 'Place'
+
+    branch_col = 'Branch Code' if 'Branch Code' in df.columns else 'Branch'
+    caste_column = get_caste_column_name(gender, caste)
+    if caste_column not in df.columns:
+        return ()
+
+    selected_colleges = get_college_list_by_type(list_type, gender)
+    steps = []
+
+    seats_by_college = {}
+
+    def check_branches(college_name, branches_to_check, tier_name, strategy_name):
+        # Find college in dataset
+        if college_name not in seats_by_college:
+            seats_by_college[college_name] = college_seats(
+                view, college_rows, college_name, caste_column, rank_floor, buffer,
+                college_col, branch_col)
+
+        for branch_code in branches_to_check:
+            seats = branch_seats(seats_by_college[college_name], branch_code)
+            if seats:
+                steps.append((tier_name, strategy_name, branch_code, seats))
+
+    # Top 1-5 Colleges: CSE/CSE-aligned → ECE
+    for i in range(min(5, len(selected_colleges))):
+        college_name = selected_colleges[i]["name"]
+        tier = f"Top {i+1}"
+
+        # Check CSE branches first
+        check_branches(college_name, CSE_BRANCHES, tier, "Prime CSE in Top 5")
+        # Then CSE-aligned
+        check_branches(college_name, CSE_ALIGNED_BRANCHES, tier, "CSE-Aligned in Top 5")
+
+    for i in range(min(5, len(selected_colleges))):
+        # Then ECE
+        check_branches(selected_colleges[i]["name"], ECE_BRANCHES, f"Top {i+1}", "ECE in Top 5")
+
+    # Top 6-10 Colleges: CSE/CSE-aligned → ECE
+    for i in range(5, min(10, len(selected_colleges))):
+        college_name = selected_colleges[i]["name"]
+        tier = f"Top {i+1}"
+
+        check_branches(college_name, CSE_BRANCHES, tier, "CSE in Top 6-10")
+        check_branches(college_name, CSE_ALIGNED_BRANCHES, tier, "CSE-Aligned in Top 6-10")
+
+    for i in range(5, min(10, len(selected_colleges))):
+        check_branches(selected_colleges[i]["name"], ECE_BRANCHES, f"Top {i+1}", "ECE in Top 6-10")
+
+    # Top 11-20 Colleges: CSE/CSE-aligned → ECE
+    for i in range(10, min(20, len(selected_colleges))):
+        college_name = selected_colleges[i]["name"]
+        tier = f"Top {i+1}"
+
+        check_branches(college_name, CSE_BRANCHES, tier, "CSE in Top 11-15")
+        check_branches(college_name, CSE_ALIGNED_BRANCHES, tier, "CSE-Aligned in Top 11-20")
+
+    for i in range(10, min(20, len(selected_colleges))):
+        check_branches(selected_colleges[i]["name"], ECE_BRANCHES, f"Top {i+1}", "ECE in Top 11-20")
+
+    # Top 1-10 Colleges: Other Core Branches (backup)
+    for i in range(min(10, len(selected_colleges))):
+        check_branches(selected_colleges[i]["name"], OTHER_CORE_BRANCHES,
+                       f"Top {i+1} (Backup)", "Core Branches in Top 1-10")
+
+    # Top 15-20 Colleges: Other Core Branches (backup)
+    for i in range(10, min(20, len(selected_colleges))):
+        check_branches(selected_colleges[i]["name"], OTHER_CORE_BRANCHES,
+                       f"Top {i+1} (Backup)", "Core Branches Backup")
+
+    return tuple(steps)
+
+
+@cached(ttl=1800)
+def beyond_top20_seats(gender, caste, phase, list_type, scenario):
+    """
+    Every seat outside the Top 20 colleges, by ascending cutoff.
+
+    These are listed whatever the rank, so one entry serves all ranks.
+
+    Returns:
+        list: (branch code, seat_tuple) per seat with a cutoff
+    """
+    view = get_scenario_view(phase, scenario)
+    if view is None:
+        return []
+    df = view.df
+
+    # Detect column names
+    college_col = 'Institute Name' if 'Institute Name' in df.columns else 'College Name'
+    if college_col not in df.columns:
+        college_col = 'Place'
+
+    branch_col = 'Branch Code' if 'Branch Code' in df.columns else 'Branch'
+    caste_column = get_caste_column_name(gender, caste)
+    if caste_column not in df.columns:
+        return []
+
+    selected_colleges = get_college_list_by_type(list_type, gender)
+    beyond_top20_colleges = df[~df[college_col].str.lower().isin(
+        [college["name"].lower() for college in selected_colleges]
+    )]
+
+    # Sort by cutoff rank ascending
+    beyond_top20_colleges = beyond_top20_colleges.sort_values(by=caste_column, ascending=True)
+    seats = seat_tuples(view, beyond_top20_colleges.index, caste_column, college_col, branch_col)
+    return [(seat[4][1] if pd.notna(seat[4][1]) else 'Unknown', seat) for seat in seats]
+
+
+@logged_query
+@timed()
+def get_rank_based_best_list(user_rank, gender, caste, phase="Final Phase", buffer=1000, list_type="Manual Ranking (Our Curated List)",
+                             ordering=ORDERING_STRATEGIC, max_options=DEFAULT_MAX_OPTIONS, college_importance=0.5,
+                             scenario=BASELINE_SCENARIO, chance_mode=CHANCE_MODE_ABSOLUTE):
+    """
+    Generate Type 2: Rank-based Best List - Adapts based on candidate's rank
+    With the Expected Utility ordering the strategic list is re-ordered and
+    truncated to max_options by the optimizer. The scenario scales the
+    cutoffs before any option is picked, and chance_mode selects absolute or
+    relative chance tiers around the buffer.
+    """
+    steps = best_list_candidates(rank_bucket(user_rank), gender, caste, phase, buffer,
+                                 list_type, scenario)
+    if steps is None:
+        return []
+    view = get_scenario_view(phase, scenario)
+    caste_column = get_caste_column_name(gender, caste)
+    selected_colleges = get_college_list_by_type(list_type, gender)
+    rank_based_options = []
+    seat_keys = []
+
+    def add_option(tier_name, strategy_name, branch_code, seat):
+        college, cutoff_rank, fee, district, seat_key = seat
+        rank_based_options.append({
+            'Priority': len(rank_based_options) + 1,
+            'College_Tier': tier_name,
+            'College': college,
+            'Branch_Code': branch_code,
+            'Branch_Name': BRANCH_MAP.get(branch_code, branch_code),
+            'Last_Year_Cutoff': int(cutoff_rank),
+            'Your_Rank': user_rank,
+            'Buffered_Cutoff': int(cutoff_rank + buffer),
+            'Chance': None,
+            'Strategy': strategy_name,
+            'Tuition_Fee': fee,
+            'District': district,
+        })
+        seat_keys.append(seat_key)
+
+    # Top 20 colleges: the first seat within reach for each college and branch
+    for tier_name, strategy_name, branch_code, seats in steps:
+        for seat in seats:
+            if user_rank <= seat[1] + buffer:
+                add_option(tier_name, strategy_name, branch_code, seat)
+                break  # Take first match for this branch
+
+    # Beyond Top 20: All colleges sorted by ascending cutoff
+    for branch_code, seat in beyond_top20_seats(gender, caste, phase, list_type, scenario):
+        add_option('Beyond Top 20', 'Ascending Cutoff Order', branch_code, seat)
+
+    # Score every option at once from the closing rank distributions
+    inflation = view.factor(caste_column)
+    probabilities = score_seats(
+        user_rank, caste_column,
+        [key[0] for key in seat_keys], [key[1] for key in seat_keys],
+        [opt['Last_Year_Cutoff'] / inflation for opt in rank_based_options],
+        inflation=inflation
+    )
+    chances = classify_chances(
+        user_rank, [opt['Last_Year_Cutoff'] for opt in rank_based_options], buffer, chance_mode)
+    for opt, chance, probability in zip(rank_based_options, chances, probabilities):
+        opt['Chance'] = int(chance)
+        opt['Admission Probability'] = round(float(probability), 3)
+
+    if ordering == ORDERING_EXPECTED_UTILITY:
+        rank_based_options = apply_optimized_order(
+            rank_based_options,
+            college_weights=weights_from_order(
+                [college["name"] for college in selected_colleges]),
+            branch_weights=get_branch_preference_weights(),
+            user_rank=user_rank,
+            buffer=buffer,
+            max_options=max_options,
+            college_importance=college_importance,
+            branch_key='Branch_Code',
+            cutoff_key='Last_Year_Cutoff',
+            probabilities=probabilities
+        )
+
+    return rank_based_options
+
+
+@logged_query
+@timed()
+@cached(ttl=1800)
+def get_college_specific_options(gender, caste, phase="Final Phase", list_type="Manual Ranking (Our Curated List)",
+                                 scenario=BASELINE_SCENARIO):
+    """
+    Get all branches available in Top 20 colleges for the specified category and gender.
+
+    Args:
+        gender (str): User's gender (Male/Female)
+        caste (str): User's caste category
+        phase (str): Which phase data to use
+        list_type (str): Type of Top 20 list to use
+        scenario (str): Rank-inflation scenario applied to the cutoffs
+
+    Returns:
+        tuple: (list of top 20 options, list of remaining options)
+    """
+    view = get_scenario_view(phase, scenario)
+    if view is None:
+        return [], []
+    df = view.df
+    college_rows = get_college_rows(phase)
+
+    # Detect column names
+    college_col = 'Institute Name' if 'Institute Name' in df.columns else 'College Name'
+    if college_col not in df.columns:
+        college_col = 'Place'
+
+    branch_col = 'Branch Code' if 'Branch Code' in df.columns else 'Branch'
+
+    # Get the appropriate caste column
+    caste_column = get_caste_column_name(gender, caste)
+
+    # Get the selected college list
+    selected_colleges = get_college_list_by_type(list_type, gender)
+
+    top_20_options = []
+    remaining_options = []
+    processed_college_names = set()
+
+    # Process Top 20 colleges first
+    for i, college_info in enumerate(selected_colleges, 1):
+        # print(f"Processing Top College {i}: {college_info['name']}")
+        college_name = college_info["name"]
+        processed_college_names.add(college_name.lower())
+
+        # print(
+        # f" Searching for college {college_name.lower().split()[0]} in dataset")
+
+        # Find matching rows in dataset
+        # college_matches = df[df[college_col].str.contains(
+        #     college_name.split()[0], case=False, na=False)]
+        college_matches = df.loc[college_rows.get(college_name.lower(), [])]
+
+        if not college_matches.empty:
+            # Get all branches for this college
+            for idx, row in college_matches.iterrows():
+                branch_code = row[branch_col] if branch_col in row else 'N/A'
+
+                # Get cutoff for the specified category
+                cutoff_rank = None
+                if caste_column in row and pd.notna(row[caste_column]):
+                    cutoff_rank = int(view.cutoffs(caste_column)[idx])
+
+                top_20_options.append({
+                    'College Rank': i,
+                    'College': row[college_col],
+                    'Inst Code': row.get('Inst Code', 'N/A'),
+                    'Branch Code': branch_code,
+                    'Branch Name': BRANCH_MAP.get(branch_code, branch_code),
+                    'Closing Rank': cutoff_rank if cutoff_rank else float('inf'),
+                    'Tuition Fee': row.get('Tuition Fee', 'N/A'),
+                    'District': row.get('Dist Code', 'N/A'),
+                    'Category': f"{caste} {gender}",
+                    'List Type': 'Top 20'
+                })
+
+    # Process remaining colleges (not in Top 20) - ordered by cutoff rank
+    remaining_colleges_data = []
+
+    for idx, row in df.iterrows():
+        college_name = row[college_col]
+        # Skip if already processed in Top 20
+        if any(processed_name in college_name.lower() for processed_name in processed_college_names):
+            continue
+
+        branch_code = row[branch_col] if branch_col in row else 'N/A'
+
+        # Get cutoff for the specified category
+        cutoff_rank = None
+        if caste_column in row and pd.notna(row[caste_column]):
+            cutoff_rank = int(view.cutoffs(caste_column)[idx])
+
+        remaining_colleges_data.append({
+            'College Rank': 999,  # Will be updated after sorting
+            'College': college_name,
+            'Inst Code': row.get('Inst Code', 'N/A'),
+            'Branch Code': branch_code,
+            'Branch Name': BRANCH_MAP.get(branch_code, branch_code),
+            'Closing Rank': cutoff_rank if cutoff_rank else float('inf'),
+            'Tuition Fee': row.get('Tuition Fee', 'N/A'),
+            'District': row.get('Dist Code', 'N/A'),
+            'Category': f"{caste} {gender}",
+            'List Type': 'Other Colleges'
+        })
+
+    # Sort remaining colleges by cutoff rank (ascending - better ranks first)
+    remaining_colleges_data.sort(key=lambda x: x['Closing Rank'] if isinstance(
+        x['Closing Rank'], int) else float('inf'))
+
+    # Update college ranks for remaining colleges
+    for i, college_data in enumerate(remaining_colleges_data, 21):
+        college_data['College Rank'] = i
+        remaining_options.append(college_data)
+
+    # Sort Top 20 options by college rank first, then by cutoff
+    top_20_options.sort(key=lambda x: (x['College Rank'], x['Closing Rank'] if isinstance(
+        x['Closing Rank'], int) else float('inf')))
+
+    return top_20_options, remaining_options
+
+
+@timed()
+def add_admission_chances(options, user_rank, gender, caste, scenario=BASELINE_SCENARIO,
+                          buffer=2000, chance_mode=CHANCE_MODE_ABSOLUTE):
+    """
+    Attach admission probability and chance tier to every option.
+
+    All options are scored and classified in one vectorized call; options
+    without a closing rank get no probability and the unknown chance code.
+
+    Args:
+        options (list): Options from get_college_specific_options
+        user_rank (int): Candidate's rank
+        gender (str): Gender of the candidate
+        caste (str): Caste category
+        scenario (str): Rank-inflation scenario the closing ranks were scaled with
+        buffer (int): Safety buffer driving the chance tiers
+        chance_mode (str): Absolute or relative chance tiers, one of CHANCE_MODES
+
+    Returns:
+        list: Copies of the options with 'Admission Probability' and the
+            'Admission Chance' code (see engine.chance)
+    """
+    if not options:
+        return []
+
+    caste_column = get_caste_column_name(gender, caste)
+    inflation = scenario_factor(scenario, caste_column)
+    cutoffs = [opt['Closing Rank'] for opt in options]
+    probabilities = score_seats(
+        user_rank, caste_column,
+        [opt['Inst Code'] for opt in options],
+        [opt['Branch Code'] for opt in options],
+        [cutoff / inflation for cutoff in cutoffs],
+        inflation=inflation
+    )
+    chances = classify_chances(user_rank, cutoffs, buffer, chance_mode)
+
+    return [
+        {**opt,
+         'Admission Probability': round(float(probability), 3) if chance >= 0 else None,
+         'Admission Chance': int(chance)}
+        for opt, probability, chance in zip(options, probabilities, chances)
+    ]
+
+
+def get_branch_statistics(branch_code, phase="Final Phase"):
+    """Get statistics for a specific branch across all colleges."""
+    df = get_phase(phase)
+    if df is None:
+        return None
+
+    branch_col = 'Branch Code' if 'Branch Code' in df.columns else 'Branch'
+    branch_data = df[df[branch_col].str.contains(
+        branch_code, case=False, na=False)]
+
+    if branch_data.empty:
+        return None
+
+    # Calculate statistics for different categories
+    stats = {
+        'total_colleges': len(branch_data),
+        'avg_cutoff_oc_boys': branch_data['OC BOYS'].mean() if 'OC BOYS' in branch_data.columns else None,
+        'min_cutoff_oc_boys': branch_data['OC BOYS'].min() if 'OC BOYS' in branch_data.columns else None,
+        'max_cutoff_oc_boys': branch_data['OC BOYS'].max() if 'OC BOYS' in branch_data.columns else None,
+    }
+
+    return stats
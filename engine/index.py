@@ -0,0 +1,86 @@
+"""
+Sorted indexes over the category columns of the cutoff data.
+
+An index lists the seats of one category column in ascending closing-rank
+order, so "seats with a cutoff at or above r" is a suffix found with one
+searchsorted.
+
+Rank-dependent results are cached per rank bucket rather than per rank. A
+bucket's entry is built for its lowest rank, which can reach every seat any
+rank in the bucket can, and the exact rank is applied when the entry is used.
+"""
+import numpy as np
+
+from .cache import cached
+from .store import get_phase
+
+# Ranks sharing their leading RANK_BUCKET_DIGITS digits share a cache entry
+RANK_BUCKET_DIGITS = 2
+
+
+def rank_bucket(rank, digits=RANK_BUCKET_DIGITS):
+    """
+    Lowest rank of rank's bucket: rank rounded down to its leading digits.
+
+    Buckets grow with the rank (1,200-1,299, 23,000-23,999, 150,000-159,999),
+    so an entry holds at most about 10% more seats than the exact rank needs.
+
+    Args:
+        rank (int): User's rank
+        digits (int): Significant digits kept
+
+    Returns:
+        int: Bucket floor (at most rank)
+    """
+    rank = int(rank)
+    if rank < 10 ** digits:
+        return rank
+    step = 10 ** (len(str(rank)) - digits)
+    return rank - rank % step
+
+
+def build_cutoff_index(cutoffs):
+    """
+    Sorted index over one category column.
+
+    Args:
+        cutoffs (array-like): Closing ranks (NaN where the seat has no cutoff)
+
+    Returns:
+        tuple: (order, sorted_cutoffs) - row positions in ascending cutoff
+            order and the matching cutoffs, seats without a cutoff dropped
+    """
+    values = np.asarray(cutoffs, dtype=float)
+    order = np.argsort(values, kind='stable')
+    order = order[~np.isnan(values[order])]
+    return order, values[order]
+
+
+@cached(ttl=3600, shared=False)
+def get_cutoff_index(phase, column):
+    """Cached sorted index of a category column for a phase."""
+    df = get_phase(phase)
+    if df is None or column not in df.columns:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    return build_cutoff_index(df[column])
+
+
+@cached(ttl=3600, shared=False)
+def get_college_rows(phase):
+    """
+    Cached lookup of a phase's rows by lower-cased college name.
+
+    Args:
+        phase (str): The counseling phase
+
+    Returns:
+        dict: Lower-cased college name -> index labels of its rows, in file order
+    """
+    df = get_phase(phase)
+    if df is None:
+        return {}
+    college_col = 'Institute Name' if 'Institute Name' in df.columns else 'College Name'
+    if college_col not in df.columns:
+        college_col = 'Place'
+    names = df[college_col].str.lower()
+    return {name: df.index[positions] for name, positions in names.groupby(names, sort=False).indices.items()}
@@ -0,0 +1,294 @@
+"""
+Lightweight process metrics: latency histograms and resource gauges.
+
+Entry points are wrapped with ``@timed()`` (or time a block with
+``with timer(name):``). Each name gets a histogram with fixed buckets, which
+gives p50/p95/p99 estimates without keeping individual samples. A background
+ResourceSampler thread records the process CPU share and resident memory,
+so callers never block on psutil.
+
+render_prometheus() formats everything, including the cache statistics of
+engine.cache, in the Prometheus text exposition format. serve_metrics()
+publishes it on a local HTTP port, and the API exposes it at /metrics.
+"""
+import bisect
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .cache import cache_stats
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency buckets; a final +Inf bucket is implicit
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.95, 0.99)
+SAMPLE_INTERVAL = 5.0
+METRIC_PREFIX = "eamcet"
+
+# Cache statistic -> (metric suffix, type, help text)
+CACHE_METRICS = {
+    'Hits': ('cache_hits_total', 'counter', "Cache lookups answered from the cache."),
+    'Misses': ('cache_misses_total', 'counter', "Cache lookups that ran the function."),
+    'Evictions': ('cache_evictions_total', 'counter', "Entries dropped to stay under the entry, byte or quota limits."),
+    'Expirations': ('cache_expirations_total', 'counter', "Entries dropped after their TTL."),
+    'Rejections': ('cache_rejections_total', 'counter', "Results too large for the budget or quota."),
+    'Entries': ('cache_entries', 'gauge', "Live cache entries."),
+    'Bytes': ('cache_bytes', 'gauge', "Approximate size of the live cache entries."),
+}
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (not thread-safe on its own)."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q):
+        """
+        Estimated q-quantile, interpolated within its bucket.
+
+        Values in the +Inf bucket are reported as the largest finite bound.
+
+        Returns:
+            float: Seconds, or NaN without observations
+        """
+        if not self.count:
+            return float('nan')
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= target:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (target - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """Thread-safe collection of named latency histograms."""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds):
+        """Record one call of name that took seconds."""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def snapshot(self):
+        """
+        Copy of every histogram.
+
+        Returns:
+            dict: Name -> Histogram (copies, safe to read without the lock)
+        """
+        with self._lock:
+            copies = {}
+            for name, histogram in self._histograms.items():
+                copy = Histogram(histogram.buckets)
+                copy.counts = list(histogram.counts)
+                copy.count, copy.total = histogram.count, histogram.total
+                copies[name] = copy
+            return copies
+
+    def summary(self):
+        """
+        One row per name with the call count, mean and p50/p95/p99 in ms.
+
+        Returns:
+            list: Dicts sorted by total time spent, largest first
+        """
+        rows = []
+        for name, histogram in self.snapshot().items():
+            row = {'Function': name, 'Calls': histogram.count,
+                   'Mean (ms)': 1000 * histogram.total / histogram.count}
+            for q in QUANTILES:
+                row[f"p{round(q * 100)} (ms)"] = 1000 * histogram.quantile(q)
+            row['Total (s)'] = histogram.total
+            rows.append(row)
+        return sorted(rows, key=lambda r: r['Total (s)'], reverse=True)
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+registry = MetricsRegistry()
+
+
+def timed(name=None):
+    """
+    Record a function's latency in the registry.
+
+    Args:
+        name (str, optional): Histogram name (defaults to module.qualname)
+
+    Returns:
+        Decorator
+    """
+    def decorator(func):
+        metric = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                registry.observe(metric, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def timer(name):
+    """Record the latency of a with-block under name."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.observe(name, time.perf_counter() - start)
+
+
+class ResourceSampler(threading.Thread):
+    """Daemon thread sampling the process CPU share and resident memory."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        super().__init__(name="resource-sampler", daemon=True)
+        self.interval = interval
+        self.cpu_percent = 0.0
+        self.rss_bytes = 0
+        self.sampled_at = None
+        self._stop_event = threading.Event()
+
+    def sample(self):
+        import psutil
+
+        process = psutil.Process()
+        # interval=None measures since the previous call, so this never sleeps
+        self.cpu_percent = process.cpu_percent(interval=None)
+        self.rss_bytes = process.memory_info().rss
+        self.sampled_at = time.time()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning(f"Resource sampling failed: {e}")
+                return
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler(interval=SAMPLE_INTERVAL):
+    """The process-wide ResourceSampler, started on first use."""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = ResourceSampler(interval)
+            _sampler.start()
+        return _sampler
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus():
+    """
+    All metrics in the Prometheus text exposition format.
+
+    Returns:
+        str: Latency histograms, cache statistics and process CPU and memory gauges
+    """
+    name = f"{METRIC_PREFIX}_function_seconds"
+    lines = [f"# HELP {name} Latency of engine and page entry points.",
+             f"# TYPE {name} histogram"]
+    for function, histogram in sorted(registry.snapshot().items()):
+        label = f'function="{_label(function)}"'
+        cumulative = 0
+        for bound, n in zip(histogram.buckets + (float('inf'),), histogram.counts):
+            cumulative += n
+            le = "+Inf" if bound == float('inf') else repr(bound)
+            lines.append(f'{name}_bucket{{{label},le="{le}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{label}}} {histogram.total!r}")
+        lines.append(f"{name}_count{{{label}}} {histogram.count}")
+
+    caches = cache_stats()
+    for column, (suffix, kind, description) in CACHE_METRICS.items():
+        metric = f"{METRIC_PREFIX}_{suffix}"
+        lines += [f"# HELP {metric} {description}", f"# TYPE {metric} {kind}"]
+        lines += [f'{metric}{{cache="{_label(row["Cache"])}"}} {row[column]}' for row in caches]
+
+    sampler = get_sampler()
+    lines += [f"# HELP {METRIC_PREFIX}_process_cpu_percent Process CPU use, sampled in the background.",
+              f"# TYPE {METRIC_PREFIX}_process_cpu_percent gauge",
+              f"{METRIC_PREFIX}_process_cpu_percent {sampler.cpu_percent!r}",
+              f"# HELP {METRIC_PREFIX}_process_resident_memory_bytes Resident set size.",
+              f"# TYPE {METRIC_PREFIX}_process_resident_memory_bytes gauge",
+              f"{METRIC_PREFIX}_process_resident_memory_bytes {sampler.rss_bytes}"]
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0].rstrip('/') not in ('', '/metrics'):
+            self.send_error(404)
+            return
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port, host="127.0.0.1"):
+    """
+    Serve render_prometheus() at http://host:port/metrics from a daemon thread.
+
+    Args:
+        port (int): TCP port (0 picks a free one)
+        host (str): Interface to bind (local only by default)
+
+    Returns:
+        ThreadingHTTPServer: The running server, or None if the port is taken
+    """
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logger.warning(f"Metrics endpoint not started on {host}:{port}: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
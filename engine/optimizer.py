@@ -0,0 +1,195 @@
+"""
+Expected-utility optimizer for web option ordering.
+
+Counselling allots a candidate the first option in their list whose closing
+rank they beat, so a list ordered by decreasing utility has expected utility
+
+    EU = sum_i p_i * u_i * prod_{j listed before i} (1 - p_j)
+
+Choosing which seats to list under a maximum option count is solved exactly
+by a dynamic program over the seats sorted by ascending utility: placing a
+new, better seat in front of the best k-1 option list built so far gives
+p * u + (1 - p) * best[k - 1].
+"""
+import numpy as np
+
+ORDERING_STRATEGIC = "Strategic Order (Default)"
+ORDERING_EXPECTED_UTILITY = "Expected Utility Optimizer"
+ORDERING_MODES = [ORDERING_STRATEGIC, ORDERING_EXPECTED_UTILITY]
+
+DEFAULT_MAX_OPTIONS = 100
+
+
+def weights_from_order(names, top_weight=1.0, bottom_weight=0.5):
+    """
+    Turn a preference order into linearly decreasing weights.
+
+    Args:
+        names (list): Names in order of preference (most preferred first)
+        top_weight (float): Weight of the first name
+        bottom_weight (float): Weight of the last name
+
+    Returns:
+        dict: Mapping of upper-cased name to weight
+    """
+    names = list(names)
+    if not names:
+        return {}
+    steps = np.linspace(top_weight, bottom_weight, num=len(names))
+    weights = {}
+    for name, weight in zip(names, steps):
+        weights.setdefault(str(name).strip().upper(), float(weight))
+    return weights
+
+
+def seat_utilities(colleges, branches, college_weights, branch_weights,
+                   college_importance=0.5, default_college_weight=0.3,
+                   default_branch_weight=0.3):
+    """
+    Combine college and branch preference weights into one utility per seat.
+
+    The utility is the weighted geometric mean
+    ``college_weight ** a * branch_weight ** (1 - a)`` so a weight of zero on
+    either side removes the seat from consideration.
+
+    Args:
+        colleges (array-like): College name of each seat
+        branches (array-like): Branch code of each seat
+        college_weights (dict): College name -> weight
+        branch_weights (dict): Branch code -> weight
+        college_importance (float): ``a`` above, 1.0 means only the college matters
+        default_college_weight (float): Weight of colleges missing from college_weights
+        default_branch_weight (float): Weight of branches missing from branch_weights
+
+    Returns:
+        numpy.ndarray: Utility of each seat
+    """
+    college_weights = {str(k).strip().upper(): v for k,
+                       v in (college_weights or {}).items()}
+    branch_weights = {str(k).strip().upper(): v for k,
+                      v in (branch_weights or {}).items()}
+
+    college_w = np.array([college_weights.get(str(c).strip().upper(), default_college_weight)
+                          for c in colleges], dtype=float)
+    branch_w = np.array([branch_weights.get(str(b).strip().upper(), default_branch_weight)
+                         for b in branches], dtype=float)
+
+    a = min(max(float(college_importance), 0.0), 1.0)
+    return np.power(np.clip(college_w, 0, None), a) * np.power(np.clip(branch_w, 0, None), 1 - a)
+
+
+def rank_admission_probability(user_rank, cutoff_ranks, buffer=1000):
+    """
+    Smooth admission probability from last year's closing ranks.
+
+    A logistic curve centred on the closing rank whose width follows the
+    safety buffer, so a rank exactly at the cutoff scores 0.5.
+
+    Args:
+        user_rank (int): Candidate's rank
+        cutoff_ranks (array-like): Closing rank of each seat (NaN if unknown)
+        buffer (int): Safety buffer selected by the user
+
+    Returns:
+        numpy.ndarray: Probability of admission for each seat
+    """
+    cutoffs = np.asarray(cutoff_ranks, dtype=float)
+    scale = np.maximum(np.maximum(buffer / 2.0, 0.05 * cutoffs), 1.0)
+    z = np.clip((user_rank - cutoffs) / scale, -50, 50)
+    probabilities = 1.0 / (1.0 + np.exp(z))
+    return np.where(np.isnan(cutoffs), 0.0, probabilities)
+
+
+def optimize_option_order(utilities, probabilities, max_options=DEFAULT_MAX_OPTIONS):
+    """
+    Choose and order the options that maximize expected utility.
+
+    Args:
+        utilities (array-like): Utility of each candidate seat
+        probabilities (array-like): Admission probability of each seat
+        max_options (int): Maximum number of options that may be listed
+
+    Returns:
+        tuple: (indices of the chosen seats in list order, expected utility)
+    """
+    utilities = np.asarray(utilities, dtype=float)
+    probabilities = np.clip(np.asarray(probabilities, dtype=float), 0.0, 1.0)
+    n = len(utilities)
+    max_options = int(min(max_options, n))
+    if n == 0 or max_options <= 0:
+        return np.array([], dtype=int), 0.0
+
+    # Ascending utility; among equal utilities the likelier seat goes last so
+    # that it ends up in front of the list.
+    order = np.lexsort((probabilities, utilities))
+    gains = (probabilities * utilities)[order]
+    misses = (1.0 - probabilities)[order]
+
+    best = np.zeros(max_options + 1)
+    taken = np.zeros((n, max_options), dtype=bool)
+    for i in range(n):
+        candidate = gains[i] + misses[i] * best[:-1]
+        improves = candidate > best[1:]
+        taken[i] = improves
+        best[1:] = np.where(improves, candidate, best[1:])
+
+    chosen = []
+    k = max_options
+    for i in range(n - 1, -1, -1):
+        if k == 0:
+            break
+        if taken[i, k - 1]:
+            chosen.append(order[i])
+            k -= 1
+
+    return np.array(chosen, dtype=int), float(best[max_options])
+
+
+def apply_optimized_order(options, college_weights, branch_weights, user_rank, buffer,
+                          max_options=DEFAULT_MAX_OPTIONS, college_importance=0.5,
+                          college_key='College', branch_key='Branch Code',
+                          cutoff_key='Last Year Cutoff', priority_key='Priority',
+                          probabilities=None):
+    """
+    Reorder and truncate generated web options by expected utility.
+
+    Args:
+        options (list): Option dictionaries produced by a generator
+        college_weights (dict): College name -> preference weight
+        branch_weights (dict): Branch code -> preference weight
+        user_rank (int): Candidate's rank
+        buffer (int): Safety buffer selected by the user
+        max_options (int): Maximum number of options to keep
+        college_importance (float): Relative importance of college over branch
+        college_key (str): Key holding the college name
+        branch_key (str): Key holding the branch code
+        cutoff_key (str): Key holding last year's closing rank
+        priority_key (str): Key to renumber with the new order
+        probabilities (array-like, optional): Admission probability per option
+
+    Returns:
+        list: The chosen options in optimized order
+    """
+    if not options:
+        return []
+
+    colleges = [opt[college_key] for opt in options]
+    branches = [opt[branch_key] for opt in options]
+    if probabilities is None:
+        cutoffs = np.array([opt[cutoff_key] for opt in options], dtype=float)
+        probabilities = rank_admission_probability(user_rank, cutoffs, buffer)
+    probabilities = np.asarray(probabilities, dtype=float)
+
+    utilities = seat_utilities(colleges, branches, college_weights, branch_weights,
+                               college_importance=college_importance)
+    chosen, _ = optimize_option_order(utilities, probabilities, max_options)
+
+    optimized = []
+    for priority, idx in enumerate(chosen, 1):
+        option = dict(options[idx])
+        option[priority_key] = priority
+        option['Admission Probability'] = round(float(probabilities[idx]), 3)
+        option['Utility'] = round(float(utilities[idx]), 3)
+        optimized.append(option)
+
+    return optimized
@@ -2,31 +2,46 @@
 College prediction functions for the TS EAMCET College Predictor.
 """
 
+import numpy as np
 import pandas as pd
-import streamlit as st
-from .data_loader import load_data
+
+from .cache import RESULT_QUOTA_BYTES, cached
+from .index import rank_bucket
+from .metrics import timed
+from .querylog import logged_query
+from .store import get_phase, snapshot_hash
 from .constants import get_caste_column_name, BRANCH_MAP
+from .scenarios import BASELINE_SCENARIO, get_scenario_view
 
 
-@st.cache_data(ttl=1800)
-def predict_colleges(rank, gender, caste, branch, phase_selection, district_filter=None):
+@cached(ttl=1800, max_bytes=RESULT_QUOTA_BYTES)
+def predicted_seat_ids(rank, gender, caste, branch, phase_selection, district_filter, scenario, version):
     """
-    Predict colleges based on user inputs.
+    Seats a rank can get, as index labels of the phase data, with their cutoffs.
+
+    This is what predict_colleges caches: an integer array is a few KB per
+    query, where the result table would be a DataFrame per distinct rank.
+    Called with a rank_bucket floor, the seats of any rank in the bucket are
+    a suffix of the result (see seats_for_rank).
 
     Args:
-        rank (int): User's EAMCET rank
+        rank (int): User's EAMCET rank (or the floor of its bucket)
         gender (str): User's gender (Male/Female)
         caste (str): User's caste category
         branch (str): Selected branch
         phase_selection (str): Selected counseling phase
-        district_filter (str, optional): District filter
+        district_filter (str): District filter (None for all)
+        scenario (str): Rank-inflation scenario applied to the cutoffs
+        version (str): snapshot_hash() of the data the labels refer to
 
     Returns:
-        pandas.DataFrame: Filtered college results or None if no matches
+        tuple: (labels, cutoffs) as read-only arrays in ascending cutoff
+            order, or None if the phase or category column is missing
     """
-    df = load_data(phase_selection)
-    if df is None:
+    view = get_scenario_view(phase_selection, scenario)
+    if view is None:
         return None
+    df = view.df
 
     # Get the target column based on caste and gender
     target_column = get_caste_column_name(gender, caste)
@@ -37,11 +52,6 @@ def predict_colleges(rank, gender, caste, branch, phase_selection, district_filt
     # Checking branch column name in dataframe
     branch_col = 'Branch Name' if 'Branch Name' in df.columns else 'Branch Name'
 
-    # Detect college name column
-    college_col = 'Institute Name' if 'Institute Name' in df.columns else 'College Name'
-    if college_col not in df.columns:
-        college_col = 'Place'
-
     # Filtering by branch (skip if branch is "N/A")
     if branch != "N/A":
         branch_match = branch_map.get(branch)
@@ -58,31 +68,90 @@ def predict_colleges(rank, gender, caste, branch, phase_selection, district_filt
     if target_column not in filtered_df.columns:
         return None
 
-    # Filtering colleges where rank is sufficient
-    filtered_df = filtered_df[filtered_df[target_column] >= rank]
+    # Filtering colleges where rank is sufficient under the scenario
+    cutoffs = view.cutoffs(target_column).loc[filtered_df.index]
+    cutoffs = cutoffs[cutoffs >= rank]
 
     # Sorting by cutoff rank ascending
-    filtered_df = filtered_df.sort_values(by=target_column, ascending=True)
+    cutoffs = cutoffs.sort_values(kind='stable')
+    seat_ids, values = cutoffs.index.to_numpy(), cutoffs.to_numpy(dtype=float)
+    seat_ids.flags.writeable = values.flags.writeable = False
+    return seat_ids, values
+
+
+def seats_for_rank(rank, gender, caste, branch, phase_selection, district_filter=None,
+                   scenario=BASELINE_SCENARIO):
+    """
+    Labels of the seats a rank can get, in ascending cutoff order.
+
+    Looks up the cached seats of the rank's bucket and keeps the suffix whose
+    cutoff is at or above the exact rank.
+
+    Returns:
+        numpy.ndarray: Labels, or None if the phase or category column is missing
+    """
+    seats = predicted_seat_ids(rank_bucket(rank), gender, caste, branch, phase_selection,
+                               district_filter, scenario, snapshot_hash())
+    if seats is None:
+        return None
+    seat_ids, cutoffs = seats
+    return seat_ids[np.searchsorted(cutoffs, rank, side='left'):]
+
+
+@logged_query
+@timed()
+def predict_colleges(rank, gender, caste, branch, phase_selection, district_filter=None,
+                     scenario=BASELINE_SCENARIO):
+    """
+    Predict colleges based on user inputs.
+
+    Args:
+        rank (int): User's EAMCET rank
+        gender (str): User's gender (Male/Female)
+        caste (str): User's caste category
+        branch (str): Selected branch
+        phase_selection (str): Selected counseling phase
+        district_filter (str, optional): District filter
+        scenario (str, optional): Rank-inflation scenario applied to the cutoffs
+
+    Returns:
+        pandas.DataFrame: Filtered college results or None if no matches
+    """
+    seat_ids = seats_for_rank(rank, gender, caste, branch, phase_selection,
+                              district_filter, scenario)
+    if seat_ids is None:
+        return None
+    view = get_scenario_view(phase_selection, scenario)
+    df = view.df
+    target_column = get_caste_column_name(gender, caste)
+    branch_col = 'Branch Name'
+
+    # Detect college name column
+    college_col = 'Institute Name' if 'Institute Name' in df.columns else 'College Name'
+    if college_col not in df.columns:
+        college_col = 'Place'
 
     # Select columns based on available data
     available_cols = []
-    if college_col in filtered_df.columns:
+    if college_col in df.columns:
         available_cols.append(college_col)
-    if branch_col in filtered_df.columns:
+    if branch_col in df.columns:
         available_cols.append(branch_col)
-    if 'Place' in filtered_df.columns:
+    if 'Place' in df.columns:
         available_cols.append('Place')
-    if 'Dist Code' in filtered_df.columns:
+    if 'Dist Code' in df.columns:
         available_cols.append('Dist Code')
-    if 'Tuition Fee' in filtered_df.columns:
+    if 'Tuition Fee' in df.columns:
         available_cols.append('Tuition Fee')
-    if 'Affiliated To' in filtered_df.columns:
+    if 'Affiliated To' in df.columns:
         available_cols.append('Affiliated To')
-    if target_column in filtered_df.columns:
+    if target_column in df.columns:
         available_cols.append(target_column)
 
-    # Prepare the result dataframe with available columns
-    result_df = filtered_df[available_cols].copy()
+    # Prepare the result dataframe with available columns (one take of the seat rows)
+    positions = df.index.get_indexer(seat_ids)
+    result_df = df.iloc[positions, df.columns.get_indexer(available_cols)]
+    result_df[target_column] = view.cutoffs(target_column).to_numpy()[positions]
 
     # Rename columns for display
     rename_map = {
@@ -93,18 +162,18 @@ def predict_colleges(rank, gender, caste, branch, phase_selection, district_filt
         target_column: 'Closing Rank'
     }
 
-    # Only rename columns that exist
-    rename_cols = {k: v for k, v in rename_map.items()
-                   if k in result_df.columns}
-    result_df = result_df.rename(columns=rename_cols)
+    # Relabel in place; the frame is already a fresh copy
+    result_df.columns = [rename_map.get(c, c) for c in result_df.columns]
 
     return result_df
 
 # Cache your prediction function
 
 
-@st.cache_data(ttl=1800)
-def compare_phases(rank, gender, caste, branch, top_n=5):
+@logged_query
+@timed()
+@cached(ttl=1800, max_bytes=RESULT_QUOTA_BYTES)
+def compare_phases(rank, gender, caste, branch, top_n=5, scenario=BASELINE_SCENARIO):
     """
     Compare college predictions across different counseling phases.
 
@@ -114,6 +183,7 @@ def compare_phases(rank, gender, caste, branch, top_n=5):
         caste (str): User's caste category
         branch (str): Selected branch
         top_n (int, optional): Number of top colleges to include
+        scenario (str, optional): Rank-inflation scenario applied to the cutoffs
 
     Returns:
         dict: Dictionary with phase as key and dataframe as value
@@ -122,7 +192,8 @@ def compare_phases(rank, gender, caste, branch, top_n=5):
     comparison = {}
 
     for phase in phases:
-        result = predict_colleges(rank, gender, caste, branch, phase)
+        result = predict_colleges(
+            rank, gender, caste, branch, phase, scenario=scenario)
         if result is not None and not result.empty:
             comparison[phase] = result.head(top_n)
 
@@ -131,7 +202,8 @@ def compare_phases(rank, gender, caste, branch, top_n=5):
 # Cache your prediction function
 
 
-@st.cache_data(ttl=1800)
+@timed()
+@cached(ttl=1800)
 def get_college_branches(college_name, phase_selection, gender, caste):
     """
     Get all branches available in a specific college with their cutoffs.
@@ -145,7 +217,7 @@ def get_college_branches(college_name, phase_selection, gender, caste):
     Returns:
         pandas.DataFrame: Branches with cutoffs or None if no data
     """
-    df = load_data(phase_selection)
+    df = get_phase(phase_selection)
     if df is None:
         return None
 
@@ -201,7 +273,8 @@ def get_college_branches(college_name, phase_selection, gender, caste):
 # Cache your prediction function
 
 
-@st.cache_data(ttl=1800)
+@timed()
+@cached(ttl=1800)
 def analyze_branch_cutoffs(branch_caste, branch_gender, phase="Final Phase"):
     """
     Analyze cutoff trends across different branches.
@@ -214,7 +287,7 @@ def analyze_branch_cutoffs(branch_caste, branch_gender, phase="Final Phase"):
     Returns:
         tuple: (branch_analysis, analysis_df) - Series of median ranks and dataframe for display
     """
-    df = load_data(phase)
+    df = get_phase(phase)
     if df is None:
         return None, None
 
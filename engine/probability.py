@@ -0,0 +1,221 @@
+"""
+Monte Carlo admission-probability scoring for the TS EAMCET College Predictor.
+
+Each seat's 2025 closing rank is modelled as log-normal. The median is the
+2024 final-phase closing rank times an inflation factor. The spread grows
+with how much the seat moved between the 1st, 2nd and Final phases.
+
+A candidate is admitted when the sampled closing rank is at or above their
+rank. Every seat reuses one block of sorted standard-normal draws (common
+random numbers), so the share of draws at or above each seat's threshold
+comes from a single vectorized searchsorted. There is no
+(n_samples x n_seats) matrix, and the whole seat universe scores in about a
+millisecond.
+"""
+import numpy as np
+import pandas as pd
+
+from .cache import cached
+from .constants import CATEGORY_COLUMNS
+from .store import get_phase
+
+SEAT_ID_COLUMNS = ['Inst Code', 'Branch Code']
+
+DEFAULT_SAMPLES = 4000
+BASE_SIGMA = 0.10        # log-spread of a seat that never moved between phases
+MOVEMENT_WEIGHT = 0.5    # how strongly phase-to-phase movement widens the spread
+
+_sample_cache = {}
+
+
+def standard_normal_samples(n_samples=DEFAULT_SAMPLES, seed=2025):
+    """
+    Sorted standard-normal draws shared by every seat.
+
+    Args:
+        n_samples (int): Number of Monte Carlo draws
+        seed (int): Random seed, fixed so labels are stable between reruns
+
+    Returns:
+        numpy.ndarray: Sorted draws (read-only)
+    """
+    key = (n_samples, seed)
+    if key not in _sample_cache:
+        samples = np.sort(np.random.default_rng(
+            seed).standard_normal(n_samples))
+        samples.flags.writeable = False
+        _sample_cache[key] = samples
+    return _sample_cache[key]
+
+
+class ClosingRankModel:
+    """Log-normal closing rank distribution for every (seat, category column)."""
+
+    def __init__(self, seat_ids, log_median, sigma):
+        """
+        Args:
+            seat_ids (pandas.DataFrame): Inst Code and Branch Code of each seat
+            log_median (numpy.ndarray): (n_seats, 18) log of the median closing rank
+            sigma (numpy.ndarray): (n_seats, 18) log-spread of the closing rank
+        """
+        self.seat_ids = seat_ids.reset_index(drop=True)
+        self.log_median = log_median
+        self.sigma = sigma
+        self._rows = {key: i for i, key in enumerate(
+            zip(self.seat_ids['Inst Code'], self.seat_ids['Branch Code']))}
+        self._columns = {col: i for i, col in enumerate(CATEGORY_COLUMNS)}
+
+    @classmethod
+    def empty(cls):
+        """Model without seats; every lookup falls back to the given cutoffs."""
+        return cls(pd.DataFrame(columns=SEAT_ID_COLUMNS),
+                   np.empty((0, len(CATEGORY_COLUMNS))),
+                   np.empty((0, len(CATEGORY_COLUMNS))))
+
+    def rows_for(self, inst_codes, branch_codes):
+        """
+        Model rows for the given seats.
+
+        Args:
+            inst_codes (array-like): Institute codes
+            branch_codes (array-like): Branch codes
+
+        Returns:
+            numpy.ndarray: Row index per seat, -1 where the seat is unknown
+        """
+        return np.array([self._rows.get(key, -1) for key in zip(inst_codes, branch_codes)],
+                        dtype=np.int64)
+
+    def probabilities(self, user_rank, column, rows=None, inflation=1.0,
+                      fallback_cutoffs=None, n_samples=DEFAULT_SAMPLES):
+        """
+        Probability that the 2025 closing rank is at or above user_rank.
+
+        Args:
+            user_rank (int): Candidate's rank
+            column (str): Category column (see get_caste_column_name)
+            rows (array-like, optional): Model rows to score; all seats if omitted
+            inflation (float or array-like): Multiplier on the median closing rank
+            fallback_cutoffs (array-like, optional): Closing ranks used (with the
+                base spread) for rows that are -1 or have no model data
+            n_samples (int): Number of Monte Carlo draws
+
+        Returns:
+            numpy.ndarray: Admission probability per seat (0 where unknown)
+        """
+        col = self._columns[column]
+        if rows is None:
+            rows = np.arange(len(self.seat_ids))
+        rows = np.asarray(rows, dtype=np.int64)
+        known = rows >= 0
+
+        log_median = np.full(len(rows), np.nan)
+        sigma = np.full(len(rows), BASE_SIGMA)
+        log_median[known] = self.log_median[rows[known], col]
+        sigma[known] = self.sigma[rows[known], col]
+
+        if fallback_cutoffs is not None:
+            fallback = np.asarray(fallback_cutoffs, dtype=float)
+            fallback = np.where(np.isfinite(fallback) &
+                                (fallback > 0), fallback, np.nan)
+            missing = np.isnan(log_median)
+            log_median[missing] = np.log(fallback[missing])
+            sigma[missing] = BASE_SIGMA
+
+        log_median = log_median + np.log(inflation)
+        threshold = (np.log(max(user_rank, 1)) - log_median) / sigma
+
+        samples = standard_normal_samples(n_samples)
+        above = len(samples) - \
+            np.searchsorted(samples, np.nan_to_num(threshold, nan=np.inf))
+        probabilities = above / len(samples)
+        return np.where(np.isnan(log_median), 0.0, probabilities)
+
+    def sample_closing_ranks(self, column, rows=None, inflation=1.0, n_samples=1000, seed=None):
+        """
+        Draw independent closing-rank samples for joint what-if analysis.
+
+        Args:
+            column (str): Category column
+            rows (array-like, optional): Model rows to sample; all seats if omitted
+            inflation (float): Multiplier on the median closing rank
+            n_samples (int): Number of draws per seat
+            seed (int, optional): Random seed
+
+        Returns:
+            numpy.ndarray: (n_samples, n_rows) sampled closing ranks
+        """
+        col = self._columns[column]
+        if rows is None:
+            rows = np.arange(len(self.seat_ids))
+        rng = np.random.default_rng(seed)
+        z = rng.standard_normal((n_samples, len(rows)))
+        return np.exp(self.log_median[rows, col] + np.log(inflation) + self.sigma[rows, col] * z)
+
+
+def build_closing_rank_model(phase_frames):
+    """
+    Build the model from the three phase dataframes.
+
+    Args:
+        phase_frames (dict): Phase name -> cleaned dataframe; must contain
+            "Final Phase", may contain "1st Phase" and "2nd Phase"
+
+    Returns:
+        ClosingRankModel: Model over the Final Phase seats
+    """
+    final = phase_frames["Final Phase"]
+    keys = pd.MultiIndex.from_frame(final[SEAT_ID_COLUMNS])
+    final_ranks = final[CATEGORY_COLUMNS].to_numpy(dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_final = np.log(final_ranks)
+        movement = np.zeros_like(final_ranks)
+        for phase in ("1st Phase", "2nd Phase"):
+            frame = phase_frames.get(phase)
+            if frame is None:
+                continue
+            earlier = frame.set_index(SEAT_ID_COLUMNS)[CATEGORY_COLUMNS].reindex(
+                keys).to_numpy(dtype=float)
+            step = log_final - np.log(earlier)
+            movement += np.where(np.isfinite(step), step, 0.0) ** 2
+
+    sigma = np.sqrt(BASE_SIGMA ** 2 + MOVEMENT_WEIGHT * movement)
+    log_median = np.where(np.isfinite(log_final), log_final, np.nan)
+    return ClosingRankModel(final[SEAT_ID_COLUMNS], log_median, sigma)
+
+
+@cached(ttl=3600, shared=False)
+def get_closing_rank_model():
+    """
+    Closing rank model built from all available phase data.
+
+    Returns:
+        ClosingRankModel: The model, or None if the Final Phase data is missing
+    """
+    frames = {phase: get_phase(phase)
+              for phase in ("1st Phase", "2nd Phase", "Final Phase")}
+    if frames["Final Phase"] is None:
+        return None
+    return build_closing_rank_model({k: v for k, v in frames.items() if v is not None})
+
+
+def score_seats(user_rank, column, inst_codes, branch_codes, cutoffs, inflation=1.0):
+    """
+    Admission probabilities for a list of seats.
+
+    Args:
+        user_rank (int): Candidate's rank
+        column (str): Category column
+        inst_codes (array-like): Institute code of each seat
+        branch_codes (array-like): Branch code of each seat
+        cutoffs (array-like): Last year's closing rank of each seat (fallback)
+        inflation (float): Multiplier on the median closing rank
+
+    Returns:
+        numpy.ndarray: Admission probability per seat
+    """
+    model = get_closing_rank_model() or ClosingRankModel.empty()
+    rows = model.rows_for(inst_codes, branch_codes)
+    return model.probabilities(user_rank, column, rows, inflation, fallback_cutoffs=cutoffs)
+
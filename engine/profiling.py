@@ -0,0 +1,228 @@
+"""
+Profile captures of slow reruns and requests.
+
+``with capture(label):`` watches one rerun. A forced capture runs cProfile
+over the block and always saves it. Otherwise a shared StackSampler thread
+records the block's call stacks every SAMPLE_INTERVAL seconds, and the
+samples are only saved when the block took longer than its budget. Sampling
+needs no tracing hooks in the profiled thread, so it can stay on in
+production.
+
+Each saved capture is written to PROFILE_DIR as a profile file with a JSON
+metadata file of the same name. cProfile captures are pstats dumps
+(``.prof``) and sampled ones are folded stacks (``.folded``, one
+``frame;frame;frame count`` line per stack) that flame graph tools read
+directly. Only the newest MAX_CAPTURES are kept.
+"""
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+MAX_CAPTURES = int(os.getenv('PROFILE_KEEP', '50'))
+SAMPLE_INTERVAL = 0.01
+MAX_DEPTH = 128
+TOP_FUNCTIONS = 25
+
+
+def frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler(threading.Thread):
+    """Daemon thread sampling the call stacks of the threads being captured."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        super().__init__(name="stack-sampler", daemon=True)
+        self.interval = interval
+        self._targets = {}
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+
+    def add(self, thread_id):
+        """Start sampling a thread; returns the Counter its stacks go to."""
+        stacks = Counter()
+        with self._lock:
+            self._targets[thread_id] = stacks
+            self._active.set()
+        return stacks
+
+    def remove(self, thread_id):
+        with self._lock:
+            self._targets.pop(thread_id, None)
+            if not self._targets:
+                self._active.clear()
+
+    def sample(self):
+        # Held throughout, so a thread's Counter is final once remove() returns
+        with self._lock:
+            frames = sys._current_frames()
+            for thread_id, stacks in self._targets.items():
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None and len(stack) < MAX_DEPTH:
+                    stack.append(frame_label(frame.f_code))
+                    frame = frame.f_back
+                if stack:
+                    stacks[';'.join(reversed(stack))] += 1
+
+    def run(self):
+        while True:
+            self._active.wait()
+            self.sample()
+            time.sleep(self.interval)
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler():
+    """The process-wide StackSampler, started on first use."""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = StackSampler()
+            _sampler.start()
+        return _sampler
+
+
+class Capture:
+    """One watched block; metadata can be added until the block ends."""
+
+    def __init__(self, label, budget, force, metadata):
+        self.label = label
+        self.budget = budget
+        self.force = force
+        self.metadata = dict(metadata or {})
+        self.started_at = time.time()
+        self.duration = None
+        self.path = None
+
+
+def _slug(text):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '-', str(text)).strip('-')[:60] or "capture"
+
+
+def prune(directory=PROFILE_DIR, keep=MAX_CAPTURES):
+    """Delete all but the newest keep captures in directory."""
+    try:
+        stems = sorted(name[:-5] for name in os.listdir(directory) if name.endswith('.json'))
+    except OSError:
+        return
+    for stem in stems[:-keep] if keep else stems:
+        for suffix in ('.json', '.prof', '.folded'):
+            try:
+                os.remove(os.path.join(directory, stem + suffix))
+            except FileNotFoundError:
+                pass
+
+
+def top_folded(stacks, n=TOP_FUNCTIONS):
+    """Functions with the most samples at the top of the stack."""
+    leaves = Counter()
+    for stack, count in stacks.items():
+        leaves[stack.rsplit(';', 1)[-1]] += count
+    return [{'function': f, 'samples': c} for f, c in leaves.most_common(n)]
+
+
+def top_cprofile(profiler, n=TOP_FUNCTIONS):
+    """The cumulative-time table of a cProfile run as text."""
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(n)
+    return out.getvalue()
+
+
+def save(result, kind, data, directory=PROFILE_DIR, keep=MAX_CAPTURES):
+    """
+    Write a finished capture and its metadata, then apply the retention limit.
+
+    Args:
+        result (Capture): The finished capture
+        kind (str): "cprofile" or "sampled"
+        data: cProfile.Profile or Counter of folded stacks
+
+    Returns:
+        str: Path of the profile file, or None if it could not be written
+    """
+    stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(result.started_at))
+    stem = f"{stamp}-{int(result.started_at * 1000) % 1000:03d}-{_slug(result.label)}"
+    metadata = dict(result.metadata, label=result.label, kind=kind,
+                    started_at=result.started_at, duration_s=round(result.duration, 4),
+                    budget_s=result.budget, pid=os.getpid())
+    try:
+        os.makedirs(directory, exist_ok=True)
+        if kind == "cprofile":
+            path = os.path.join(directory, stem + '.prof')
+            data.dump_stats(path)
+            metadata['top'] = top_cprofile(data)
+        else:
+            path = os.path.join(directory, stem + '.folded')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.writelines(f"{stack} {count}\n" for stack, count in data.most_common())
+            metadata['samples'] = sum(data.values())
+            metadata['interval_s'] = get_sampler().interval
+            metadata['top'] = top_folded(data)
+        with open(os.path.join(directory, stem + '.json'), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2, default=str)
+    except OSError as e:
+        logger.warning(f"Could not save profile to {directory}: {e}")
+        return None
+    prune(directory, keep)
+    return path
+
+
+@contextmanager
+def capture(label, budget=None, force=False, metadata=None, directory=PROFILE_DIR):
+    """
+    Profile a block and save the result if it was forced or over budget.
+
+    Args:
+        label (str): Name used in the file name, e.g. the page
+        budget (float, optional): Seconds above which a sampled profile is
+            saved (None disables sampling)
+        force (bool): Run cProfile and always save
+        metadata (dict, optional): Request details stored with the profile
+        directory (str): Where captures are written
+
+    Yields:
+        Capture: Its metadata may be extended inside the block; after the
+            block, path is set if a profile was saved
+    """
+    result = Capture(label, budget, force, metadata)
+    if not force and budget is None:
+        yield result
+        return
+
+    profiler = stacks = None
+    thread_id = threading.get_ident()
+    if force:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    else:
+        stacks = get_sampler().add(thread_id)
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result.duration = time.perf_counter() - start
+        if profiler is not None:
+            profiler.disable()
+            result.path = save(result, "cprofile", profiler, directory)
+        else:
+            get_sampler().remove(thread_id)
+            if result.duration > budget and stacks:
+                result.path = save(result, "sampled", stacks, directory)
+        if result.path:
+            logger.info(f"Saved profile of {label} ({result.duration:.2f}s) to {result.path}")
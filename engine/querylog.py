@@ -0,0 +1,159 @@
+"""
+Log of engine queries, used to warm up new replicas with past traffic.
+
+Entry points decorated with ``@logged_query`` append each call to QUERY_LOG
+(when set) as one JSON line: ``{"function": name, "kwargs": {...}}``, with
+the arguments the caller passed. Calls made inside another logged query or
+while replaying queries are not logged, and neither are calls whose
+arguments are not JSON-friendly. Once the log passes LOG_MAX_BYTES it is
+rewritten to its newest LOG_WINDOW lines, so it stays bounded on a
+long-running replica. Hand-written query lists use the same format (see
+engine.warmup).
+"""
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+QUERY_LOG = os.getenv('QUERY_LOG') or None
+# Only the newest lines of the log are read back
+LOG_WINDOW = 20000
+# Size at which the log is cut back to its newest LOG_WINDOW lines
+LOG_MAX_BYTES = int(float(os.getenv('QUERY_LOG_MB', '16')) * 1024 * 1024)
+
+# Function name -> logged function; also the functions a query list may call
+QUERY_FUNCTIONS = {}
+
+_lock = threading.Lock()
+_inside = ContextVar('inside_query', default=False)
+
+
+def _plain(value):
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_plain(v) for v in value]
+        return sorted(items) if isinstance(value, (set, frozenset)) else items
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    raise TypeError(f"cannot log {type(value).__name__}")
+
+
+def query_line(function, kwargs):
+    """
+    Canonical JSON line of a query.
+
+    Raises:
+        TypeError: If an argument is not a string, number, bool, None or a
+            list/dict of those
+    """
+    return json.dumps({'function': function, 'kwargs': _plain(kwargs)}, sort_keys=True)
+
+
+def rotate_log(path, window=LOG_WINDOW):
+    """
+    Rewrite a JSON-lines log to its newest window lines.
+
+    The file is replaced atomically; lines appended by other processes while
+    it is rewritten may be lost, which only costs warm-up some traffic.
+    """
+    with open(path, encoding='utf-8') as f:
+        lines = deque(f, maxlen=window)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+    os.replace(temp_path, path)
+
+
+def logged_query(func):
+    """Register an entry point as a query and log its calls to QUERY_LOG."""
+    signature = inspect.signature(func)
+    name = func.__name__
+    QUERY_FUNCTIONS[name] = func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _inside.get():
+            return func(*args, **kwargs)
+        if QUERY_LOG:
+            try:
+                line = query_line(name, signature.bind(*args, **kwargs).arguments)
+            except TypeError:
+                pass
+            else:
+                with _lock:
+                    try:
+                        with open(QUERY_LOG, 'a', encoding='utf-8') as f:
+                            f.write(line + "\n")
+                            size = f.tell()
+                        if size > LOG_MAX_BYTES:
+                            rotate_log(QUERY_LOG)
+                    except OSError as e:
+                        logger.warning(f"Could not write query log {QUERY_LOG}: {e}")
+        token = _inside.set(True)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _inside.reset(token)
+
+    return wrapper
+
+
+@contextmanager
+def replaying():
+    """Run logged queries without logging them (e.g. during warm-up)."""
+    token = _inside.set(True)
+    try:
+        yield
+    finally:
+        _inside.reset(token)
+
+
+def read_queries(path):
+    """
+    Queries from a JSON array or a JSON-lines file.
+
+    Lines that are not valid queries are skipped; only the newest LOG_WINDOW
+    lines of a JSON-lines file are read.
+
+    Returns:
+        list: (function name, kwargs dict) pairs in file order
+    """
+    with open(path, encoding='utf-8') as f:
+        first = f.read(1)
+        f.seek(0)
+        if first == '[':
+            items = json.load(f)
+        else:
+            items = []
+            for line in deque(f, maxlen=LOG_WINDOW):
+                try:
+                    items.append(json.loads(line))
+                except ValueError:
+                    continue
+    return [(item['function'], item.get('kwargs') or {}) for item in items
+            if isinstance(item, dict) and item.get('function') in QUERY_FUNCTIONS
+            and isinstance(item.get('kwargs') or {}, dict)]
+
+
+def top_queries(queries, n):
+    """
+    The n most frequent queries, most frequent first.
+
+    Args:
+        queries (list): (function name, kwargs dict) pairs
+        n (int): Queries to keep
+
+    Returns:
+        list: Distinct (function name, kwargs dict) pairs
+    """
+    counts = Counter(query_line(function, kwargs) for function, kwargs in queries)
+    return [(item['function'], item['kwargs'])
+            for item in (json.loads(line) for line, _ in counts.most_common(n))]
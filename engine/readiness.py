@@ -0,0 +1,105 @@
+"""
+Readiness of a replica to serve queries, for load balancer health checks.
+
+readiness() reports:
+
+- data: data_version, snapshot_hash and the rows of each phase (or its
+  load error)
+- indexes: per phase, the category columns that have a cutoff index
+- warmup: progress of engine.warmup
+- cache: the engine cache backend and its size, plus a lookup round trip
+  to the shared store if there is one
+- probe: latency of the warm-up canary query
+
+A replica is ready when three things hold: warm-up has finished, every phase
+is loaded, and the canary query answers within READY_BUDGET_SECONDS. Until
+warm-up finishes, only its progress is reported. An unreachable shared store
+is reported but does not make the replica unready, because lookups then fall
+back to the in-process cache.
+"""
+import os
+import time
+
+from .cache import get_cache_backend
+from .constants import CATEGORY_COLUMNS, PHASE_FILES
+from .index import get_cutoff_index
+from .querylog import QUERY_FUNCTIONS, replaying
+from .shared_cache import TieredCache
+from .store import DataLoadError, data_version, load_phase, snapshot_hash
+from .warmup import CANARY_QUERY, status
+
+READY_BUDGET_SECONDS = float(os.getenv('READY_BUDGET_SECONDS', '1.0'))
+
+
+def data_health():
+    """Rows or load error of each phase, and the indexed category columns."""
+    phases = {}
+    indexes = {}
+    for phase in PHASE_FILES:
+        try:
+            df = load_phase(phase)
+        except DataLoadError as e:
+            phases[phase] = {'ok': False, 'error': str(e)}
+            continue
+        phases[phase] = {'ok': True, 'rows': len(df)}
+        columns = [c for c in CATEGORY_COLUMNS if c in df.columns]
+        indexes[phase] = {'columns': len(columns),
+                          'indexed': sum(1 for c in columns if len(get_cutoff_index(phase, c)[0]))}
+    return phases, indexes
+
+
+def cache_health():
+    """Engine cache backend, its size and the health of a shared store."""
+    backend = get_cache_backend()
+    report = {'backend': type(backend).__name__, 'entries': len(backend),
+              'bytes': getattr(backend, 'nbytes', None)}
+    if isinstance(backend, TieredCache):
+        report['shared'] = backend.health()
+    return report
+
+
+def probe(budget):
+    """Run the canary query; returns (seconds, error or None)."""
+    function, kwargs = CANARY_QUERY
+    start = time.perf_counter()
+    try:
+        with replaying():
+            QUERY_FUNCTIONS[function](**kwargs)
+    except Exception as e:
+        return time.perf_counter() - start, f"{type(e).__name__}: {e}"
+    seconds = time.perf_counter() - start
+    return seconds, None if seconds <= budget else f"took {seconds:.2f}s (budget {budget}s)"
+
+
+def readiness(budget=READY_BUDGET_SECONDS, require_warmup=True):
+    """
+    Whether this process can answer queries within budget, and why not.
+
+    Args:
+        budget (float): Seconds the canary query may take
+        require_warmup (bool): Wait for engine.warmup to finish (False when
+            warm-up is turned off)
+
+    Returns:
+        dict: JSON-ready report with "ready" (bool), "reasons" (list of str)
+            and the sections described in the module docstring
+    """
+    report = {'ready': False, 'reasons': [], 'warmup': status.snapshot()}
+    if require_warmup and not status.ready:
+        current = report['warmup']['current']
+        report['reasons'].append(f"warm-up {report['warmup']['state']}"
+                                 + (f" ({current})" if current else ""))
+        return report
+
+    phases, indexes = data_health()
+    report['data'] = {'version': data_version(), 'snapshot': snapshot_hash(), 'phases': phases}
+    report['indexes'] = indexes
+    report['reasons'] += [f"{phase} not loaded" for phase, p in phases.items() if not p['ok']]
+    report['cache'] = cache_health()
+
+    seconds, error = probe(budget)
+    report['probe'] = {'query': CANARY_QUERY[0], 'seconds': round(seconds, 4), 'budget': budget}
+    if error:
+        report['reasons'].append(f"canary query {error}")
+    report['ready'] = not report['reasons']
+    return report
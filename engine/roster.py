@@ -0,0 +1,308 @@
+"""
+Batch web-option generation for student rosters.
+
+Reads a CSV or XLSX roster (one student per row: rank, gender, category and
+preferred branches). For each student it runs the branch-priority generator
+(get_web_options) and the best-possible generator (get_rank_based_best_list).
+The results go to one consolidated CSV and, optionally, one XLSX per student.
+A student for whom neither list has any option gets a single "No Options"
+row, so they count as done on the next run.
+
+Students are processed in chunks across a process pool. Each worker loads the
+phase data and builds the scenario view once in its initializer; both stay in
+its engine cache (the view is keyed on the data snapshot), so students do not
+reload the data or rescale the cutoffs individually. The consolidated
+CSV is appended one chunk at a time; ``--resume`` skips students already in
+it, so an interrupted run can be continued.
+
+Usage:
+    python -m engine.roster students.xlsx --output options.csv --per-student-dir out/
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from .chance import CHANCE_TIERS, CHANCE_MODES, CHANCE_MODE_ABSOLUTE
+from .constants import BRANCH_MAP, CASTE_CATEGORIES, PHASE_FILES
+from .generators import COLLEGE_LIST_TYPES, get_web_options, get_rank_based_best_list
+from .scenarios import BASELINE_SCENARIO, SCENARIO_NAMES, get_scenario_view
+from .store import get_phase
+
+LIST_BRANCH_PRIORITY = "Branch Priority"
+LIST_BEST_POSSIBLE = "Best Possible"
+LIST_NONE = "No Options"
+
+DEFAULT_BRANCHES = ('CSE', 'CSM', 'CSD', 'ECE')
+
+# Accepted roster headers (lower-cased, spaces/underscores removed) -> field
+COLUMN_ALIASES = {
+    'studentid': 'Student ID', 'id': 'Student ID', 'rollno': 'Student ID', 'rollnumber': 'Student ID',
+    'name': 'Name', 'studentname': 'Name',
+    'rank': 'Rank', 'eamcetrank': 'Rank', 'eapcetrank': 'Rank',
+    'gender': 'Gender', 'sex': 'Gender',
+    'caste': 'Caste', 'category': 'Caste', 'castecategory': 'Caste',
+    'branches': 'Branches', 'preferredbranches': 'Branches', 'branchpreferences': 'Branches',
+}
+GENDER_ALIASES = {'male': "Male", 'm': "Male", 'boy': "Male",
+                  'female': "Female", 'f': "Female", 'girl': "Female"}
+
+OUTPUT_COLUMNS = ['Student ID', 'Name', 'Rank', 'Gender', 'Caste', 'List', 'Priority',
+                  'College', 'Branch Code', 'Branch Name', 'Last Year Cutoff', 'Chance',
+                  'Admission Probability', 'Tuition Fee', 'District']
+
+
+def read_roster(path):
+    """
+    Read and validate a roster file.
+
+    Args:
+        path (str): CSV or XLSX file
+
+    Returns:
+        tuple: (list of student dicts, list of (row number, error) for rejected rows)
+    """
+    if path.lower().endswith(('.xlsx', '.xls')):
+        raw = pd.read_excel(path, dtype=str)
+    else:
+        raw = pd.read_csv(path, dtype=str, skipinitialspace=True)
+    raw = raw.rename(columns=lambda c: COLUMN_ALIASES.get(
+        re.sub(r'[\s_]', '', str(c).lower()), c))
+
+    missing = [c for c in ('Rank', 'Gender', 'Caste') if c not in raw.columns]
+    if missing:
+        raise ValueError(f"Roster is missing column(s): {', '.join(missing)}")
+
+    students, rejected = [], []
+    for row_number, row in enumerate(raw.fillna('').to_dict('records'), 2):
+        try:
+            students.append(parse_student(row, row_number))
+        except ValueError as e:
+            rejected.append((row_number, str(e)))
+    return students, rejected
+
+
+def parse_student(row, row_number):
+    """Normalize one roster row; raises ValueError if it cannot be used."""
+    try:
+        rank = int(float(row['Rank']))
+    except (ValueError, OverflowError):
+        raise ValueError(f"invalid rank {row['Rank']!r}")
+    if rank <= 0:
+        raise ValueError(f"invalid rank {rank}")
+
+    gender = GENDER_ALIASES.get(row['Gender'].strip().lower())
+    if gender is None:
+        raise ValueError(f"invalid gender {row['Gender']!r}")
+
+    caste = row['Caste'].strip().upper().replace('-', '_').replace(' ', '_')
+    if caste not in CASTE_CATEGORIES:
+        raise ValueError(f"invalid category {row['Caste']!r}")
+
+    branches = [b.strip().upper() for b in re.split(r'[,;/|]', row.get('Branches', ''))]
+    branches = [b for b in branches if b in BRANCH_MAP] or list(DEFAULT_BRANCHES)
+
+    return {
+        'Student ID': str(row.get('Student ID') or row_number).strip(),
+        'Name': row.get('Name', '').strip(),
+        'Rank': rank,
+        'Gender': gender,
+        'Caste': caste,
+        'Branches': branches,
+    }
+
+
+def _option_rows(student, list_name, options, max_options):
+    """Consolidated output rows for one generated list."""
+    rows = []
+    for option in options[:max_options]:
+        option = {k.replace('_', ' '): v for k, v in option.items()}
+        chance = option.get('Chance', -1)
+        rows.append({
+            'Student ID': student['Student ID'], 'Name': student['Name'],
+            'Rank': student['Rank'], 'Gender': student['Gender'], 'Caste': student['Caste'],
+            'List': list_name,
+            'Priority': option.get('Priority'),
+            'College': option.get('College'),
+            'Branch Code': option.get('Branch Code'),
+            'Branch Name': option.get('Branch Name'),
+            'Last Year Cutoff': option.get('Last Year Cutoff'),
+            'Chance': CHANCE_TIERS[chance] if 0 <= chance < len(CHANCE_TIERS) else '',
+            'Admission Probability': option.get('Admission Probability'),
+            'Tuition Fee': option.get('Tuition Fee'),
+            'District': option.get('District'),
+        })
+    return rows
+
+
+def _init_worker(phase, scenario):
+    """Load the data snapshot and warm its scenario view once per worker process."""
+    if get_phase(phase) is None:
+        raise RuntimeError(f"Could not load {phase} data")
+    get_scenario_view(phase, scenario)
+
+
+def process_chunk(students, settings, per_student_dir=None):
+    """
+    Generate both option lists for a chunk of students.
+
+    Args:
+        students (list): Student dicts from read_roster
+        settings (dict): Generator keyword arguments (phase, buffer, list_type, ...)
+        per_student_dir (str, optional): Directory for per-student XLSX files
+
+    Returns:
+        tuple: (consolidated rows, list of (student ID, error))
+    """
+    max_options = settings['max_options']
+    rows, failed = [], []
+    for student in students:
+        try:
+            args = (student['Rank'], student['Gender'], student['Caste'])
+            priority = get_web_options(*args, student['Branches'], **settings)
+            best = get_rank_based_best_list(*args, **settings)
+        except Exception as e:
+            failed.append((student['Student ID'], str(e)))
+            continue
+
+        student_rows = (_option_rows(student, LIST_BRANCH_PRIORITY, priority, max_options)
+                        + _option_rows(student, LIST_BEST_POSSIBLE, best, max_options))
+        if not student_rows:
+            # Recorded so that --resume does not process the student again
+            student_rows = [{
+                'Student ID': student['Student ID'], 'Name': student['Name'],
+                'Rank': student['Rank'], 'Gender': student['Gender'], 'Caste': student['Caste'],
+                'List': LIST_NONE,
+            }]
+        rows.extend(student_rows)
+
+        if per_student_dir:
+            df = pd.DataFrame(student_rows, columns=OUTPUT_COLUMNS)
+            file_name = re.sub(r'[^\w.-]', '_', student['Student ID']) + '.xlsx'
+            with pd.ExcelWriter(os.path.join(per_student_dir, file_name)) as writer:
+                for list_name, group in df.groupby('List', sort=False):
+                    group.drop(columns='List').to_excel(
+                        writer, sheet_name=list_name, index=False)
+    return rows, failed
+
+
+def completed_students(output):
+    """Student IDs already present in a consolidated output file."""
+    if not os.path.exists(output) or os.path.getsize(output) == 0:
+        return set()
+    done = pd.read_csv(output, usecols=['Student ID'], dtype=str)
+    return set(done['Student ID'])
+
+
+def run_roster(students, output, settings, per_student_dir=None, workers=None,
+               chunk_size=25, resume=False, progress=sys.stderr):
+    """
+    Process a roster across a process pool.
+
+    Args:
+        students (list): Student dicts from read_roster
+        output (str): Consolidated CSV path (appended chunk by chunk)
+        settings (dict): Generator keyword arguments
+        per_student_dir (str, optional): Directory for per-student XLSX files
+        workers (int, optional): Worker processes (defaults to the CPU count)
+        chunk_size (int): Students per task
+        resume (bool): Skip students already in output instead of overwriting it
+        progress (file, optional): Stream for progress lines, or None
+
+    Returns:
+        dict: Counts of processed, skipped and failed students, failures and elapsed seconds
+    """
+    done = completed_students(output) if resume else set()
+    if not resume and os.path.exists(output):
+        os.remove(output)
+    pending = [s for s in students if s['Student ID'] not in done]
+    if per_student_dir:
+        os.makedirs(per_student_dir, exist_ok=True)
+
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    write_header = not os.path.exists(output) or os.path.getsize(output) == 0
+    processed, failures = 0, []
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(settings['phase'], settings['scenario'])) as pool:
+        futures = {pool.submit(process_chunk, chunk, settings, per_student_dir): len(chunk)
+                   for chunk in chunks}
+        for future in as_completed(futures):
+            rows, failed = future.result()
+            if rows:
+                pd.DataFrame(rows, columns=OUTPUT_COLUMNS).to_csv(
+                    output, mode='a', header=write_header, index=False)
+                write_header = False
+            processed += futures[future]
+            failures.extend(failed)
+
+            if progress is not None:
+                elapsed = time.perf_counter() - start
+                rate = processed / elapsed if elapsed else 0.0
+                eta = (len(pending) - processed) / rate if rate else 0.0
+                print(f"[{processed}/{len(pending)}] {rate:.1f} students/s, ETA {eta:.0f}s",
+                      file=progress, flush=True)
+
+    return {
+        'processed': processed - len(failures),
+        'skipped': len(students) - len(pending),
+        'failed': len(failures),
+        'failures': failures,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def main(argv=None):
+    """Command-line entry point for roster processing."""
+
+    parser = argparse.ArgumentParser(
+        description="Generate web options for every student in a roster.")
+    parser.add_argument("roster", help="CSV or XLSX with Rank, Gender, Category and Branches columns")
+    parser.add_argument("--output", default="roster_options.csv",
+                        help="Consolidated CSV of every student's options")
+    parser.add_argument("--per-student-dir",
+                        help="Also write one XLSX per student to this directory")
+    parser.add_argument("--phase", choices=list(PHASE_FILES), default="Final Phase")
+    parser.add_argument("--scenario", choices=SCENARIO_NAMES, default=BASELINE_SCENARIO)
+    parser.add_argument("--list-type", choices=COLLEGE_LIST_TYPES, default=COLLEGE_LIST_TYPES[0])
+    parser.add_argument("--chance-mode", choices=CHANCE_MODES, default=CHANCE_MODE_ABSOLUTE)
+    parser.add_argument("--buffer", type=int, default=1000)
+    parser.add_argument("--max-options", type=int, default=100,
+                        help="Options kept per student and list")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=25)
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip students already present in --output")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    try:
+        students, rejected = read_roster(args.roster)
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"Could not read roster: {e}")
+    for row_number, error in rejected:
+        print(f"Row {row_number} skipped: {error}", file=sys.stderr)
+
+    settings = {
+        'phase': args.phase, 'buffer': args.buffer, 'list_type': args.list_type,
+        'max_options': args.max_options, 'scenario': args.scenario,
+        'chance_mode': args.chance_mode,
+    }
+    result = run_roster(students, args.output, settings, args.per_student_dir,
+                        workers=args.workers, chunk_size=args.chunk_size, resume=args.resume)
+
+    for student_id, error in result['failures']:
+        print(f"Student {student_id} failed: {error}", file=sys.stderr)
+    print(f"Processed {result['processed']} students ({result['skipped']} already done, "
+          f"{result['failed']} failed, {len(rejected)} rejected rows) "
+          f"in {result['seconds']:.1f}s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Rank-inflation scenarios for the TS EAMCET College Predictor.
+
+Local/non-local quota changes for 2025 may push closing ranks up: a 1000 rank
+in 2024 may correspond to a 1500-2000 rank in 2025. A scenario multiplies the
+2024 closing ranks by a factor per caste category.
+
+Scenarios are applied through lazy views. A view wraps the loaded dataframe
+without copying it and only scales a category column when that column is
+asked for. The baseline scenario returns the stored column itself. Views are
+cached per phase, scenario and data snapshot, so a scaled column is computed
+once and reused by every query under that scenario.
+"""
+import numpy as np
+import pandas as pd
+
+from .cache import cached
+from .index import get_cutoff_index
+from .metrics import timed
+from .store import get_phase, snapshot_hash
+
+BASELINE_SCENARIO = "2024 Cutoffs (No Change)"
+
+# Scenario name -> {caste category or 'default': inflation factor}
+SCENARIOS = {
+    BASELINE_SCENARIO: {},
+    "Mild Inflation (1.25x)": {'default': 1.25},
+    "Quota Change Estimate (1.5x)": {'default': 1.5},
+    "Quota Change, Open Seats Hit Harder (OC/EWS 1.75x, others 1.5x)": {
+        'default': 1.5, 'OC': 1.75, 'EWS': 1.75},
+    "Severe Inflation (2x)": {'default': 2.0},
+}
+
+SCENARIO_NAMES = list(SCENARIOS.keys())
+
+SCENARIO_HELP = """
+Scale last year's closing ranks to estimate this year's cutoffs.
+Quota policy changes for 2025 may move a 2024 cutoff of 1000 to around 1500–2000.
+"""
+
+DEFAULT_SWEEP_FACTORS = tuple(np.round(np.arange(1.0, 2.01, 0.1), 2))
+
+
+def scenario_factor(scenario, column):
+    """
+    Inflation factor a scenario applies to one category column.
+
+    Args:
+        scenario (str): Scenario name from SCENARIOS
+        column (str): Category column (see get_caste_column_name)
+
+    Returns:
+        float: Multiplier on the column's closing ranks
+    """
+    factors = SCENARIOS.get(scenario, {})
+    caste = column.split()[0]
+    return float(factors.get(caste, factors.get('default', 1.0)))
+
+
+def scale_cutoffs(cutoffs, factor):
+    """
+    Closing ranks scaled by an inflation factor and rounded to whole ranks.
+
+    Rounding is monotonic, so sorted cutoffs stay sorted once scaled.
+
+    Args:
+        cutoffs (pandas.Series or numpy.ndarray): Closing ranks
+        factor (float): Inflation factor
+
+    Returns:
+        Same type as cutoffs (cutoffs itself when factor is 1)
+    """
+    return cutoffs if factor == 1.0 else (cutoffs * factor).round()
+
+
+class ScenarioView:
+    """Read-only view of a cutoff dataframe under a rank-inflation scenario."""
+
+    def __init__(self, df, scenario=BASELINE_SCENARIO):
+        """
+        Args:
+            df (pandas.DataFrame): Loaded phase data (not copied)
+            scenario (str): Scenario name from SCENARIOS
+        """
+        self.df = df
+        self.scenario = scenario
+        self._columns = {}
+
+    def factor(self, column):
+        """Inflation factor for a category column."""
+        return scenario_factor(self.scenario, column)
+
+    def cutoffs(self, column):
+        """
+        Closing ranks of a category column under the scenario.
+
+        The scaled column is computed on first access and kept for the
+        lifetime of the view; unscaled columns are returned as stored.
+
+        Args:
+            column (str): Category column
+
+        Returns:
+            pandas.Series: Closing ranks aligned with the dataframe index
+        """
+        if column not in self._columns:
+            self._columns[column] = scale_cutoffs(self.df[column], self.factor(column))
+        return self._columns[column]
+
+
+@cached(ttl=3600, shared=False)
+def build_scenario_view(phase, scenario, version):
+    """
+    Cached scenario view over a phase's data.
+
+    Args:
+        phase (str): Counseling phase
+        scenario (str): Scenario name from SCENARIOS
+        version (str): snapshot_hash() of the data the view wraps
+
+    Returns:
+        ScenarioView: The view, or None if the data could not be loaded
+    """
+    df = get_phase(phase)
+    if df is None:
+        return None
+    return ScenarioView(df, scenario)
+
+
+def get_scenario_view(phase, scenario=BASELINE_SCENARIO):
+    """
+    Scenario view over a phase's data for the current data snapshot.
+
+    Args:
+        phase (str): Counseling phase
+        scenario (str): Scenario name from SCENARIOS
+
+    Returns:
+        ScenarioView: The view (shared; do not modify), or None if the data
+            could not be loaded
+    """
+    return build_scenario_view(phase, scenario, snapshot_hash())
+
+
+@timed()
+def sweep_reachable(user_rank, column, factors=DEFAULT_SWEEP_FACTORS, phase="Final Phase"):
+    """
+    Reachable seats for a candidate across a grid of inflation factors.
+
+    A seat is reachable when its scaled closing rank (scale_cutoffs, as in
+    ScenarioView) is at or above the candidate's rank. Scaling keeps the
+    index sorted, so the reachable seats for every factor are a suffix of
+    it, found with one searchsorted per factor.
+
+    Args:
+        user_rank (int): Candidate's rank
+        column (str): Category column
+        factors (iterable): Inflation factors to evaluate
+        phase (str): Counseling phase
+
+    Returns:
+        tuple: (summary, seats) - a DataFrame with 'Inflation Factor' and
+            'Reachable Seats', and a dict mapping each factor to the row
+            positions (in load_phase order) of its reachable seats
+    """
+    order, sorted_cutoffs = get_cutoff_index(phase, column)
+    factors = np.asarray(factors, dtype=float)
+
+    starts = np.array([np.searchsorted(scale_cutoffs(sorted_cutoffs, factor), user_rank, side='left')
+                       for factor in factors], dtype=np.int64)
+    counts = len(sorted_cutoffs) - starts
+
+    summary = pd.DataFrame({
+        'Inflation Factor': factors,
+        'Reachable Seats': counts,
+    })
+    seats = {float(factor): order[start:]
+             for factor, start in zip(factors, starts)}
+    return summary, seats
@@ -0,0 +1,477 @@
+"""
+Second-level result cache shared between restarts and replicas.
+
+A TieredCache puts a byte store behind an in-process cache (usually the
+engine's MemoryCache). Lookups try the local cache first, then the store,
+and values found in the store are copied into the local cache. New results
+are written to both. Values are pickled and zlib-compressed, so any
+picklable result can be shared. Functions declared with
+``@cached(shared=False)`` stay local. The arguments of shared functions are
+part of the key, so they must be the same on every replica: a data version
+argument is snapshot_hash(), not data_version(), which is built from file
+modification times.
+
+Store keys are versioned: each one starts with the cache's namespace and a
+version built from KEY_SCHEMA, snapshot_hash() of the phase file contents
+and a fingerprint of the code producing the values. Changing the data or
+deploying new code therefore changes every key, and entries written for
+other data can never be served. Entries of old versions are never read
+again and age out through the store's size limit or TTL.
+
+Three stores are provided, selected by the RESULT_CACHE_URL setting:
+
+- ``sqlite:///path/to/results.db``: SQLiteStore, a file on local disk that
+  survives restarts, capped at RESULT_CACHE_MB with least-recently-used
+  eviction. Processes on one machine can share the file.
+- ``redis://host:6379/0``: RedisStore, shared by every replica. The size
+  limit is the server's maxmemory with an allkeys-lru policy. Needs the
+  redis package.
+- ``memory://``: InMemoryStore, an in-process stand-in for the network store
+  in tests and benchmarks.
+
+Store failures never fail a request: the lookup counts as a miss and the
+store is skipped for RETRY_SECONDS before it is tried again.
+"""
+import functools
+import hashlib
+import importlib
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+from .cache import (
+    MISSING, CacheStats, get_cache_backend, is_shared, set_cache_backend, track
+)
+from .store import snapshot_hash
+
+logger = logging.getLogger(__name__)
+
+RESULT_CACHE_URL = os.getenv('RESULT_CACHE_URL') or None
+RESULT_CACHE_BYTES = int(float(os.getenv('RESULT_CACHE_MB', '512')) * 1024 * 1024)
+# Bump when the layout of stored values changes
+KEY_SCHEMA = 1
+MAX_ITEM_BYTES = 16 * 1024 * 1024
+RETRY_SECONDS = 30.0
+HEALTH_KEY = "health:check"
+COMPRESS_LEVEL = 1
+# SQLiteStore recounts the file (and drops expired entries) after this many writes
+SQLITE_TRIM_INTERVAL = 256
+
+
+@functools.lru_cache(maxsize=None)
+def code_fingerprint(*packages):
+    """
+    Digest of the Python sources of some packages and the pandas version.
+
+    Results written by other code, or pickled by another pandas, get other
+    keys.
+
+    Args:
+        *packages (str): Package names, e.g. "engine"
+
+    Returns:
+        str: 12-character hex digest
+    """
+    digest = hashlib.sha1(pd.__version__.encode())
+    for package in packages:
+        directory = os.path.dirname(importlib.import_module(package).__file__)
+        for name in sorted(os.listdir(directory)):
+            if name.endswith('.py'):
+                digest.update(name.encode())
+                with open(os.path.join(directory, name), 'rb') as f:
+                    digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def engine_version():
+    """Key version of engine results: schema, data snapshot and engine code."""
+    return f"{KEY_SCHEMA}.{snapshot_hash()}.{code_fingerprint('engine')}"
+
+
+def _stable(value):
+    # Sets iterate in hash order, which differs between processes
+    if isinstance(value, frozenset):
+        return ('frozenset', tuple(sorted((_stable(v) for v in value), key=repr)))
+    if isinstance(value, tuple):
+        return tuple(_stable(v) for v in value)
+    return value
+
+
+def key_digest(key):
+    """Digest of a frozen cache key that is the same in every process."""
+    return hashlib.sha256(repr(_stable(key)).encode()).hexdigest()
+
+
+class SQLiteStore:
+    """
+    Byte store in an SQLite file with TTLs and a least-recently-used size cap.
+
+    Reads record their access time. Each store keeps a running total of the
+    bytes in the file, counted from the database when it is opened or
+    trimmed and increased by its own writes. When the total passes
+    max_bytes, expired entries and then the least recently read ones are
+    deleted until the file holds at most max_bytes of values. The total is
+    also recounted every SQLITE_TRIM_INTERVAL writes, to pick up writes of
+    other processes; the database runs in WAL mode, so several can share it.
+    """
+
+    def __init__(self, path, max_bytes=RESULT_CACHE_BYTES):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.name = f"sqlite:{os.path.basename(path)}"
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=5.0, isolation_level=None,
+                                   check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB,"
+                         " size INTEGER, expires_at REAL, accessed_at REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires_at)")
+        self._bytes = self._total()
+        self._writes = 0
+
+    def get(self, key):
+        """Stored bytes for key, or None."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT value, expires_at FROM entries WHERE key = ?",
+                                   (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] < now:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def set(self, key, data, ttl=None):
+        """Store bytes under key for ttl seconds (until evicted if ttl is None)."""
+        now = time.time()
+        expires_at = None if ttl is None else now + ttl
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                             (key, sqlite3.Binary(data), len(data), expires_at, now))
+            # Replacing an entry overcounts, which only makes the next trim come sooner
+            self._bytes += len(data)
+            self._writes += 1
+            if self._bytes > self.max_bytes or self._writes >= SQLITE_TRIM_INTERVAL:
+                self._trim(now)
+
+    def _trim(self, now):
+        # Caller holds the lock
+        self._writes = 0
+        self._db.execute("DELETE FROM entries WHERE expires_at < ?", (now,))
+        self._bytes = self._total()
+        excess = self._bytes - self.max_bytes
+        if excess <= 0:
+            return
+        victims = []
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._db.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self._bytes = self.max_bytes + excess
+
+    def clear(self, prefix=""):
+        """Delete every entry whose key starts with prefix."""
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE substr(key, 1, ?) = ?",
+                             (len(prefix), prefix))
+            self._bytes = self._total()
+
+    def _total(self):
+        return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    @property
+    def nbytes(self):
+        """Total size of the stored values."""
+        with self._lock:
+            return self._total()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+class RedisStore:
+    """Byte store on a Redis server shared by every replica."""
+
+    def __init__(self, url, prefix="eamcet:", timeout=0.5):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("RESULT_CACHE_URL points to Redis; install the redis package") from e
+        self.name = f"redis:{urlsplit(url).hostname}"
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url, socket_timeout=timeout,
+                                           socket_connect_timeout=timeout)
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, data, ttl=None):
+        self.client.set(self.prefix + key, data, px=None if ttl is None else int(ttl * 1000))
+
+    def clear(self, prefix=""):
+        keys = list(self.client.scan_iter(match=f"{self.prefix}{prefix}*", count=1000))
+        for start in range(0, len(keys), 1000):
+            self.client.delete(*keys[start:start + 1000])
+
+
+class InMemoryStore:
+    """
+    In-process stand-in for a network store, with the same interface.
+
+    Two TieredCaches over one InMemoryStore behave like two replicas sharing
+    a server.
+    """
+
+    def __init__(self, max_bytes=RESULT_CACHE_BYTES):
+        self.name = "memory"
+        self.max_bytes = max_bytes
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            data, expires_at = item
+            if expires_at is not None and expires_at < time.time():
+                del self._data[key]
+                return None
+            # Reinsert, so iteration order is least recently used first
+            self._data[key] = self._data.pop(key)
+            return data
+
+    def set(self, key, data, ttl=None):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (data, None if ttl is None else time.time() + ttl)
+            while self.nbytes > self.max_bytes:
+                del self._data[next(iter(self._data))]
+
+    def clear(self, prefix=""):
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefix)]:
+                del self._data[key]
+
+    @property
+    def nbytes(self):
+        return sum(len(data) for data, _ in self._data.values())
+
+    def __len__(self):
+        return len(self._data)
+
+
+def open_store(url, max_bytes=RESULT_CACHE_BYTES):
+    """
+    Store for a RESULT_CACHE_URL.
+
+    Raises:
+        ValueError: If the URL scheme is not sqlite, redis(s) or memory
+    """
+    parts = urlsplit(url)
+    if parts.scheme == "sqlite":
+        # sqlite:///relative.db and sqlite:////absolute/path.db
+        return SQLiteStore(url[len("sqlite:///"):], max_bytes)
+    if parts.scheme in ("redis", "rediss"):
+        return RedisStore(url)
+    if parts.scheme == "memory":
+        return InMemoryStore(max_bytes)
+    raise ValueError(f"Unsupported RESULT_CACHE_URL scheme: {parts.scheme!r}")
+
+
+class TieredCache:
+    """
+    Cache backend reading through a local cache to a shared byte store.
+
+    Has the get/set/clear/stats interface of MemoryCache, so it can be
+    installed with set_cache_backend or used in place of a named cache.
+    stats() reports the store level per function as "<store>:<function>".
+    """
+
+    def __init__(self, local, store, version=engine_version):
+        """
+        Args:
+            local: In-process cache (MemoryCache) tried first
+            store: Byte store with get(key), set(key, data, ttl) and clear(prefix)
+            version (callable): Returns the current key version
+        """
+        self.local = local
+        self.store = store
+        self.version = version
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._down_until = 0.0
+        track(self)
+
+    def _namespace(self, key):
+        return getattr(self.local, 'name', None) or (
+            key[0] if isinstance(key, tuple) and key else "-")
+
+    def _count(self, namespace, counter):
+        with self._lock:
+            stats = self._stats.get(namespace)
+            if stats is None:
+                stats = self._stats[namespace] = CacheStats()
+            setattr(stats, counter, getattr(stats, counter) + 1)
+
+    def _available(self, namespace):
+        return is_shared(namespace) and time.monotonic() >= self._down_until
+
+    def _failed(self, action, error):
+        if time.monotonic() >= self._down_until:
+            logger.warning(f"Shared cache {self.store.name} {action} failed, "
+                           f"skipping it for {RETRY_SECONDS:.0f}s: {error}")
+        self._down_until = time.monotonic() + RETRY_SECONDS
+
+    def store_key(self, key):
+        """Versioned store key of a cache key."""
+        return f"{self._namespace(key)}:{self.version()}:{key_digest(key)}"
+
+    def get(self, key):
+        """Cached value for key, or MISSING."""
+        value = self.local.get(key)
+        namespace = self._namespace(key)
+        if value is not MISSING or not self._available(namespace):
+            return value
+        try:
+            data = self.store.get(self.store_key(key))
+            if data is None:
+                self._count(namespace, 'misses')
+                return MISSING
+            ttl, value = pickle.loads(zlib.decompress(data))
+        except Exception as e:
+            self._failed("read", e)
+            return MISSING
+        self._count(namespace, 'hits')
+        self.local.set(key, value, ttl)
+        return value
+
+    def set(self, key, value, ttl=None):
+        """Store value in the local cache and, unless it stays local, in the store."""
+        self.local.set(key, value, ttl)
+        namespace = self._namespace(key)
+        if not self._available(namespace):
+            return
+        try:
+            data = zlib.compress(pickle.dumps((ttl, value), pickle.HIGHEST_PROTOCOL),
+                                 COMPRESS_LEVEL)
+        except Exception:
+            # Not picklable (e.g. generators or mappingproxy): keep it local
+            self._count(namespace, 'rejections')
+            return
+        if len(data) > MAX_ITEM_BYTES:
+            self._count(namespace, 'rejections')
+            return
+        try:
+            self.store.set(self.store_key(key), data, ttl)
+        except Exception as e:
+            self._failed("write", e)
+
+    def clear(self, namespace=None):
+        """Drop every entry, or those of one cached function, from both levels."""
+        self.local.clear(namespace)
+        try:
+            self.store.clear("" if namespace is None else f"{namespace}:")
+        except Exception as e:
+            self._failed("clear", e)
+
+    def health(self):
+        """
+        Round trip of one store lookup.
+
+        Returns:
+            dict: store name, ok, latency_ms, error (or None) and whether the
+                store is currently skipped after a failure
+        """
+        start = time.perf_counter()
+        try:
+            self.store.get(HEALTH_KEY)
+            error = None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        return {'store': self.store.name, 'ok': error is None,
+                'latency_ms': round(1000 * (time.perf_counter() - start), 3), 'error': error,
+                'skipped': time.monotonic() < self._down_until}
+
+    def stats(self):
+        """
+        Store-level statistics per cached function.
+
+        Returns:
+            dict: "<store>:<namespace>" -> CacheStats (copies)
+        """
+        with self._lock:
+            return {f"{self.store.name}:{namespace}": stats.copy()
+                    for namespace, stats in self._stats.items()}
+
+    @property
+    def nbytes(self):
+        """Approximate size of the local level."""
+        return getattr(self.local, 'nbytes', 0)
+
+    def __len__(self):
+        return len(self.local)
+
+
+_store = MISSING
+_store_lock = threading.Lock()
+
+
+def get_shared_store():
+    """
+    The process-wide store configured by RESULT_CACHE_URL, opened on first use.
+
+    Returns:
+        The store, or None if none is configured or it cannot be opened
+    """
+    global _store
+    with _store_lock:
+        if _store is MISSING:
+            _store = None
+            if RESULT_CACHE_URL:
+                try:
+                    _store = open_store(RESULT_CACHE_URL)
+                except Exception as e:
+                    logger.error(f"Shared result cache disabled: {e}")
+        return _store
+
+
+def tiered(local, version=engine_version):
+    """local behind a TieredCache over the shared store, or local itself without one."""
+    store = get_shared_store()
+    return local if store is None else TieredCache(local, store, version)
+
+
+def install_shared_cache():
+    """
+    Put the shared store behind the engine cache backend.
+
+    Does nothing without a store or when it is already installed.
+
+    Returns:
+        TieredCache: The engine backend, or None without a shared store
+    """
+    backend = get_cache_backend()
+    if isinstance(backend, TieredCache):
+        return backend
+    if get_shared_store() is None:
+        return None
+    backend = tiered(backend)
+    set_cache_backend(backend)
+    return backend
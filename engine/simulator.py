@@ -0,0 +1,536 @@
+"""
+Counselling seat-allotment simulator for the TS EAMCET College Predictor.
+
+Runs a deferred-acceptance allotment over a synthetic candidate population.
+Every seat ranks candidates by their EAMCET rank, so deferred acceptance
+gives the same allotment as serial dictatorship. Candidates are processed in
+rank order in vectorized blocks: allotments of earlier blocks are final, and
+within a block seats are held tentatively, so a better rank proposing later
+displaces the worst holder. serial_dictatorship is a plain loop over
+candidates that the blocked version can be checked against (--check).
+Each (seat, category column) pair is a separate program whose capacity comes
+from a seat matrix. The closing rank of a program is the largest rank allotted
+to it, which matches the layout of the phase CSVs.
+
+Usage:
+    python -m engine.simulator --rounds 3 --output simulated.csv
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from .constants import CATEGORY_COLUMNS, CASTE_CATEGORIES, get_caste_column_name
+from .metrics import timed
+from .store import get_phase
+
+SEAT_ID_COLUMNS = ['Inst Code', 'Branch Code']
+SEAT_KEY_COLUMNS = ['Inst Code', 'Institute Name', 'Branch Code']
+
+# TS EAPCET reservation shares of the intake; open competition gets the rest.
+RESERVATION_SHARES = {
+    'BC_A': 0.07, 'BC_B': 0.10, 'BC_C': 0.01, 'BC_D': 0.07, 'BC_E': 0.04,
+    'SC': 0.15, 'ST': 0.10, 'EWS': 0.10
+}
+WOMEN_SHARE = 1 / 3
+
+# Approximate share of each category in the candidate population
+POPULATION_SHARES = {
+    'OC': 0.20, 'BC_A': 0.10, 'BC_B': 0.18, 'BC_C': 0.01, 'BC_D': 0.17,
+    'BC_E': 0.05, 'SC': 0.14, 'ST': 0.07, 'EWS': 0.08
+}
+FEMALE_SHARE = 0.45
+
+# Intake per seat when no seat matrix is given. Calibrated so simulated open
+# closing ranks land near the 2024 final phase for a 200k population.
+DEFAULT_INTAKE = 120
+
+PREFERENCE_MODELS = ["Popularity", "Branch First", "College First"]
+
+CSE_GROUP_PREFIXES = ('CS', 'AI', 'INF', 'CE', 'CIC')
+
+# Column order used when a candidate is eligible for several columns: open
+# merit first, then the candidate's own reserved category.
+_COLUMN_INDEX = {col: i for i, col in enumerate(CATEGORY_COLUMNS)}
+
+
+def build_seat_matrix(df, intake=DEFAULT_INTAKE, reservation_shares=None, women_share=WOMEN_SHARE):
+    """
+    Build a seat matrix from the seats listed in a phase dataframe.
+
+    Args:
+        df (pandas.DataFrame): Cleaned phase data (one row per college branch)
+        intake (int or array-like): Sanctioned intake of every seat
+        reservation_shares (dict, optional): Caste category -> share of intake
+        women_share (float): Share of each category reserved for girls
+
+    Returns:
+        pandas.DataFrame: Seat keys plus one seat-count column per category
+    """
+    shares = dict(RESERVATION_SHARES if reservation_shares is None else reservation_shares)
+    shares['OC'] = max(0.0, 1.0 - sum(shares.values()))
+
+    matrix = df[SEAT_KEY_COLUMNS].reset_index(drop=True).copy()
+    intake = np.broadcast_to(np.asarray(intake, dtype=float), (len(matrix),))
+
+    for caste in CASTE_CATEGORIES:
+        seats = intake * shares.get(caste, 0.0)
+        girls = np.round(seats * women_share)
+        matrix[get_caste_column_name('Male', caste)] = (
+            np.round(seats) - girls).astype(int)
+        matrix[get_caste_column_name('Female', caste)] = girls.astype(int)
+
+    return matrix
+
+
+def load_seat_matrix(path):
+    """
+    Load a seat matrix CSV written by save_seat_matrix (or edited by hand).
+
+    Args:
+        path (str): Path to the CSV file
+
+    Returns:
+        pandas.DataFrame: Seat matrix with integer seat counts
+    """
+    matrix = pd.read_csv(path)
+    missing = [col for col in SEAT_KEY_COLUMNS +
+               CATEGORY_COLUMNS if col not in matrix.columns]
+    if missing:
+        raise ValueError(f"Seat matrix is missing columns: {missing}")
+    matrix[CATEGORY_COLUMNS] = matrix[CATEGORY_COLUMNS].fillna(0).astype(int)
+    return matrix
+
+
+def save_seat_matrix(matrix, path):
+    """Write a seat matrix to CSV."""
+    matrix[SEAT_KEY_COLUMNS + CATEGORY_COLUMNS].to_csv(path, index=False)
+
+
+def generate_population(size=200000, population_shares=None, female_share=FEMALE_SHARE, seed=None):
+    """
+    Generate a synthetic candidate population with ranks 1..size.
+
+    Args:
+        size (int): Number of candidates
+        population_shares (dict, optional): Caste category -> share of candidates
+        female_share (float): Share of female candidates
+        seed (int, optional): Random seed
+
+    Returns:
+        dict: 'rank', 'caste' (index into CASTE_CATEGORIES) and 'female' arrays
+    """
+    rng = np.random.default_rng(seed)
+    shares = population_shares or POPULATION_SHARES
+    weights = np.array([shares.get(c, 0.0)
+                       for c in CASTE_CATEGORIES], dtype=float)
+    return {
+        'rank': np.arange(1, size + 1, dtype=np.int64),
+        'caste': rng.choice(len(CASTE_CATEGORIES), size=size, p=weights / weights.sum()).astype(np.int8),
+        'female': rng.random(size) < female_share,
+    }
+
+
+def eligible_columns(castes, female):
+    """
+    Category columns each candidate may be allotted under, in preference order.
+
+    Args:
+        castes (numpy.ndarray): Caste index of each candidate
+        female (numpy.ndarray): Whether each candidate is female
+
+    Returns:
+        numpy.ndarray: (n, 4) column indices, -1 where not eligible
+    """
+    # One lookup row per (caste, female) group
+    table = np.full((len(CASTE_CATEGORIES), 2, 4), -1, dtype=np.int16)
+    for c, caste in enumerate(CASTE_CATEGORIES):
+        for is_female, gender in ((0, 'Male'), (1, 'Female')):
+            columns = ['OC BOYS']
+            if is_female:
+                columns.append('OC GIRLS')
+            if caste != 'OC':
+                columns.append(get_caste_column_name('Male', caste))
+                if is_female:
+                    columns.append(get_caste_column_name('Female', caste))
+            table[c, is_female, :len(columns)] = [
+                _COLUMN_INDEX[col] for col in columns]
+    return table[castes, female.astype(np.int8)]
+
+
+def seat_preference_scores(df, model="Popularity"):
+    """
+    Attractiveness score of every seat under a preference model.
+
+    Args:
+        df (pandas.DataFrame): Phase data used as the seat list
+        model (str): One of PREFERENCE_MODELS
+
+    Returns:
+        numpy.ndarray: Score per seat (higher is more desirable)
+    """
+    reference = df['OC BOYS'].to_numpy(dtype=float)
+    reference = np.where(np.isnan(reference), np.nanmax(
+        reference) if np.isfinite(reference).any() else 1.0, reference)
+    popularity = -np.log(np.maximum(reference, 1.0))
+    popularity = (popularity - popularity.min()) / \
+        max(np.ptp(popularity), 1e-9)
+
+    if model == "Popularity":
+        return popularity
+
+    branches = df['Branch Code'].astype(str).str.upper()
+    branch_score = np.where(branches.str.startswith(CSE_GROUP_PREFIXES), 1.0,
+                            np.where(branches == 'ECE', 0.6, 0.2))
+    college_score = df.groupby('Institute Name')['OC BOYS'].transform('min')
+    college_score = -np.log(np.maximum(college_score.fillna(
+        np.nanmax(reference)).to_numpy(dtype=float), 1.0))
+    college_score = (college_score - college_score.min()) / \
+        max(np.ptp(college_score), 1e-9)
+
+    if model == "Branch First":
+        return 0.7 * branch_score + 0.3 * popularity
+    if model == "College First":
+        return 0.7 * college_score + 0.3 * popularity
+    raise ValueError(f"Unknown preference model: {model}")
+
+
+def generate_preferences(population, df, model="Popularity", list_length=30, noise=0.15,
+                         ambition=0.8, bands=25, seed=None):
+    """
+    Draw a ranked list of seats for every candidate.
+
+    Seats are sampled by attractiveness, down-weighting seats whose 2024 open
+    closing rank is far better than the candidate's rank, then each list is
+    sorted by the candidate's noisy utility.
+
+    Args:
+        population (dict): Output of generate_population
+        df (pandas.DataFrame): Phase data used as the seat list
+        model (str): One of PREFERENCE_MODELS
+        list_length (int): Options listed by each candidate
+        noise (float): Spread of individual taste around the common score
+        ambition (float): Seats with reference cutoff below rank * ambition are rarely listed
+        bands (int): Number of rank bands sharing a sampling distribution
+        seed (int, optional): Random seed
+
+    Returns:
+        numpy.ndarray: (n, list_length) seat indices in preference order, -1 padded
+    """
+    rng = np.random.default_rng(seed)
+    scores = seat_preference_scores(df, model)
+    reference = df['OC BOYS'].to_numpy(dtype=float)
+    reference = np.where(np.isnan(reference), np.inf, reference)
+    ranks = population['rank']
+    n = len(ranks)
+    n_seats = len(scores)
+    list_length = min(list_length, n_seats)
+
+    preferences = np.empty((n, list_length), dtype=np.int32)
+    edges = np.linspace(0, n, bands + 1).astype(int)
+    base = np.exp(scores / 0.25)
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi <= lo:
+            continue
+        band_rank = ranks[lo]
+        weights = base * np.where(reference >= band_rank * ambition, 1.0, 0.02)
+        draws = rng.choice(n_seats, size=(hi - lo, list_length), p=weights / weights.sum())
+        utility = scores[draws] + noise * rng.standard_normal(draws.shape)
+
+        # Drop duplicate draws, then order each list by the candidate's utility
+        by_seat = np.argsort(draws, axis=1, kind='stable')
+        sorted_draws = np.take_along_axis(draws, by_seat, axis=1)
+        duplicate = np.zeros_like(sorted_draws, dtype=bool)
+        duplicate[:, 1:] = sorted_draws[:, 1:] == sorted_draws[:, :-1]
+        np.put_along_axis(utility, by_seat, np.where(
+            duplicate, -np.inf, np.take_along_axis(utility, by_seat, axis=1)), axis=1)
+
+        order = np.argsort(-utility, axis=1, kind='stable')
+        band = np.take_along_axis(draws, order, axis=1)
+        band[np.isneginf(np.take_along_axis(utility, order, axis=1))] = -1
+        preferences[lo:hi] = band
+
+    return preferences
+
+
+def run_allotment(population, preferences, capacity, block_size=4096):
+    """
+    Allot seats by deferred acceptance with rank as the common priority.
+
+    Within a block, unplaced candidates propose to their next open program;
+    each program keeps its best-ranked proposers up to its seats and rejects
+    the rest, until no one is left to propose.
+
+    Args:
+        population (dict): Output of generate_population (sorted by rank)
+        preferences (numpy.ndarray): (n, L) seat indices, -1 padded
+        capacity (numpy.ndarray): (n_seats, 18) seats per category column
+        block_size (int): Candidates processed per vectorized block
+
+    Returns:
+        tuple: (program allotted to each candidate or -1, remaining capacity)
+            where program = seat * 18 + column
+    """
+    n_columns = len(CATEGORY_COLUMNS)
+    remaining = np.asarray(capacity, dtype=np.int64).reshape(-1).copy()
+    ranks = population['rank']
+    columns = eligible_columns(population['caste'], population['female'])
+    allotted = np.full(len(ranks), -1, dtype=np.int64)
+
+    for start in range(0, len(ranks), block_size):
+        stop = min(start + block_size, len(ranks))
+        seats = preferences[start:stop].astype(np.int64)
+        cols = columns[start:stop].astype(np.int64)
+
+        # Expand each listed seat over the candidate's eligible columns
+        programs = seats[:, :, None] * n_columns + cols[:, None, :]
+        programs[(seats[:, :, None] < 0) | (cols[:, None, :] < 0)] = -1
+        programs = programs.reshape(len(seats), -1)
+        valid = programs >= 0
+
+        block_ranks = ranks[start:stop]
+        width = programs.shape[1]
+
+        # Capacity is fixed while the block runs, so full programs can be
+        # skipped up front: next_open[i, j] is the first open option >= j
+        open_mask = valid & (remaining[np.where(valid, programs, 0)] > 0)
+        positions = np.where(open_mask, np.arange(width), width)
+        next_open = np.minimum.accumulate(positions[:, ::-1], axis=1)[:, ::-1]
+        next_open = np.hstack([next_open, np.full((len(seats), 1), width)])
+
+        pointer = next_open[:, 0].copy()
+        held = np.full(len(seats), -1, dtype=np.int64)
+        while True:
+            proposing = np.flatnonzero((held < 0) & (pointer < width))
+            if len(proposing) == 0:
+                break
+            held[proposing] = programs[proposing, pointer[proposing]]
+
+            # Best ranks keep each program, up to its seats; the rest move on
+            idx = np.flatnonzero(held >= 0)
+            order = np.lexsort((block_ranks[idx], held[idx]))
+            idx = idx[order]
+            choice = held[idx]
+            group_start = np.flatnonzero(np.r_[True, choice[1:] != choice[:-1]])
+            group_sizes = np.diff(np.r_[group_start, len(choice)])
+            position = np.arange(len(choice)) - np.repeat(group_start, group_sizes)
+            rejected = idx[position >= remaining[choice]]
+            held[rejected] = -1
+            pointer[rejected] = next_open[rejected, pointer[rejected] + 1]
+
+        placed = np.flatnonzero(held >= 0)
+        allotted[start + placed] = held[placed]
+        np.subtract.at(remaining, held[placed], 1)
+
+    return allotted, remaining.reshape(-1, n_columns)
+
+
+def serial_dictatorship(population, preferences, capacity):
+    """
+    Reference allotment: each candidate in rank order takes their first open program.
+
+    Slow (a Python loop over candidates); used to check run_allotment.
+
+    Args:
+        population (dict): Output of generate_population
+        preferences (numpy.ndarray): (n, L) seat indices, -1 padded
+        capacity (numpy.ndarray): (n_seats, 18) seats per category column
+
+    Returns:
+        tuple: (program allotted to each candidate or -1, remaining capacity)
+    """
+    n_columns = len(CATEGORY_COLUMNS)
+    remaining = np.asarray(capacity, dtype=np.int64).reshape(-1).copy()
+    columns = eligible_columns(population['caste'], population['female'])
+    allotted = np.full(len(population['rank']), -1, dtype=np.int64)
+    for i in np.argsort(population['rank'], kind='stable'):
+        eligible = [int(c) for c in columns[i] if c >= 0]
+        for seat in preferences[i]:
+            if seat < 0:
+                continue
+            program = next((int(seat) * n_columns + c for c in eligible
+                            if remaining[int(seat) * n_columns + c] > 0), None)
+            if program is not None:
+                allotted[i] = program
+                remaining[program] -= 1
+                break
+    return allotted, remaining.reshape(-1, n_columns)
+
+
+def closing_ranks(population, allotted, n_seats):
+    """
+    Largest allotted rank per (seat, category column).
+
+    Args:
+        population (dict): Output of generate_population
+        allotted (numpy.ndarray): Program allotted to each candidate or -1
+        n_seats (int): Number of seats
+
+    Returns:
+        numpy.ndarray: (n_seats, 18) closing ranks, NaN where nobody was allotted
+    """
+    n_columns = len(CATEGORY_COLUMNS)
+    closing = np.zeros(n_seats * n_columns, dtype=np.int64)
+    placed = allotted >= 0
+    np.maximum.at(closing, allotted[placed], population['rank'][placed])
+    closing = closing.astype(float)
+    closing[closing == 0] = np.nan
+    return closing.reshape(n_seats, n_columns)
+
+
+@timed()
+def simulate_counselling(df, seat_matrix=None, population_size=200000, rounds=3,
+                         model="Popularity", list_length=30, noise=0.15, ambition=0.8,
+                         withdrawal_rate=0.15, seat_scale=1.0, intake=DEFAULT_INTAKE, seed=None,
+                         check=False):
+    """
+    Simulate several counselling rounds and report closing ranks per round.
+
+    Between rounds a share of allotted candidates withdraw (join elsewhere or
+    do not report). The next round re-runs the allotment for everyone still
+    in the process, so remaining candidates can slide up to better seats.
+
+    Args:
+        df (pandas.DataFrame): Phase data used as the seat list
+        seat_matrix (pandas.DataFrame, optional): Seat counts per category; built
+            from intake and RESERVATION_SHARES when omitted
+        population_size (int): Number of synthetic candidates
+        rounds (int): Number of counselling rounds
+        model (str): One of PREFERENCE_MODELS
+        list_length (int): Options listed by each candidate
+        noise (float): Spread of individual taste
+        ambition (float): How far above their reach candidates list seats
+        withdrawal_rate (float): Share of allotted candidates leaving after each round
+        seat_scale (float): Multiplier on every seat count (quota changes)
+        intake (int): Intake per seat when no seat matrix is given
+        seed (int, optional): Random seed
+        check (bool): Also run serial_dictatorship each round and count the
+            candidates whose allotment differs (slow)
+
+    Returns:
+        dict: 'rounds' (list of DataFrames in the phase CSV layout),
+            'allotted' (candidates placed per round), 'mismatches' (per
+            round, when check is set) and 'seconds'
+    """
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    seats = df.reset_index(drop=True)
+
+    if seat_matrix is None:
+        seat_matrix = build_seat_matrix(seats, intake=intake)
+    capacity = seats[SEAT_ID_COLUMNS].merge(
+        seat_matrix[SEAT_ID_COLUMNS + CATEGORY_COLUMNS], on=SEAT_ID_COLUMNS, how='left'
+    )[CATEGORY_COLUMNS].fillna(0).to_numpy(dtype=float)
+    capacity = np.round(capacity * seat_scale).astype(np.int64)
+
+    population = generate_population(population_size, seed=rng.integers(2**32))
+    preferences = generate_preferences(population, seats, model=model, list_length=list_length,
+                                       noise=noise, ambition=ambition, seed=rng.integers(2**32))
+
+    info_columns = [col for col in ['Inst Code', 'Institute Name', 'Place', 'Dist Code',
+                                    'Branch Code', 'Branch Name'] if col in seats.columns]
+    results = []
+    placed_counts = []
+    mismatches = []
+    in_process = np.ones(population_size, dtype=bool)
+    for _ in range(max(1, rounds)):
+        pool = {key: values[in_process] for key, values in population.items()}
+        allotted, _ = run_allotment(pool, preferences[in_process], capacity)
+        if check:
+            reference, _ = serial_dictatorship(pool, preferences[in_process], capacity)
+            mismatches.append(int((reference != allotted).sum()))
+
+        round_df = seats[info_columns].copy()
+        round_df[CATEGORY_COLUMNS] = closing_ranks(pool, allotted, len(seats))
+        results.append(round_df)
+        placed_counts.append(int((allotted >= 0).sum()))
+
+        leaving = (allotted >= 0) & (rng.random(len(allotted)) < withdrawal_rate)
+        in_process[np.flatnonzero(in_process)[leaving]] = False
+
+    return {
+        'rounds': results,
+        'allotted': placed_counts,
+        'mismatches': mismatches,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def compare_with_phase(simulated, actual, column='OC BOYS'):
+    """
+    Compare simulated closing ranks with a published phase for one column.
+
+    Args:
+        simulated (pandas.DataFrame): One round from simulate_counselling
+        actual (pandas.DataFrame): Phase data from engine.store
+        column (str): Category column to compare
+
+    Returns:
+        pandas.DataFrame: Seat keys with actual, simulated and ratio columns
+    """
+    merged = actual[SEAT_KEY_COLUMNS + [column]].merge(
+        simulated[SEAT_ID_COLUMNS + [column]],
+        on=SEAT_ID_COLUMNS, how='inner', suffixes=(' (2024)', ' (Simulated)')
+    )
+    merged['Ratio'] = merged[f"{column} (Simulated)"] / \
+        merged[f"{column} (2024)"]
+    return merged
+
+
+def main(argv=None):
+    """Command-line entry point for offline simulations."""
+
+    parser = argparse.ArgumentParser(
+        description="Simulate TS EAMCET counselling rounds and write closing ranks.")
+    parser.add_argument("--phase", default="Final Phase",
+                        help="Phase data used as the seat list")
+    parser.add_argument("--seat-matrix",
+                        help="Seat matrix CSV (built from intake when omitted)")
+    parser.add_argument("--write-seat-matrix",
+                        help="Write the seat matrix used to this CSV")
+    parser.add_argument("--population", type=int, default=200000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--model", choices=PREFERENCE_MODELS,
+                        default="Popularity")
+    parser.add_argument("--list-length", type=int, default=30)
+    parser.add_argument("--withdrawal-rate", type=float, default=0.15)
+    parser.add_argument("--seat-scale", type=float, default=1.0)
+    parser.add_argument("--intake", type=int, default=DEFAULT_INTAKE)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--check", action="store_true",
+                        help="Compare every round with a plain serial-dictatorship loop (slow)")
+    parser.add_argument("--output", default="simulated_closing_ranks.csv",
+                        help="CSV for the last round; earlier rounds get a _roundN suffix")
+    args = parser.parse_args(argv)
+
+    df = get_phase(args.phase)
+    if df is None:
+        raise SystemExit(f"Could not load {args.phase} data")
+
+    seat_matrix = load_seat_matrix(
+        args.seat_matrix) if args.seat_matrix else build_seat_matrix(df, intake=args.intake)
+    if args.write_seat_matrix:
+        save_seat_matrix(seat_matrix, args.write_seat_matrix)
+
+    result = simulate_counselling(
+        df, seat_matrix=seat_matrix, population_size=args.population, rounds=args.rounds,
+        model=args.model, list_length=args.list_length, withdrawal_rate=args.withdrawal_rate,
+        seat_scale=args.seat_scale, seed=args.seed, check=args.check
+    )
+
+    for i, round_df in enumerate(result['rounds'], 1):
+        path = args.output if i == len(result['rounds']) else args.output.replace(
+            '.csv', f'_round{i}.csv')
+        round_df.to_csv(path, index=False)
+        print(f"Round {i}: {result['allotted'][i - 1]} candidates allotted -> {path}")
+    print(f"Simulated {args.rounds} rounds in {result['seconds']:.2f}s")
+    if args.check:
+        print(f"Candidates allotted differently from serial dictatorship per round: "
+              f"{result['mismatches']}")
+        if any(result['mismatches']):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Cutoff data store: loading and cleaning of the phase CSV files.
+"""
+import hashlib
+import logging
+import os
+
+import pandas as pd
+
+from .cache import cached
+from .constants import PHASE_FILES
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class DataLoadError(Exception):
+    """Raised when a phase's data cannot be read."""
+
+
+def resolve_data_path(file_path):
+    """Path of a data file, relative to the working directory or the project root."""
+    if file_path is None or os.path.isabs(file_path) or os.path.exists(file_path):
+        return file_path
+    return os.path.join(PROJECT_ROOT, file_path)
+
+
+@cached(ttl=3600, shared=False)
+def load_phase(phase_selection):
+    """
+    Load and clean the data for a counseling phase.
+
+    Args:
+        phase_selection (str): The counseling phase to load data for
+
+    Returns:
+        pandas.DataFrame: The cleaned data (shared; do not modify)
+
+    Raises:
+        DataLoadError: If the data cannot be read
+    """
+    file_path = resolve_data_path(PHASE_FILES.get(phase_selection))
+
+    # If file doesn't exist, try to use the data in the current session
+    if file_path is None or not os.path.exists(file_path):
+        try:
+            return pd.read_csv("paste.txt", delimiter="\t")
+        except Exception as e:
+            raise DataLoadError(f"Error loading data: {e}") from e
+
+    try:
+        df = pd.read_csv(file_path, skipinitialspace=True)
+        return clean_dataframe(df)
+    except Exception as e:
+        raise DataLoadError(
+            f"Error loading data from {file_path}: {e}") from e
+
+
+def get_phase(phase_selection):
+    """
+    Phase data, or None if it cannot be loaded.
+
+    Args:
+        phase_selection (str): The counseling phase
+
+    Returns:
+        pandas.DataFrame: The cleaned data or None
+    """
+    try:
+        return load_phase(phase_selection)
+    except DataLoadError as e:
+        logger.error(str(e))
+        return None
+
+
+@cached(ttl=60, shared=False)
+def data_version():
+    """
+    Short digest identifying the current phase files.
+
+    Built from each phase file's size and modification time, so it changes
+    whenever the data is replaced. Used for HTTP ETags and cache keys.
+
+    Returns:
+        str: 12-character hex digest
+    """
+    digest = hashlib.sha1()
+    for phase, file_path in sorted(PHASE_FILES.items()):
+        path = resolve_data_path(file_path)
+        try:
+            stat = os.stat(path)
+            digest.update(f"{phase}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+        except OSError:
+            digest.update(f"{phase}|missing".encode())
+    return digest.hexdigest()[:12]
+
+
+_snapshots = {}
+
+
+def snapshot_hash():
+    """
+    Digest of the contents of the phase files.
+
+    Unlike data_version, it is the same on every machine holding the same
+    data, so it can key results shared between replicas. The files are only
+    read again when data_version() changes.
+
+    Returns:
+        str: 12-character hex digest
+    """
+    version = data_version()
+    snapshot = _snapshots.get(version)
+    if snapshot is None:
+        digest = hashlib.sha1()
+        for phase, file_path in sorted(PHASE_FILES.items()):
+            digest.update(f"{phase}|".encode())
+            try:
+                with open(resolve_data_path(file_path), 'rb') as f:
+                    for block in iter(lambda: f.read(1 << 20), b''):
+                        digest.update(block)
+            except OSError:
+                digest.update(b"missing")
+        snapshot = digest.hexdigest()[:12]
+        _snapshots.clear()
+        _snapshots[version] = snapshot
+    return snapshot
+
+
+def clean_dataframe(df):
+    """
+    Clean and prepare the dataframe for use.
+
+    Args:
+        df (pandas.DataFrame): The raw dataframe to clean
+
+    Returns:
+        pandas.DataFrame: The cleaned dataframe
+    """
+    # Cleaning column names
+    df.columns = [col.strip().replace('\n', '') for col in df.columns]
+
+    # Converting rank columns to numeric, handling errors
+    rank_columns = [
+        col for col in df.columns if 'BOYS' in col or 'GIRLS' in col or 'EWS' in col]
+    for col in rank_columns:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    # Handling missing values
+    if 'Inst Code' in df.columns and 'Institute Name' in df.columns:
+        df = df.dropna(subset=['Inst Code', 'Institute Name', 'Branch Code'])
+    else:
+        df = df.dropna(subset=['Place', 'Branch Code'])
+
+    return df
+
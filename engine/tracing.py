@@ -0,0 +1,212 @@
+"""
+Hierarchical tracing spans for reruns and requests.
+
+``with trace(name):`` opens a span, and starts a new trace when no span is
+open. ``with span(name):`` opens a child of the innermost open span and does
+nothing outside a trace, so instrumented engine code costs one context
+variable lookup when nothing is being traced. @cached functions record a span
+with a ``cache`` attribute of "hit" or "miss".
+
+Finished traces are sampled at the end (tail sampling). Traces slower than
+SLOW_TRACE_SECONDS are always kept, and the rest with probability
+SAMPLE_RATE. Kept traces go to a ring buffer (recent_traces) and, when
+TRACE_FILE is set, are appended to it as one JSON line each.
+"""
+import itertools
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', '0.1'))
+SLOW_TRACE_SECONDS = float(os.getenv('TRACE_SLOW_SECONDS', '2.0'))
+TRACE_FILE = os.getenv('TRACE_FILE') or None
+BUFFER_SIZE = 200
+
+_current = ContextVar('current_span', default=None)
+_ids = itertools.count(1)
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    __slots__ = ('name', 'span_id', 'parent_id', 'start', 'end', 'attributes', 'trace')
+
+    def __init__(self, name, trace, parent_id, attributes):
+        self.name = name
+        self.trace = trace
+        self.span_id = next(_ids)
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start = time.perf_counter()
+        self.end = None
+
+    def set(self, **attributes):
+        """Add attributes to the span."""
+        self.attributes.update(attributes)
+
+    @property
+    def duration(self):
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+
+class _NoSpan:
+    """Stand-in yielded by span() outside a trace."""
+
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+
+NO_SPAN = _NoSpan()
+
+
+class Trace:
+    """Spans of one rerun or request, root first."""
+
+    def __init__(self, name):
+        self.trace_id = f"{os.getpid():x}-{next(_ids):x}"
+        self.name = name
+        self.started_at = time.time()
+        self.spans = []
+
+    @property
+    def root(self):
+        return self.spans[0]
+
+    @property
+    def duration(self):
+        return self.root.duration
+
+    def to_dict(self):
+        """JSON-ready form, with span offsets and durations in ms from the trace start."""
+        origin = self.root.start
+        return {
+            'trace_id': self.trace_id,
+            'name': self.name,
+            'started_at': self.started_at,
+            'duration_ms': round(1000 * self.duration, 3),
+            'spans': [{'id': s.span_id, 'parent': s.parent_id, 'name': s.name,
+                       'offset_ms': round(1000 * (s.start - origin), 3),
+                       'duration_ms': round(1000 * s.duration, 3),
+                       'attributes': s.attributes}
+                      for s in self.spans],
+        }
+
+
+class Tracer:
+    """Sampling policy and sinks for finished traces."""
+
+    def __init__(self, sample_rate=SAMPLE_RATE, slow_seconds=SLOW_TRACE_SECONDS,
+                 path=TRACE_FILE, capacity=BUFFER_SIZE):
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+        self.path = path
+        self.buffer = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def keep(self, trace):
+        return trace.duration >= self.slow_seconds or random.random() < self.sample_rate
+
+    def finish(self, trace):
+        """Store a finished trace if the sampling policy keeps it."""
+        if not self.keep(trace):
+            return
+        with self._lock:
+            self.buffer.append(trace)
+            if self.path:
+                try:
+                    with open(self.path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(trace.to_dict(), default=str) + "\n")
+                except OSError as e:
+                    logger.warning(f"Could not write trace to {self.path}: {e}")
+
+    def recent(self, min_seconds=0.0):
+        """Kept traces, newest first, that took at least min_seconds."""
+        with self._lock:
+            traces = list(self.buffer)
+        return [t for t in reversed(traces) if t.duration >= min_seconds]
+
+
+tracer = Tracer()
+
+
+def configure(**settings):
+    """
+    Change the tracer settings (sample_rate, slow_seconds, path, capacity).
+
+    Returns:
+        Tracer: The new process-wide tracer
+    """
+    global tracer
+    current = {'sample_rate': tracer.sample_rate, 'slow_seconds': tracer.slow_seconds,
+               'path': tracer.path, 'capacity': tracer.buffer.maxlen}
+    current.update(settings)
+    tracer = Tracer(**current)
+    return tracer
+
+
+@contextmanager
+def _open(name, parent, trace_obj, attributes):
+    current = Span(name, trace_obj, parent.span_id if parent else None, attributes)
+    trace_obj.spans.append(current)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.attributes['error'] = type(e).__name__
+        raise
+    finally:
+        current.end = time.perf_counter()
+        _current.reset(token)
+        if parent is None:
+            tracer.finish(trace_obj)
+
+
+def trace(name, **attributes):
+    """
+    Span that starts a new trace when none is open.
+
+    Args:
+        name (str): Span name, e.g. "rerun" or "export.xlsx"
+        **attributes: Extra data stored with the span
+
+    Returns:
+        Context manager yielding the Span
+    """
+    parent = _current.get()
+    return _open(name, parent, parent.trace if parent else Trace(name), attributes)
+
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Child span of the innermost open span; does nothing outside a trace.
+
+    Yields:
+        Span, or NO_SPAN (which ignores set()) when nothing is traced
+    """
+    parent = _current.get()
+    if parent is None:
+        yield NO_SPAN
+        return
+    with _open(name, parent, parent.trace, attributes) as current:
+        yield current
+
+
+def recent_traces(min_seconds=0.0):
+    """Kept traces, newest first, that took at least min_seconds."""
+    return tracer.recent(min_seconds)
+
+
+def slow_traces():
+    """Kept traces slower than the tracer's slow threshold, newest first."""
+    return tracer.recent(tracer.slow_seconds)
@@ -0,0 +1,134 @@
+"""
+Option lists (vocabularies) for selection widgets.
+
+The colleges, branches, districts, places and affiliations of a phase are
+built once per data version and returned as immutable tuples of values.
+Front ends can pass them straight to a select box without touching the
+DataFrame on every render.
+"""
+from collections import namedtuple
+from types import MappingProxyType
+
+import pandas as pd
+
+from .cache import cached
+from .store import data_version, get_phase
+
+COLLEGES = "colleges"
+BRANCHES = "branches"
+BRANCH_CODES = "branch_codes"
+DISTRICTS = "districts"
+PLACES = "places"
+AFFILIATIONS = "affiliations"
+
+ALL_DISTRICTS = "All Districts"
+
+
+class Vocabulary(namedtuple('Vocabulary', ['values'])):
+    """Sorted option values as a tuple."""
+
+    __slots__ = ()
+
+    def __len__(self):
+        return len(self.values)
+
+
+EMPTY = Vocabulary(())
+
+
+def college_column(df):
+    """Name of the column identifying colleges in a phase frame."""
+    college_col = 'Institute Name' if 'Institute Name' in df.columns else 'College Name'
+    if college_col not in df.columns:
+        college_col = 'Place'
+    return college_col
+
+
+def sorted_values(values, strip=False):
+    """Sorted distinct non-null values of a column as a tuple."""
+    values = pd.Series(values).dropna()
+    if strip:
+        values = values.astype(str).str.strip()
+    return tuple(sorted(values.unique().tolist()))
+
+
+# Vocabulary name -> (column, strip whitespace)
+VOCABULARY_SPECS = {
+    BRANCHES: ('Branch Name', True),
+    BRANCH_CODES: ('Branch Code', True),
+    DISTRICTS: ('Dist Code', False),
+    PLACES: ('Place', True),
+    AFFILIATIONS: ('Affiliated To', True),
+}
+VOCABULARY_NAMES = (COLLEGES,) + tuple(VOCABULARY_SPECS)
+
+
+@cached(shared=False)
+def build_vocabularies(phase, version):
+    """
+    Every vocabulary of a phase.
+
+    Cached per data version, so replacing the data files builds new lists
+    instead of serving stale ones.
+
+    Args:
+        phase (str): The counseling phase
+        version (str): data_version() the lists are built for
+
+    Returns:
+        mappingproxy: Vocabulary name -> Vocabulary (empty if a column is missing)
+    """
+    df = get_phase(phase)
+    if df is None:
+        return MappingProxyType({name: EMPTY for name in VOCABULARY_NAMES})
+
+    vocabularies = {COLLEGES: Vocabulary(sorted_values(df[college_column(df)]))}
+    for name, (column, strip) in VOCABULARY_SPECS.items():
+        vocabularies[name] = (Vocabulary(sorted_values(df[column], strip))
+                              if column in df.columns else EMPTY)
+    return MappingProxyType(vocabularies)
+
+
+def get_vocabulary(phase, name):
+    """
+    One vocabulary of a phase for the current data version.
+
+    Args:
+        phase (str): The counseling phase
+        name (str): One of VOCABULARY_NAMES
+
+    Returns:
+        Vocabulary: Sorted values
+    """
+    return build_vocabularies(phase, data_version())[name]
+
+
+def get_districts(df):
+    """
+    Get unique districts from the dataframe.
+
+    Args:
+        df (pandas.DataFrame): The dataset
+
+    Returns:
+        list: List of unique districts
+    """
+    districts = [ALL_DISTRICTS]
+    if df is not None and 'Dist Code' in df.columns:
+        districts.extend(sorted_values(df['Dist Code']))
+    return districts
+
+
+def get_colleges(df):
+    """
+    Get unique colleges from the dataframe.
+
+    Args:
+        df (pandas.DataFrame): The dataset
+
+    Returns:
+        list: List of unique colleges
+    """
+    if df is None:
+        return []
+    return list(sorted_values(df[college_column(df)]))
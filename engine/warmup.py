@@ -0,0 +1,263 @@
+"""
+Startup warm-up of the engine caches.
+
+run_warmup() does the work the first visitors after a deploy would otherwise
+wait for, in stages:
+
+- data: load every phase file, concurrently
+- indexes: cutoff indexes of every category column, college row lookups,
+  vocabularies and the closing rank model
+- imports: modules named by the caller, e.g. the Streamlit pages
+- templates: the curated top-college lists
+- queries: the canary query used by health checks (engine.readiness) and
+  the most frequent queries from WARMUP_QUERIES and QUERY_LOG
+
+Each stage is timed. Timings are logged, recorded as "warmup.<stage>"
+latencies in engine.metrics and kept in ``status``. A failing stage is
+recorded and later stages still run. start_warmup() runs the stages in a
+background thread, so a server can report progress while warming up.
+
+Usage:
+    python -m engine.warmup [--queries popular.jsonl] [--top 50]
+"""
+import argparse
+import importlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .constants import CATEGORY_COLUMNS, PHASE_FILES
+from .generators import COLLEGE_LIST_TYPES, get_hardcoded_best_list
+from .index import get_college_rows, get_cutoff_index
+from .metrics import registry
+from .probability import get_closing_rank_model
+from .querylog import QUERY_FUNCTIONS, QUERY_LOG, query_line, read_queries, replaying, top_queries
+from .store import data_version, load_phase
+from .vocab import build_vocabularies
+
+logger = logging.getLogger(__name__)
+
+WARMUP_QUERIES = os.getenv('WARMUP_QUERIES') or None
+TOP_QUERIES = int(os.getenv('WARMUP_TOP_QUERIES', '50'))
+WORKERS = int(os.getenv('WARMUP_WORKERS', '4'))
+GENDERS = ("Male", "Female")
+CANARY_QUERY = ('predict_colleges', {'rank': 10000, 'gender': "Male", 'caste': "OC",
+                                     'branch': "CSE", 'phase_selection': "Final Phase"})
+
+STAGES = ("data", "indexes", "imports", "templates", "queries")
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class WarmupStatus:
+    """Progress of the warm-up, safe to read from other threads."""
+
+    def __init__(self):
+        self.state = PENDING
+        self.stages = []
+        self.current = None
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            self.state = RUNNING
+            self.stages = []
+            self.started_at = time.time()
+            self.finished_at = None
+
+    def begin(self, stage):
+        with self._lock:
+            self.current = stage
+
+    def record(self, stage, seconds, error=None, detail=""):
+        with self._lock:
+            self.stages.append({'stage': stage, 'seconds': seconds,
+                                'ok': error is None, 'detail': error or detail})
+            self.current = None
+
+    def finish(self):
+        with self._lock:
+            self.state = FAILED if any(not s['ok'] for s in self.stages) else DONE
+            self.finished_at = time.time()
+
+    @property
+    def ready(self):
+        """Whether warm-up has finished (even with failed stages)."""
+        return self.state in (DONE, FAILED)
+
+    def snapshot(self):
+        """
+        JSON-ready copy of the progress.
+
+        Returns:
+            dict: state, current stage, completed/total stage counts,
+                start and end times and one dict per finished stage
+        """
+        with self._lock:
+            return {'state': self.state, 'current': self.current,
+                    'completed': len(self.stages), 'total': len(STAGES),
+                    'started_at': self.started_at, 'finished_at': self.finished_at,
+                    'stages': [dict(s) for s in self.stages]}
+
+
+status = WarmupStatus()
+
+
+def warm_data(workers):
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(PHASE_FILES)))) as pool:
+        frames = list(pool.map(load_phase, PHASE_FILES))
+    return f"{len(frames)} phases, {sum(len(df) for df in frames)} rows"
+
+
+def warm_indexes(workers):
+    version = data_version()
+
+    def build(phase):
+        for column in CATEGORY_COLUMNS:
+            get_cutoff_index(phase, column)
+        get_college_rows(phase)
+        build_vocabularies(phase, version)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(PHASE_FILES)))) as pool:
+        list(pool.map(build, PHASE_FILES))
+    get_closing_rank_model()
+    return f"{len(PHASE_FILES)} phases x {len(CATEGORY_COLUMNS)} columns"
+
+
+def warm_templates():
+    for list_type in COLLEGE_LIST_TYPES:
+        for gender in GENDERS:
+            get_hardcoded_best_list(list_type, gender)
+    return f"{len(COLLEGE_LIST_TYPES) * len(GENDERS)} lists"
+
+
+def collect_queries(path=WARMUP_QUERIES, log=QUERY_LOG, top=TOP_QUERIES):
+    """
+    Queries to run: every one listed in path, then the top most frequent of the log.
+
+    Returns:
+        list: Distinct (function name, kwargs) pairs
+    """
+    queries = {}
+    for source, limit in ((path, None), (log, top)):
+        if not source:
+            continue
+        try:
+            found = read_queries(source)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read warm-up queries from {source}: {e}")
+            continue
+        for function, kwargs in (found if limit is None else top_queries(found, limit)):
+            queries.setdefault(query_line(function, kwargs), (function, kwargs))
+    return list(queries.values())
+
+
+def warm_queries(workers, queries):
+    def run(query):
+        function, kwargs = query
+        try:
+            with replaying():
+                QUERY_FUNCTIONS[function](**kwargs)
+            return True
+        except Exception as e:
+            logger.warning(f"Warm-up query {function}({kwargs}) failed: {e}")
+            return False
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(run, queries))
+    failed = results.count(False)
+    return f"{len(results) - failed} queries" + (f", {failed} failed" if failed else "")
+
+
+def run_warmup(modules=(), queries=None, workers=WORKERS):
+    """
+    Run every warm-up stage in order and record the timings in status.
+
+    Args:
+        modules (iterable): Module names to import in the imports stage
+        queries (list, optional): (function name, kwargs) pairs; defaults to
+            collect_queries()
+        workers (int): Threads loading phases, building indexes and running
+            the queries
+
+    Returns:
+        WarmupStatus: status, finished
+    """
+    if queries is None:
+        queries = collect_queries()
+    modules = list(modules)
+
+    def imports():
+        for name in modules:
+            importlib.import_module(name)
+        return f"{len(modules)} modules"
+
+    steps = {
+        'data': lambda: warm_data(workers),
+        'indexes': lambda: warm_indexes(workers),
+        'imports': imports,
+        'templates': warm_templates,
+        'queries': lambda: warm_queries(workers, [CANARY_QUERY] + queries),
+    }
+    status.start()
+    start = time.perf_counter()
+    for stage in STAGES:
+        status.begin(stage)
+        stage_start = time.perf_counter()
+        error = detail = None
+        try:
+            detail = steps[stage]()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            logger.error(f"Warm-up stage {stage} failed: {error}")
+        seconds = time.perf_counter() - stage_start
+        registry.observe(f"warmup.{stage}", seconds)
+        status.record(stage, seconds, error, detail)
+        logger.info(f"Warm-up {stage}: {seconds:.2f}s ({error or detail})")
+    status.finish()
+    logger.info(f"Warm-up finished in {time.perf_counter() - start:.2f}s")
+    return status
+
+
+def start_warmup(modules=(), queries=None, workers=WORKERS):
+    """
+    Run run_warmup in a daemon thread; progress is in status.
+
+    Returns:
+        threading.Thread: The started thread
+    """
+    thread = threading.Thread(target=run_warmup, args=(modules, queries, workers),
+                              name="warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv=None):
+    """Command-line entry point: warm up and print the stage timings."""
+
+    parser = argparse.ArgumentParser(description="Warm up the engine caches and time each stage.")
+    parser.add_argument("--queries", default=WARMUP_QUERIES,
+                        help="JSON or JSON-lines file of queries to precompute")
+    parser.add_argument("--log", default=QUERY_LOG, help="Query log to take the most frequent queries from")
+    parser.add_argument("--top", type=int, default=TOP_QUERIES, help="Queries to precompute")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--import", dest="modules", action="append", default=[],
+                        help="Module to import in the imports stage (repeatable)")
+    args = parser.parse_args(argv)
+
+    result = run_warmup(args.modules, collect_queries(args.queries, args.log, args.top),
+                        args.workers).snapshot()
+    for stage in result['stages']:
+        mark = "ok" if stage['ok'] else "FAILED"
+        print(f"{stage['stage']:<10} {stage['seconds']:>7.2f}s  {mark:<6} {stage['detail']}")
+    print(f"{'total':<10} {sum(s['seconds'] for s in result['stages']):>7.2f}s  {result['state']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+On-demand CSV/XLSX/PDF downloads for the Streamlit pages.
+
+download_button passes Streamlit a callable, so the file is only built when
+the user clicks the button, not on every rerun that shows results. Built
+bytes are kept in a bounded LRU keyed by a digest of the table content and
+the format, so downloading the same list again costs no export work. With a
+shared result cache configured (engine.shared_cache), built files are also
+kept there for other replicas and after restarts. Clicking a download does
+not rerun the script unless on_click is given. Each build is traced as an
+"export.<format>" span.
+
+Excel files are written with openpyxl's write-only (streaming) workbook. Rows
+go straight to the file, so memory stays flat on large sheets.
+"""
+import io
+
+import streamlit as st
+from openpyxl import Workbook
+
+from engine.cache import MISSING, MemoryCache, freeze
+from engine.shared_cache import code_fingerprint, engine_version, tiered
+from engine.tracing import trace
+from modules.pdf_generator import dataframe_to_pdf
+
+CSV = "csv"
+XLSX = "xlsx"
+PDF = "pdf"
+
+MIME_TYPES = {
+    CSV: "text/csv",
+    XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    PDF: "application/pdf",
+}
+
+
+def export_version():
+    """Shared-cache key version of exports, which also depend on the writers here."""
+    return f"{engine_version()}.{code_fingerprint('modules')}"
+
+
+export_cache = tiered(MemoryCache(max_entries=64, name="modules.exports"), export_version)
+
+
+def write_csv(df):
+    return df.to_csv(index=False).encode('utf-8')
+
+
+def write_xlsx(df, sheet_name="Sheet1"):
+    """Workbook bytes, written row by row with a write-only workbook."""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    sheet.append([str(c) for c in df.columns])
+    columns = [df.iloc[:, i].astype(object).where(df.iloc[:, i].notna(), None).tolist()
+               for i in range(df.shape[1])]
+    for row in zip(*columns):
+        sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+WRITERS = {CSV: write_csv, XLSX: write_xlsx, PDF: dataframe_to_pdf}
+
+
+def export_bytes(df, fmt):
+    """
+    File contents of a table in a format, from the export cache if possible.
+
+    Args:
+        df (pandas.DataFrame): Table to export
+        fmt (str): One of CSV, XLSX or PDF
+
+    Returns:
+        bytes: The file contents
+    """
+    with trace(f"export.{fmt}", rows=len(df)) as current:
+        try:
+            key = (fmt, freeze(df))
+        except TypeError:
+            return WRITERS[fmt](df)
+
+        data = export_cache.get(key)
+        if data is MISSING:
+            current.set(cache="miss")
+            data = WRITERS[fmt](df)
+            export_cache.set(key, data)
+        else:
+            current.set(cache="hit")
+        return data
+
+
+def download_button(label, df, fmt, file_name, **kwargs):
+    """
+    st.download_button whose file is built only when clicked.
+
+    Args:
+        label (str): Button label
+        df (pandas.DataFrame): Table to export (must not be modified afterwards)
+        fmt (str): One of CSV, XLSX or PDF
+        file_name (str): Suggested file name
+        **kwargs: Passed on to st.download_button
+    """
+    kwargs.setdefault('on_click', "ignore")
+    df = df.copy(deep=False)
+    return st.download_button(
+        label=label,
+        data=lambda: export_bytes(df, fmt),
+        file_name=file_name,
+        mime=MIME_TYPES[fmt],
+        **kwargs
+    )
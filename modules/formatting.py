@@ -0,0 +1,141 @@
+"""
+Display formatting for result tables.
+
+Closing ranks and fees are turned into display strings with vectorized
+operations: each distinct value is formatted once and then broadcast to every
+row. Missing values get a placeholder. The numeric values are returned
+alongside the text, so tables can still sort numerically (see
+result_viewer.paged_dataframe's sort_keys).
+
+Formatted columns of the phase data are cached per data version, so pages
+showing rows of a phase only select the rows they need. Text columns are
+built as object arrays, which skips pandas' string dtype inference.
+"""
+import numpy as np
+import pandas as pd
+
+from engine.cache import cached
+from engine.store import data_version, get_phase
+
+RANK = "rank"
+FEE = "fee"
+
+MISSING_RANK = "-"
+MISSING_FEE = "N/A"
+
+
+def _format_unique(numbers, missing, template):
+    """Format each distinct finite value once and broadcast to all rows."""
+    out = np.full(len(numbers), missing, dtype=object)
+    valid = np.isfinite(numbers)
+    if valid.any():
+        unique, inverse = np.unique(numbers[valid].astype(np.int64), return_inverse=True)
+        out[valid] = np.array([template.format(v) for v in unique.tolist()], dtype=object)[inverse]
+    return out
+
+
+def numeric_values(values):
+    """Float array of values; text and other non-numbers become NaN."""
+    return pd.to_numeric(pd.Series(values, copy=False), errors='coerce').to_numpy(dtype=float)
+
+
+def format_ranks(values, missing=MISSING_RANK):
+    """
+    Closing ranks as whole-number strings.
+
+    Args:
+        values (array-like): Ranks (NaN, inf or text where there is none)
+        missing (str): Text for rows without a rank
+
+    Returns:
+        numpy.ndarray: Object array of strings
+    """
+    return _format_unique(numeric_values(values), missing, "{}")
+
+
+def format_fees(values, missing=MISSING_FEE):
+    """
+    Fees as whole numbers with thousands separators.
+
+    Args:
+        values (array-like): Fees in rupees
+        missing (str): Text for rows without a fee
+
+    Returns:
+        numpy.ndarray: Object array of strings
+    """
+    return _format_unique(numeric_values(values), missing, "{:,}")
+
+
+FORMATTERS = {RANK: format_ranks, FEE: format_fees}
+MISSING_TEXT = {RANK: MISSING_RANK, FEE: MISSING_FEE}
+
+
+@cached(shared=False)
+def formatted_phase_column(phase, column, kind, version):
+    """
+    Display text of one column of a phase, for every row.
+
+    Args:
+        phase (str): The counseling phase
+        column (str): Column of the phase data
+        kind (str): RANK or FEE
+        version (str): data_version() the text is built for
+
+    Returns:
+        numpy.ndarray: Read-only strings in the row order of the phase data
+    """
+    df = get_phase(phase)
+    if df is None:
+        return np.empty(0, dtype=object)
+    if column in df.columns:
+        text = FORMATTERS[kind](df[column])
+    else:
+        text = np.full(len(df), MISSING_TEXT[kind], dtype=object)
+    text.flags.writeable = False
+    return text
+
+
+def phase_text(rows, phase, kinds):
+    """
+    Display text of some phase columns for some of its rows.
+
+    Args:
+        rows (pandas.DataFrame or pandas.Index): Rows of the phase data (by index label)
+        phase (str): The counseling phase the rows come from
+        kinds (dict): Column name -> RANK or FEE
+
+    Returns:
+        pandas.DataFrame: Strings (object dtype) indexed like rows, one column per kind
+    """
+    index = rows.index if isinstance(rows, pd.DataFrame) else rows
+    df = get_phase(phase)
+    version = data_version()
+    positions = df.index.get_indexer(index) if df is not None else np.full(len(index), -1)
+    found = positions >= 0
+    data = {}
+    for column, kind in kinds.items():
+        text = np.full(len(index), MISSING_TEXT[kind], dtype=object)
+        text[found] = formatted_phase_column(phase, column, kind, version)[positions[found]]
+        data[column] = text
+    return pd.DataFrame(data, index=index, dtype=object)
+
+
+def format_columns(df, kinds):
+    """
+    Copy of df with some columns formatted for display, and their numbers.
+
+    Args:
+        df (pandas.DataFrame): Result table
+        kinds (dict): Column name -> RANK or FEE
+
+    Returns:
+        tuple: (display DataFrame, DataFrame of the numeric values of the
+            formatted columns, in the same row order)
+    """
+    columns = [c for c in kinds if c in df.columns]
+    numbers = pd.DataFrame({c: numeric_values(df[c]) for c in columns}, index=df.index)
+    text = pd.DataFrame({c: FORMATTERS[kinds[c]](numbers[c].to_numpy()) for c in columns},
+                        index=df.index, dtype=object)
+    display = pd.concat([df.drop(columns=columns), text], axis=1)[list(df.columns)]
+    return display, numbers
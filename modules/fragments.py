@@ -0,0 +1,53 @@
+"""
+Tracing and profiling for Streamlit fragments.
+
+A fragment rerun (a form submit, a page change in a result table) runs only
+the fragment function, not app.py, so it is outside the rerun trace and the
+rerun profile. Put @traced_fragment under @st.fragment to trace each call: as
+a child span of the rerun during a full run, and as the root of its own trace
+on a fragment rerun. Fragment reruns are also profiled like full reruns: by
+stack sampling when slower than PROFILE_BUDGET, and with cProfile when the
+URL has ``?profile=<PROFILE_TOKEN>``. During a full run the enclosing rerun
+capture covers the fragment.
+"""
+import functools
+import os
+
+import streamlit as st
+
+from engine.profiling import capture
+from engine.tracing import trace
+
+# Reruns slower than this are profiled by stack sampling (empty value disables it)
+PROFILE_BUDGET = float(os.getenv('PROFILE_BUDGET_SECONDS', '2.0') or 0) or None
+
+
+def profile_requested():
+    """Whether an admin asked for a cProfile capture with ?profile=<PROFILE_TOKEN>."""
+    token = os.getenv('PROFILE_TOKEN')
+    return bool(token) and st.query_params.get('profile') == token
+
+
+def request_query():
+    """Query parameters of this session's URL, without the profile token."""
+    return {k: v for k, v in st.query_params.to_dict().items() if k != 'profile'}
+
+
+def traced_fragment(func):
+    """Trace and profile every call of a fragment function as "fragment.<module>.<name>"."""
+    name = f"fragment.{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with trace(name) as root:
+            if root.parent_id is not None:
+                return func(*args, **kwargs)
+            with capture(name, budget=PROFILE_BUDGET, force=profile_requested(),
+                         metadata={'trace_id': root.trace.trace_id,
+                                   'query': request_query()}) as profile:
+                result = func(*args, **kwargs)
+        if profile.force and profile.path:
+            st.toast(f"Profile saved to {profile.path}")
+        return result
+
+    return wrapper
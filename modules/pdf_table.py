@@ -0,0 +1,231 @@
+"""
+Fast table rendering for the FPDF reports.
+
+The cell text is built column by column. Values are stringified, ₹ and dashes
+are replaced, the text is encoded to latin-1 and truncated with vectorized
+pandas string operations. Column widths and centring offsets are measured
+with cached core-font metrics, once per distinct string. Rows are then laid
+out one page at a time: each page's table body is emitted as a single block
+of PDF drawing operators instead of one FPDF cell() call per cell.
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+from fpdf import FPDF
+
+CELL_MARGIN = 1.0  # mm of padding on each side of a cell's text
+MIN_COLUMN_WIDTH = 12.0
+MAX_COLUMN_WIDTH = 70.0
+
+
+@functools.lru_cache(maxsize=None)
+def char_widths(family, style=''):
+    """Character widths (1/1000 em) of an FPDF core font."""
+    pdf = FPDF()
+    pdf.set_font(family, style)
+    return dict(pdf.current_font['cw'])
+
+
+def text_widths(texts, family, style, size):
+    """
+    Rendered widths in mm of an array of strings.
+
+    Each distinct string is measured once.
+
+    Args:
+        texts (numpy.ndarray): Strings to measure
+        family (str): Core font family
+        style (str): Font style ('', 'B', 'I')
+        size (float): Font size in points
+
+    Returns:
+        numpy.ndarray: Width of each string in mm
+    """
+    cw = char_widths(family, style)
+    unique, inverse = np.unique(np.asarray(texts, dtype=object).astype(str), return_inverse=True)
+    widths = np.fromiter((sum(cw.get(c, 0) for c in s) for s in unique),
+                         dtype=float, count=len(unique))
+    return (widths * size / 1000.0 * 25.4 / 72.0)[inverse]
+
+
+def sanitize_column(values, max_chars=None):
+    """
+    Printable latin-1 text of a column, truncated with "...".
+
+    Args:
+        values (pandas.Series or pandas.Index): Values to convert
+        max_chars (int, optional): Longest text kept before truncating
+
+    Returns:
+        numpy.ndarray: Object array of strings
+    """
+    text = pd.Series(values, copy=False).astype(str)
+    text = (text.str.replace("₹", "Rs.", regex=False).str.replace("—", "-", regex=False)
+            .str.encode('latin-1', errors='replace').str.decode('latin-1'))
+    if max_chars is not None:
+        long = text.str.len() > max_chars
+        if long.any():
+            text = text.where(~long, text.str.slice(0, max_chars - 3) + "...")
+    return text.to_numpy(dtype=object)
+
+
+def fit_texts(texts, widths, limit, family, style, size):
+    """
+    Shorten texts wider than limit so that they fit, ending in "...".
+
+    Args:
+        texts (numpy.ndarray): Strings
+        widths (numpy.ndarray): Their widths in mm, from text_widths
+        limit (float or numpy.ndarray): Available width in mm, per string or overall
+        family, style, size: Font used for measuring
+
+    Returns:
+        numpy.ndarray: texts, or a shortened copy
+    """
+    limit = np.broadcast_to(limit, widths.shape)
+    over = widths > limit
+    if not over.any():
+        return texts
+    cw = char_widths(family, style)
+    scale = size / 1000.0 * 25.4 / 72.0
+    ellipsis = sum(cw.get(c, 0) for c in "...")
+    texts = texts.copy()
+    for i in np.flatnonzero(over):
+        budget = limit[i] / scale - ellipsis
+        used, cut = 0, 0
+        for c in texts[i]:
+            used += cw.get(c, 0)
+            if used > budget:
+                break
+            cut += 1
+        texts[i] = texts[i][:cut] + "..."
+    return texts
+
+
+def column_layout(header, body, page_width, family, header_size, body_size):
+    """
+    Column widths that fit the page, measured from the text.
+
+    Each column gets its widest text plus padding, clipped to
+    [MIN_COLUMN_WIDTH, MAX_COLUMN_WIDTH]. The table is then scaled to the
+    page width.
+
+    Returns:
+        numpy.ndarray: Width of each column in mm
+    """
+    natural = np.array([
+        max(text_widths([h], family, 'B', header_size)[0],
+            text_widths(col, family, '', body_size).max() if len(col) else 0.0)
+        for h, col in zip(header, body)
+    ]) + 2 * CELL_MARGIN
+    natural = np.clip(natural, MIN_COLUMN_WIDTH, MAX_COLUMN_WIDTH)
+    return natural * (page_width / natural.sum()) if len(natural) else natural
+
+
+def _escape(texts):
+    return [t.replace('\\', '\\\\').replace(')', '\\)').replace('(', '\\(').replace('\r', '\\r')
+            for t in texts]
+
+
+def render_table(pdf, df, max_chars=25, max_header_chars=20, family="Arial",
+                 header_size=9, body_size=8, row_height=8, bottom_margin=30,
+                 header_fill=(200, 220, 255), stripe_fill=(245, 245, 245),
+                 page_width=None, paginate=True):
+    """
+    Draw a data frame as a striped table, continuing onto new pages.
+
+    Args:
+        pdf (FPDF): Document, positioned where the table starts
+        df (pandas.DataFrame): Table to draw
+        max_chars (int): Longest cell text before truncation
+        max_header_chars (int): Longest header text before truncation
+        family (str): Core font family
+        header_size, body_size (float): Font sizes in points
+        row_height (float): Row height in mm
+        bottom_margin (float): Space kept free at the bottom of each page (mm)
+        header_fill, stripe_fill (tuple): RGB fills of the header and even rows
+        page_width (float, optional): Table width in mm (defaults to the page width minus 20)
+        paginate (bool): Continue on new pages (repeating the header) instead of
+            stopping at the end of the current page
+
+    Returns:
+        int: Number of rows drawn
+    """
+    page_width = page_width or pdf.w - 20
+    header = sanitize_column(pd.Index(df.columns).astype(str), max_header_chars)
+    body = [sanitize_column(df.iloc[:, i], max_chars) for i in range(df.shape[1])]
+    widths = column_layout(header, body, page_width, family, header_size, body_size)
+    limits = widths - 2 * CELL_MARGIN
+
+    # Final text and centring offset of every cell, column by column
+    header_w = text_widths(header, family, 'B', header_size)
+    header = fit_texts(header, header_w, limits, family, 'B', header_size)
+    header_w = text_widths(header, family, 'B', header_size)
+    cells, offsets = [], []
+    for j, col in enumerate(body):
+        col_w = text_widths(col, family, '', body_size)
+        col = fit_texts(col, col_w, limits[j], family, '', body_size)
+        col_w = text_widths(col, family, '', body_size) if col is not body[j] else col_w
+        cells.append(_escape(col))
+        offsets.append((widths[j] - col_w) / 2.0)
+    header_escaped = _escape(header)
+    header_offsets = (widths - header_w) / 2.0
+
+    k = pdf.k
+    x0 = pdf.l_margin
+    col_x = x0 + np.concatenate([[0.0], np.cumsum(widths)[:-1]])
+    n_rows = len(df)
+    drawn = 0
+
+    def emit(ops):
+        pdf._out('\n'.join(ops))
+
+    def text_block(ops):
+        # The fill colour is also the text colour in PDF, so switch to the
+        # document's text colour for the text operators only
+        return ['q', pdf.text_color] + ops + ['Q']
+
+    def draw_header(y):
+        pdf.set_font(family, 'B', size=header_size)
+        pdf.set_fill_color(*header_fill)
+        font_mm = header_size / k
+        base = (pdf.h - (y + 0.5 * row_height + 0.3 * font_mm)) * k
+        ops = ['%.2f %.2f %.2f %.2f re B' % (x * k, (pdf.h - y) * k, w * k, -row_height * k)
+               for x, w in zip(col_x, widths)]
+        ops += text_block(['BT %.2f %.2f Td (%s) Tj ET' % ((x + dx) * k, base, t)
+                           for x, dx, t in zip(col_x, header_offsets, header_escaped) if t])
+        emit(ops)
+        pdf.set_font(family, size=body_size)
+        pdf.set_fill_color(*stripe_fill)
+
+    font_mm = body_size / k
+    while True:
+        y = pdf.get_y()
+        draw_header(y)
+        y += row_height
+        # Same rule as before: keep adding rows until y passes the bottom margin
+        capacity = max(1, int(np.floor((pdf.h - bottom_margin - y) / row_height)) + 1)
+        chunk = range(drawn, min(n_rows, drawn + capacity))
+
+        rects, texts = [], []
+        for i in chunk:
+            op = 'B' if i % 2 == 0 else 'S'
+            base = (pdf.h - (y + 0.5 * row_height + 0.3 * font_mm)) * k
+            top = (pdf.h - y) * k
+            for j in range(len(widths)):
+                rects.append('%.2f %.2f %.2f %.2f re %s' % (col_x[j] * k, top, widths[j] * k,
+                                                            -row_height * k, op))
+                text = cells[j][i]
+                if text:
+                    texts.append('BT %.2f %.2f Td (%s) Tj ET' % ((col_x[j] + offsets[j][i]) * k,
+                                                                  base, text))
+            y += row_height
+        if rects:
+            emit(rects + text_block(texts))
+        drawn = chunk.stop
+        pdf.set_y(y)
+
+        if drawn >= n_rows or not paginate:
+            return drawn
+        pdf.add_page()
@@ -0,0 +1,170 @@
+"""
+Bulk PDF report kits for the TS EAMCET College Predictor.
+
+Renders many result tables with pdf_generator.dataframe_to_pdf in a process
+pool and writes each PDF into a zip archive on disk as soon as it is ready.
+Only a bounded window of reports is in flight at once, so memory stays flat
+however many reports there are. The archive also contains
+``report_timings.csv`` with the render time of every document.
+
+This module does not use Streamlit, so it can run in a background process or
+from the command line without blocking an interactive session:
+
+Usage:
+    python -m modules.report_kit roster_options.csv --group-by "Student ID" --output reports.zip
+"""
+import argparse
+import io
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+
+from modules.pdf_generator import dataframe_to_pdf
+
+TIMINGS_FILE = "report_timings.csv"
+
+
+def render_report(name, df):
+    """
+    Render one report and time it.
+
+    Args:
+        name (str): Document name (without extension)
+        df (pandas.DataFrame): Table to render
+
+    Returns:
+        tuple: (name, pdf bytes, rows, seconds)
+    """
+    start = time.perf_counter()
+    pdf_bytes = dataframe_to_pdf(df)
+    return name, pdf_bytes, len(df), time.perf_counter() - start
+
+
+def safe_file_name(name, used):
+    """Archive member name for a document, made unique among used names."""
+    base = re.sub(r'[^\w.-]+', '_', str(name)).strip('_') or "report"
+    candidate, n = f"{base}.pdf", 1
+    while candidate in used:
+        n += 1
+        candidate = f"{base}_{n}.pdf"
+    used.add(candidate)
+    return candidate
+
+
+def build_report_zip(reports, zip_path, workers=None, max_in_flight=None, progress=None):
+    """
+    Render reports in a process pool and stream them into a zip archive.
+
+    Args:
+        reports (iterable): (name, DataFrame) pairs; consumed lazily
+        zip_path (str): Archive to write (replaced if it exists)
+        workers (int, optional): Worker processes (defaults to the CPU count)
+        max_in_flight (int, optional): Reports submitted but not yet written
+            (defaults to twice the worker count)
+        progress (callable, optional): Called as progress(done, name, seconds)
+            after each document is written
+
+    Returns:
+        pandas.DataFrame: One row per document with File, Rows, Bytes and Seconds
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * workers
+    reports = iter(reports)
+
+    tmp_path = zip_path + ".part"
+    try:
+        timing_df = _write_archive(reports, tmp_path, workers, max_in_flight, progress)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, zip_path)
+    return timing_df
+
+
+def _write_archive(reports, tmp_path, workers, max_in_flight, progress):
+    used_names = set()
+    timings = []
+    with ProcessPoolExecutor(max_workers=workers) as pool, \
+            zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        pending = set()
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_in_flight:
+                item = next(reports, None)
+                if item is None:
+                    exhausted = True
+                else:
+                    pending.add(pool.submit(render_report, *item))
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, pdf_bytes, rows, seconds = future.result()
+                file_name = safe_file_name(name, used_names)
+                archive.writestr(file_name, pdf_bytes)
+                timings.append({'File': file_name, 'Rows': rows,
+                                'Bytes': len(pdf_bytes), 'Seconds': round(seconds, 4)})
+                if progress is not None:
+                    progress(len(timings), file_name, seconds)
+
+        timing_df = pd.DataFrame(timings, columns=['File', 'Rows', 'Bytes', 'Seconds'])
+        buffer = io.StringIO()
+        timing_df.to_csv(buffer, index=False)
+        archive.writestr(TIMINGS_FILE, buffer.getvalue())
+    return timing_df
+
+
+def grouped_reports(df, group_by, drop_columns=()):
+    """
+    (name, DataFrame) pairs, one per value of group_by.
+
+    Args:
+        df (pandas.DataFrame): Consolidated results, e.g. engine.roster output
+        group_by (str): Column identifying the report each row belongs to
+        drop_columns (tuple): Columns left out of the rendered tables
+    """
+    drop = [group_by] + [c for c in drop_columns if c in df.columns]
+    for name, group in df.groupby(group_by, sort=False):
+        yield name, group.drop(columns=drop).reset_index(drop=True)
+
+
+def main(argv=None):
+    """Command-line entry point for bulk report generation."""
+
+    parser = argparse.ArgumentParser(
+        description="Render one PDF per group of a results CSV into a zip archive.")
+    parser.add_argument("results", help="CSV with the rows of every report")
+    parser.add_argument("--group-by", default="Student ID",
+                        help="Column that identifies each report")
+    parser.add_argument("--drop", nargs='*', default=['Name', 'Rank', 'Gender', 'Caste'],
+                        help="Columns left out of the PDF tables")
+    parser.add_argument("--output", default="reports.zip")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(args.results, dtype={args.group_by: str})
+    if args.group_by not in df.columns:
+        raise SystemExit(f"Column '{args.group_by}' not found in {args.results}")
+    total = df[args.group_by].nunique()
+    start = time.perf_counter()
+
+    def report_progress(done, file_name, seconds):
+        print(f"[{done}/{total}] {file_name} ({seconds * 1000:.0f} ms)", file=sys.stderr, flush=True)
+
+    timings = build_report_zip(grouped_reports(df, args.group_by, args.drop), args.output,
+                               workers=args.workers, progress=report_progress)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {len(timings)} reports to {args.output} in {elapsed:.1f}s "
+          f"(render mean {timings['Seconds'].mean() * 1000:.0f} ms, "
+          f"max {timings['Seconds'].max() * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
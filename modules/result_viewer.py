@@ -0,0 +1,147 @@
+"""
+Paginated result tables for the Streamlit pages.
+
+Long result lists (up to about a thousand rows and over twenty columns) are
+kept on the server. Sorting and filtering produce an array of row positions,
+and only the rows of the visible page are sent to the browser. This keeps the
+websocket payload and the browser's memory small on phones with slow data.
+
+The viewer runs as a fragment, so changing the page, sort or filter reruns
+only the table.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from engine.tracing import span
+from modules.fragments import traced_fragment
+
+PAGE_SIZES = (25, 50, 100, 200)
+DEFAULT_PAGE_SIZE = 50
+NO_SORT = "—"
+
+
+def sort_positions(column, ascending=True):
+    """
+    Row positions that sort a column, with missing values last.
+
+    Columns mixing numbers and placeholders such as "-" are sorted by their
+    numeric values; other unorderable columns by their text.
+
+    Args:
+        column (pandas.Series): Values to sort by
+        ascending (bool): Sort direction
+
+    Returns:
+        numpy.ndarray: Positions in sorted order (stable)
+    """
+    values = column.reset_index(drop=True)
+    try:
+        ordered = values.sort_values(ascending=ascending, kind='stable', na_position='last')
+    except TypeError:
+        numeric = pd.to_numeric(values, errors='coerce')
+        keys = numeric if numeric.notna().any() else values.astype(str)
+        ordered = keys.sort_values(ascending=ascending, kind='stable', na_position='last')
+    return ordered.index.to_numpy()
+
+
+def filter_positions(df, positions, query):
+    """
+    Positions whose row text contains query (case-insensitive).
+
+    Args:
+        df (pandas.DataFrame): Full result
+        positions (numpy.ndarray): Candidate row positions, in display order
+        query (str): Text to look for in any column
+
+    Returns:
+        numpy.ndarray: The matching positions, order preserved
+    """
+    query = query.strip().lower()
+    if not query:
+        return positions
+    text = df.iloc[positions].astype(str).agg(' '.join, axis=1).str.lower()
+    return positions[text.str.contains(query, regex=False).to_numpy()]
+
+
+def page_bounds(total, page, page_size):
+    """(start, stop) row offsets of a 1-based page."""
+    start = (page - 1) * page_size
+    return start, min(start + page_size, total)
+
+
+def _first_page(page_key):
+    st.session_state[page_key] = 1
+
+
+@st.fragment
+@traced_fragment
+def paged_dataframe(df, key, column_config=None, page_size=DEFAULT_PAGE_SIZE,
+                    hide_index=True, searchable=True, sort_keys=None):
+    """
+    Show a data frame one page at a time, with server-side sort and filter.
+
+    Args:
+        df (pandas.DataFrame): Full result (kept on the server)
+        key (str): Unique prefix for the viewer's widget keys
+        column_config (dict, optional): Passed on to st.dataframe
+        page_size (int): Initial rows per page
+        hide_index (bool): Hide the index column
+        searchable (bool): Show the text filter
+        sort_keys (pandas.DataFrame, optional): Values to sort some columns by,
+            in df's row order (e.g. the numbers behind formatted text)
+    """
+    if df.empty:
+        st.dataframe(df, column_config=column_config, hide_index=hide_index,
+                     use_container_width=True)
+        return
+
+    columns = [str(c) for c in df.columns]
+    page_key = f"{key}_page"
+    reset = {'on_change': _first_page, 'args': (page_key,)}
+    col_sort, col_order, col_filter, col_size = st.columns([3, 2, 3, 2])
+    with col_sort:
+        sort_by = st.selectbox("Sort by", (NO_SORT,) + tuple(columns), key=f"{key}_sort", **reset)
+    with col_order:
+        descending = st.toggle("Descending", key=f"{key}_descending",
+                               disabled=sort_by == NO_SORT, **reset)
+    with col_filter:
+        query = st.text_input("Filter rows", key=f"{key}_filter",
+                              placeholder="College, branch, district…",
+                              **reset) if searchable else ""
+    with col_size:
+        size_index = PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 1
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=size_index,
+                                 key=f"{key}_page_size", **reset)
+
+    if sort_by == NO_SORT:
+        positions = np.arange(len(df))
+    else:
+        if sort_keys is not None and sort_by in sort_keys.columns:
+            column = sort_keys[sort_by]
+        else:
+            column = df.iloc[:, columns.index(sort_by)]
+        positions = sort_positions(column, not descending)
+    positions = filter_positions(df, positions, query)
+
+    total = len(positions)
+    n_pages = max(1, math.ceil(total / page_size))
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = n_pages
+
+    start, stop = page_bounds(total, st.session_state.get(page_key, 1), page_size)
+    with span("viewer.dataframe", key=key, rows=stop - start):
+        st.dataframe(df.iloc[positions[start:stop]], column_config=column_config,
+                     hide_index=hide_index, use_container_width=True)
+
+    col_page, col_info = st.columns([1, 3])
+    with col_page:
+        st.number_input("Page", min_value=1, max_value=n_pages, step=1, key=page_key)
+    with col_info:
+        if total:
+            st.caption(f"Rows {start + 1}–{stop} of {total}"
+                       + (f" (filtered from {len(df)})" if total < len(df) else ""))
+        else:
+            st.caption(f"No rows match '{query}'")
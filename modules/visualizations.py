@@ -65,6 +65,44 @@ def create_branch_comparison_plot(branch_data):
     return None
 
 
+def create_trace_waterfall(trace):
+    """
+    Create a Plotly waterfall of the spans of one trace.
+
+    Args:
+        trace (dict): Trace.to_dict() of engine.tracing
+
+    Returns:
+        plotly.graph_objects.Figure: One bar per span, from its start to its end
+    """
+    depths = {}
+    rows = []
+    for i, s in enumerate(trace['spans']):
+        depth = depths[s['id']] = depths.get(s['parent'], -1) + 1
+        rows.append({
+            'Span': f"{i + 1:>3}. {'· ' * depth}{s['name'].rsplit('.', 1)[-1] if depth > 1 else s['name']}",
+            'Name': s['name'],
+            'Start (ms)': s['offset_ms'],
+            'Duration (ms)': s['duration_ms'],
+            'Cache': s['attributes'].get('cache', '-'),
+        })
+    spans = pd.DataFrame(rows)
+    fig = px.bar(
+        spans,
+        x='Duration (ms)',
+        y='Span',
+        base='Start (ms)',
+        orientation='h',
+        color='Cache',
+        hover_data=['Name', 'Start (ms)', 'Duration (ms)'],
+        title=f"{trace['name']}: {trace['duration_ms']:.0f} ms"
+    )
+    fig.update_yaxes(categoryorder='array', categoryarray=spans['Span'].tolist()[::-1], title=None)
+    fig.update_xaxes(title='ms since start')
+    fig.update_layout(height=120 + 22 * len(spans), margin=dict(l=10, r=10, t=40, b=10))
+    return fig
+
+
 def create_branch_analysis_chart(branch_analysis):
     """
     Create a bar chart for branch analysis across all colleges.
@@ -0,0 +1,183 @@
+"""
+Seat Allotment Simulator page for the TS EAMCET College Predictor application.
+Runs a synthetic counselling process to explore how cutoffs react to different
+choices of the candidate population and to seat/quota changes.
+"""
+import streamlit as st
+import pandas as pd
+
+from modules.data_loader import load_data
+from modules.exports import CSV, download_button
+from modules.constants import CATEGORY_COLUMNS
+from engine.cache import RESULT_QUOTA_BYTES, cached
+from engine.simulator import (
+    PREFERENCE_MODELS, DEFAULT_INTAKE, build_seat_matrix, simulate_counselling,
+    compare_with_phase, load_seat_matrix
+)
+
+
+@cached(ttl=1800, max_bytes=RESULT_QUOTA_BYTES, shared=False)
+def run_simulation(phase, population_size, rounds, model, list_length, withdrawal_rate,
+                   seat_scale, seed, seat_matrix=None):
+    """
+    Run (and cache) a counselling simulation over the selected phase's seats.
+
+    Args:
+        phase (str): Phase data used as the seat list
+        population_size (int): Number of synthetic candidates
+        rounds (int): Number of counselling rounds
+        model (str): Preference model
+        list_length (int): Options listed by each candidate
+        withdrawal_rate (float): Share of allotted candidates leaving after each round
+        seat_scale (float): Multiplier on every seat count
+        seed (int): Random seed
+        seat_matrix (pandas.DataFrame, optional): Uploaded seat matrix
+
+    Returns:
+        dict: Result of simulate_counselling (shared; do not modify) or None
+            if data is unavailable
+    """
+    df = load_data(phase)
+    if df is None:
+        return None
+
+    return simulate_counselling(
+        df, seat_matrix=seat_matrix, population_size=population_size, rounds=rounds,
+        model=model, list_length=list_length, withdrawal_rate=withdrawal_rate,
+        seat_scale=seat_scale, seed=seed
+    )
+
+
+def render():
+    """Render the Seat Allotment Simulator page."""
+    st.subheader("🎲 Seat Allotment Simulator")
+    st.markdown("""
+    Simulate counselling rounds over a synthetic population of candidates and see which closing ranks come out.
+    Use it to explore **"what happens if everyone near my rank picks X"** and the effect of seat or quota changes.
+    """)
+
+    with st.form("allotment_simulator_form"):
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            population_size = st.slider(
+                "Candidates in population",
+                min_value=50000,
+                max_value=200000,
+                value=200000,
+                step=10000,
+                help="Number of ranked candidates taking part in counselling"
+            )
+            rounds = st.slider("Counselling rounds",
+                               min_value=1, max_value=5, value=3)
+
+        with col2:
+            model = st.selectbox(
+                "Preference model",
+                PREFERENCE_MODELS,
+                help="""
+                - **Popularity**: Candidates follow last year's demand
+                - **Branch First**: Candidates chase CSE-type branches in any college
+                - **College First**: Candidates chase top colleges in any branch
+                """
+            )
+            list_length = st.slider(
+                "Options listed per candidate", min_value=5, max_value=100, value=30, step=5)
+
+        with col3:
+            withdrawal_rate = st.slider(
+                "Withdrawal after each round", min_value=0.0, max_value=0.5, value=0.15, step=0.05,
+                help="Share of allotted candidates who leave before the next round")
+            seat_scale = st.slider(
+                "Seat availability", min_value=0.5, max_value=1.5, value=1.0, step=0.05,
+                help="Scale all seats, e.g. to model quota changes that shrink the seats open to you")
+            seed = st.number_input("Random seed", min_value=0, value=2025)
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            phase = st.selectbox(
+                "Seat list from phase",
+                ["Final Phase", "2nd Phase", "1st Phase"],
+                help="Seats are taken from this phase and compared with its closing ranks"
+            )
+
+        with col2:
+            column = st.selectbox("Category column to inspect", CATEGORY_COLUMNS,
+                                  key="simulator_category_column")
+
+        uploaded_matrix = st.file_uploader(
+            "Seat matrix CSV (optional)", type=["csv"],
+            help=f"Seat counts per category column. Without it every seat gets {DEFAULT_INTAKE} seats split by reservation shares.")
+
+        run_button = st.form_submit_button(
+            "🚀 Run Simulation", type="primary")
+
+    if not run_button:
+        df = load_data("Final Phase")
+        if df is not None:
+            st.download_button(
+                label="📥 Download Seat Matrix Template (CSV)",
+                data=lambda: build_seat_matrix(df).to_csv(index=False),
+                file_name="TS_EAMCET_Seat_Matrix_Template.csv",
+                mime="text/csv"
+            )
+        return
+
+    seat_matrix = None
+    if uploaded_matrix is not None:
+        try:
+            seat_matrix = load_seat_matrix(uploaded_matrix)
+        except ValueError as e:
+            st.error(f"⚠️ {e}")
+            return
+
+    with st.spinner("🎲 Simulating counselling rounds..."):
+        result = run_simulation(phase, population_size, rounds, model, list_length,
+                                withdrawal_rate, seat_scale, int(seed), seat_matrix)
+
+    if result is None:
+        st.error("Unable to load data for the simulation.")
+        return
+
+    st.success(
+        f"✅ Simulated {rounds} round(s) for {population_size:,} candidates in {result['seconds']:.1f}s")
+
+    cols = st.columns(len(result['allotted']))
+    for i, (col, placed) in enumerate(zip(cols, result['allotted']), 1):
+        with col:
+            st.metric(f"Round {i} Allotted", f"{placed:,}")
+
+    actual = load_data(phase)
+    comparison = compare_with_phase(result['rounds'][-1], actual, column)
+
+    valid = comparison['Ratio'].dropna()
+    if not valid.empty:
+        st.metric(f"Median Simulated / 2024 Closing Rank ({column})",
+                  f"{valid.median():.2f}x")
+
+    st.dataframe(
+        comparison.sort_values(f"{column} (Simulated)", na_position='last'),
+        column_config={
+            "Institute Name": st.column_config.TextColumn("College Name", width="large"),
+            f"{column} (2024)": st.column_config.NumberColumn(format="%d"),
+            f"{column} (Simulated)": st.column_config.NumberColumn(format="%d"),
+            "Ratio": st.column_config.NumberColumn(format="%.2f"),
+        },
+        hide_index=True,
+        use_container_width=True
+    )
+
+    all_rounds = pd.concat(
+        [round_df.assign(Round=i) for i, round_df in enumerate(result['rounds'], 1)])
+    download_button(
+        label="📥 Download Simulated Closing Ranks (CSV)",
+        df=all_rounds,
+        fmt=CSV,
+        file_name=f"TS_EAMCET_Simulated_Closing_Ranks_{model.replace(' ', '_')}.csv"
+    )
+
+    st.warning("""
+    **🚨 Disclaimer**: The simulator uses a synthetic population and simplified preferences.
+    Treat its closing ranks as a **what-if exploration**, not a forecast.
+    """)
@@ -4,8 +4,8 @@ College-wise Branch Analysis page for the TS EAMCET College Predictor applicatio
 import streamlit as st
 import plotly.express as px
 
-from modules.data_loader import load_data
-from modules.college_predictor import get_college_branches
+from engine.predictor import get_college_branches
+from engine.vocab import COLLEGES, get_vocabulary
 from modules.visualizations import create_branch_cutoff_chart, create_branch_comparison_plot
 from modules.constants import TOP_COLLEGES, TOP_COLLEGES__MALES
 
@@ -21,15 +21,8 @@ def render():
         col1, col2 = st.columns(2)
 
         with col1:
-            # Get college options from data
-            df = load_data("Final Phase")
-            college_options = []
-            if df is not None:
-                # Detect college name column
-                college_col = 'Institute Name' if 'Institute Name' in df.columns else 'College Name'
-                if college_col not in df.columns:
-                    college_col = 'Place'
-                college_options = sorted(df[college_col].unique().tolist())
+            # College options, built once per data version
+            college_options = get_vocabulary("Final Phase", COLLEGES).values
 
             selected_college = st.selectbox(
                 "Select College", college_options, key="selected_college")
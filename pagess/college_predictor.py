@@ -3,15 +3,48 @@ College Predictor page for the TS EAMCET College Predictor application.
 """
 import streamlit as st
 import pandas as pd
-import io
 
 from modules.data_loader import load_data
-from modules.college_predictor import predict_colleges
-from modules.pdf_generator import dataframe_to_pdf
-from modules.constants import BRANCH_MAP
+from engine.predictor import predict_colleges
+from engine.vocab import ALL_DISTRICTS, DISTRICTS, get_vocabulary
+from engine.scenarios import (
+    BASELINE_SCENARIO, SCENARIO_NAMES, SCENARIO_HELP, sweep_reachable
+)
+from modules.exports import CSV, XLSX, PDF, download_button
+from modules.constants import BRANCH_MAP, get_caste_column_name
 from modules.visualizations import create_branch_distribution_chart
 
 
+def render_inflation_sweep(rank, gender, caste, phase):
+    """Show how many seats stay reachable as cutoffs inflate."""
+    column = get_caste_column_name(gender, caste)
+    summary, seats = sweep_reachable(rank, column, phase=phase)
+
+    with st.expander("📈 Rank Inflation Sensitivity"):
+        st.markdown(
+            f"Seats (any branch, any college) you would reach in the **{column}** column if every cutoff moved by the given factor.")
+        st.line_chart(summary, x='Inflation Factor', y='Reachable Seats')
+
+        baseline = seats.get(1.0, seats[min(seats)])
+        summary['Change vs 2024'] = summary['Reachable Seats'] - len(baseline)
+        st.dataframe(summary, hide_index=True, use_container_width=True)
+
+        # Seats are suffixes of one sorted index, so the extra seats at the
+        # highest factor are exactly the ones missing from the baseline
+        widest = seats[max(seats)]
+        df = load_data(phase)
+        if df is not None and len(widest) > len(baseline):
+            st.markdown(
+                f"**Seats that open up at {max(seats):.1f}x** (lowest cutoffs first)")
+            opened = df.iloc[widest[:len(widest) - len(baseline)]]
+            st.dataframe(
+                opened[['Institute Name', 'Branch Code', column]].rename(
+                    columns={'Institute Name': 'College Name', column: '2024 Closing Rank'}),
+                hide_index=True,
+                use_container_width=True
+            )
+
+
 def render():
     """Render the College Predictor page."""
     st.markdown(
@@ -35,13 +68,13 @@ def render():
         with col3:
             phase = st.selectbox("Select Phase Data", [
                 "Final Phase", "2nd Phase", "1st Phase"])
-            # Get district options from data
-            df = load_data(phase)
-            districts = ["All Districts"]
-            if df is not None and 'Dist Code' in df.columns:
-                districts.extend(sorted(df['Dist Code'].unique().tolist()))
+            # District options, built once per data version
+            districts = (ALL_DISTRICTS,) + get_vocabulary(phase, DISTRICTS).values
             district_filter = st.selectbox("Filter by District", districts)
 
+        scenario = st.selectbox(
+            "Cutoff Scenario", SCENARIO_NAMES, help=SCENARIO_HELP)
+
         submit_button = st.form_submit_button(
             "Predict Colleges", type="primary")
 
@@ -61,7 +94,7 @@ def render():
         else:
             with st.spinner("Finding colleges..."):
                 result = predict_colleges(
-                    rank, gender, caste, branch, phase, district_filter)
+                    rank, gender, caste, branch, phase, district_filter, scenario)
 
             if result is None or result.empty:
                 st.warning(
@@ -69,36 +102,35 @@ def render():
             else:
                 st.success(
                     f"Found {len(result)} colleges where you may be eligible!")
+                if scenario != BASELINE_SCENARIO:
+                    st.info(
+                        f"📈 Closing ranks scaled using scenario: **{scenario}**")
 
                 # Create three columns for the download buttons
                 col_csv, col_excel, col_pdf = st.columns(3)
 
                 with col_csv:
-                    csv = result.to_csv(index=False)
-                    st.download_button(
+                    download_button(
                         label="Download Results as CSV",
-                        data=csv,
-                        file_name=f"eamcet_colleges_{rank}_{caste}_{branch}.csv",
-                        mime="text/csv"
+                        df=result,
+                        fmt=CSV,
+                        file_name=f"eamcet_colleges_{rank}_{caste}_{branch}.csv"
                     )
 
                 with col_excel:
-                    excel_buffer = io.BytesIO()
-                    result.to_excel(excel_buffer, index=False)
-                    st.download_button(
+                    download_button(
                         label="Download Results as Excel",
-                        data=excel_buffer.getvalue(),
-                        file_name=f"eamcet_colleges_{rank}_{caste}_{branch}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                        df=result,
+                        fmt=XLSX,
+                        file_name=f"eamcet_colleges_{rank}_{caste}_{branch}.xlsx"
                     )
 
                 with col_pdf:
-                    pdf_bytes = dataframe_to_pdf(result)
-                    st.download_button(
+                    download_button(
                         label="Download Results as PDF",
-                        data=pdf_bytes,
-                        file_name=f"eamcet_colleges_{rank}_{caste}_{branch}.pdf",
-                        mime="application/pdf"
+                        df=result,
+                        fmt=PDF,
+                        file_name=f"eamcet_colleges_{rank}_{caste}_{branch}.pdf"
                     )
 
                 # st.markdown(
@@ -127,5 +159,7 @@ def render():
                     use_container_width=True
                 )
 
+                render_inflation_sweep(rank, gender, caste, phase)
+
                 # College count by district visualization
                 # create_branch_distribution_chart(result)
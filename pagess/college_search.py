@@ -5,7 +5,10 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 
+from engine.vocab import BRANCHES, get_vocabulary
 from modules.data_loader import load_data
+from modules.formatting import FEE, RANK, phase_text
+from modules.result_viewer import paged_dataframe
 from modules.constants import get_caste_column_name
 from modules.visualizations import create_closing_ranks_chart, create_branch_distribution_chart
 
@@ -22,9 +25,9 @@ def render():
         st.error("Unable to load data for college search.")
         return
 
-    # Get unique branches from the dataset
+    # Branch options, built once per data version
     branch_col = 'Branch Name' if 'Branch Name' in df.columns else 'Branch Name'
-    branches = sorted(df[branch_col].str.strip().unique())
+    branches = get_vocabulary("Final Phase", BRANCHES).values
 
     selected_branch = st.selectbox(
         "Select Desired Branch", branches, key="college_search_branch")
@@ -48,30 +51,19 @@ def render():
                     return
 
                 # Prepare display columns based on caste selection
+                column_names = {
+                    'Institute Name': 'College Name',
+                    'Place': 'Place',
+                    'Dist Code': 'District',
+                    'Tuition Fee': 'Tuition Fee (₹)'
+                }
                 if selected_caste == "N/A":
                     # Show closing ranks for all categories
                     rank_columns = ['OC BOYS', 'OC GIRLS', 'BC_A BOYS', 'BC_A GIRLS', 'BC_B BOYS',
                                     'BC_B GIRLS', 'BC_C BOYS', 'BC_C GIRLS', 'BC_D BOYS', 'BC_D GIRLS',
                                     'BC_E BOYS', 'BC_E GIRLS', 'SC BOYS', 'SC GIRLS', 'ST BOYS',
                                     'ST GIRLS', 'EWS GEN OU', 'EWS GIRLS OU']
-                    display_columns = ['Institute Name',
-                                       'Place', 'Dist Code', 'Tuition Fee'] + rank_columns
-                    result_df = filtered_df[display_columns].rename(columns={
-                        'Institute Name': 'College Name',
-                        'Place': 'Place',
-                        'Dist Code': 'District',
-                        'Tuition Fee': 'Tuition Fee (₹)'
-                    })
-
-                    # Convert rank columns to integer for display, using a consistent missing value representation
-                    for col in rank_columns:
-                        # First ensure all numbers are properly represented as numbers, not strings
-                        result_df[col] = pd.to_numeric(
-                            result_df[col], errors='coerce')
-                        # Now convert to int or missing value placeholder
-                        result_df[col] = result_df[col].apply(
-                            lambda x: int(x) if pd.notnull(x) else "-"
-                        )
+                    rows = filtered_df
                 else:
                     # Show closing rank for the selected caste-gender combination
                     target_column = get_caste_column_name(
@@ -80,39 +72,24 @@ def render():
                         st.error(
                             f"Data for {selected_caste} {selected_gender} not available in the dataset.")
                         return
-                    display_columns = ['Institute Name',
-                                       'Place', 'Dist Code', 'Tuition Fee', target_column]
-                    result_df = filtered_df[display_columns].rename(columns={
-                        'Institute Name': 'College Name',
-                        'Place': 'Place',
-                        'Dist Code': 'District',
-                        'Tuition Fee': 'Tuition Fee (₹)',
-                        target_column: 'Closing Rank'
-                    })
-
-                    # Ensure all numbers are properly represented as numbers
-                    result_df['Closing Rank'] = pd.to_numeric(
-                        result_df['Closing Rank'], errors='coerce')
-
-                    # Make a copy of the column for sorting purposes
-                    result_df['Rank_for_sorting'] = result_df['Closing Rank']
-
-                    # Format closing rank as integer without decimals for display
-                    result_df['Closing Rank'] = result_df['Closing Rank'].apply(
-                        lambda x: int(x) if pd.notnull(x) else "-"
-                    )
+                    rank_columns = [target_column]
+                    column_names[target_column] = 'Closing Rank'
 
-                    # Sort by the numeric column with NaN values at the end
-                    result_df = result_df.sort_values(
-                        'Rank_for_sorting', na_position='last')
+                    # Sort by closing rank with missing ranks at the end
+                    rows = filtered_df.sort_values(
+                        target_column, kind='stable', na_position='last')
 
-                    # Remove the temporary sorting column
-                    result_df = result_df.drop('Rank_for_sorting', axis=1)
+                display_columns = ['Institute Name',
+                                   'Place', 'Dist Code', 'Tuition Fee'] + rank_columns
 
-                # Format Tuition Fee for display
-                result_df['Tuition Fee (₹)'] = result_df['Tuition Fee (₹)'].apply(
-                    lambda x: f"{int(x):,}" if pd.notnull(x) else "N/A"
-                )
+                # Fees and ranks as display text (cached per data version);
+                # the numbers are kept for sorting
+                text = phase_text(rows, "Final Phase", dict(
+                    {'Tuition Fee': FEE}, **{col: RANK for col in rank_columns}))
+                result_df = pd.concat(
+                    [rows[['Institute Name', 'Place', 'Dist Code']], text], axis=1
+                )[display_columns].rename(columns=column_names)
+                sort_keys = rows[list(text.columns)].rename(columns=column_names)
 
                 # Add S.No column
                 result_df.insert(0, 'S.No', range(1, len(result_df) + 1))
@@ -128,10 +105,8 @@ def render():
                     f"Showing results for {selected_caste if selected_caste != 'N/A' else 'All Categories'} ({selected_gender})")
 
                 # Style the table
-                st.dataframe(
-                    result_df,
-                    use_container_width=True
-                )
+                paged_dataframe(result_df, key="college_search_results", hide_index=False,
+                                sort_keys=sort_keys)
 
                 # TODO adding it making it more interactive but readablity is compromised so need to work on it
                 # # Add Closing Ranks Visualization (Chart.js Bar Chart)
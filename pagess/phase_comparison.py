@@ -3,7 +3,8 @@ Phase Comparison page for the TS EAMCET College Predictor application.
 """
 import streamlit as st
 from modules.constants import BRANCH_MAP
-from modules.college_predictor import compare_phases
+from engine.predictor import compare_phases
+from engine.scenarios import SCENARIO_NAMES, SCENARIO_HELP
 
 
 def render():
@@ -28,6 +29,9 @@ def render():
             comp_branch = st.selectbox("Branch", list(
                 BRANCH_MAP.keys()), key="comp_branch")
 
+        comp_scenario = st.selectbox(
+            "Cutoff Scenario", SCENARIO_NAMES, help=SCENARIO_HELP, key="comp_scenario")
+
         compare_button = st.form_submit_button(
             "Compare Phases", type="primary")
 
@@ -37,7 +41,7 @@ def render():
         else:
             with st.spinner("Comparing across phases..."):
                 phase_comparison = compare_phases(
-                    comp_rank, comp_gender, comp_caste, comp_branch)
+                    comp_rank, comp_gender, comp_caste, comp_branch, scenario=comp_scenario)
 
             if not phase_comparison:
                 st.warning(
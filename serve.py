@@ -0,0 +1,57 @@
+"""
+Production entry point: the Streamlit app plus warm-up and a readiness route.
+
+Run with ``streamlit run serve.py --server.port 8501 --server.address 0.0.0.0``.
+Streamlit finds the ``app`` object below and serves app.py through it. On
+startup the engine warm-up (engine.warmup) runs in a background thread.
+``GET /ready`` answers 503 with the warm-up progress and the reasons until
+this replica can answer queries within READY_BUDGET_SECONDS
+(engine.readiness), and 200 from then on. Load balancer health checks should
+use /ready: /_stcore/health passes as soon as the server listens. Set
+WARMUP=0 to skip the warm-up.
+"""
+import logging
+import os
+import pkgutil
+from contextlib import asynccontextmanager
+
+import streamlit as st
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from engine.readiness import readiness
+from engine.warmup import start_warmup
+
+logging.basicConfig(
+    level=logging.WARNING if os.getenv('STREAMLIT_ENV') == 'production' else logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+WARMUP_ENABLED = os.getenv('WARMUP', '1') != '0'
+
+
+def page_modules():
+    """Names of the Streamlit page modules."""
+    import pagess
+
+    return [f"pagess.{module.name}" for module in pkgutil.iter_modules(pagess.__path__)]
+
+
+@asynccontextmanager
+async def lifespan(app):
+    if WARMUP_ENABLED:
+        start_warmup(page_modules())
+    yield
+
+
+def ready(request):
+    """Readiness report: 200 when this replica can take traffic, 503 otherwise."""
+    report = readiness(require_warmup=WARMUP_ENABLED)
+    return JSONResponse(report, status_code=200 if report['ready'] else 503)
+
+
+app = st.App(APP_PATH, lifespan=lifespan, routes=[Route("/ready", ready)])
+
+if __name__ == "__main__":
+    app.run()